@@ -25,24 +25,38 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import re
 import signal
 import subprocess
 import sys
 import threading
 import time
+from collections import Counter
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import sqlite3
 import shutil
 import tempfile
 from typing import Optional, Tuple
+from urllib.parse import urlsplit
 
 try:
     from zoneinfo import ZoneInfo  # Python 3.9+
 except Exception:  # pragma: no cover
     ZoneInfo = None  # type: ignore
 
+try:
+    import re2 as _re2  # optional: google-re2 multi-pattern Set matching
+except Exception:  # pragma: no cover
+    _re2 = None  # type: ignore
+
+try:
+    import orjson  # optional: C JSON codec for the JSONL log path
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
 
 # ----------------------- Paths & Constants -----------------------
 
@@ -58,9 +72,30 @@ CACHE_DIR = BASE_DIR / "cache"
 BROWSER_CACHE_DIR = CACHE_DIR / "browser"
 CRED_DIR = BASE_DIR / "credentials"
 
-CHICAGO_TZ = ZoneInfo("America/Chicago") if ZoneInfo else None
+def _load_chicago_tz():
+    try:
+        return ZoneInfo("America/Chicago")  # type: ignore[misc]
+    except Exception:
+        # No zoneinfo/tzdata: fall back to the machine's current local offset
+        return datetime.now().astimezone().tzinfo
+
+
+# Always a tzinfo, so hot paths never need an "or local tz" fallback
+CHICAGO_TZ = _load_chicago_tz()
 RUNTIME_CFG: Optional[dict] = None
 
+# Persistent SQLite connection (see db_conn) and the focus INSERT kept as a
+# constant so sqlite3's per-connection statement cache prepares it once.
+# _DB_LOCK serializes writes on the shared connection across threads; readers
+# (summary/report generation) use their own read-only connection (db_reader).
+_DB_CONN: Optional[sqlite3.Connection] = None
+_DB_LOCK = threading.RLock()
+_DB_READERS = threading.local()
+_INSERT_FOCUS_SQL = (
+    "INSERT INTO focus_events(start,end,seconds,app,title,url,start_epoch,end_epoch) "
+    "VALUES(?,?,?,?,?,?,?,?)"
+)
+
 
 # ----------------------- Utilities -------------------------------
 
@@ -74,63 +109,191 @@ def ensure_dirs() -> None:
         pass
 
 
-def init_db() -> None:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS focus_events (
-            id INTEGER PRIMARY KEY,
-            start TEXT NOT NULL,
-            end TEXT NOT NULL,
-            seconds INTEGER NOT NULL,
-            app TEXT,
-            title TEXT,
-            url TEXT
-        )
-        """
-    )
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_focus_start ON focus_events(start)")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_focus_app ON focus_events(app)")
-    con.commit()
-    con.close()
+def db_conn() -> sqlite3.Connection:
+    """Return the process-wide SQLite connection, opening it on first use."""
+    global _DB_CONN
+    if _DB_CONN is None:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(DB_PATH, check_same_thread=False)
+        # 64 MiB page cache and in-memory temp B-trees keep summary GROUP BYs off disk
+        con.execute("PRAGMA cache_size=-65536")
+        con.execute("PRAGMA temp_store=MEMORY")
+        try:
+            # Memory-mapped reads; may be refused on 32-bit or restricted builds
+            con.execute("PRAGMA mmap_size=268435456")
+        except Exception:
+            pass
+        try:
+            # WAL lets read-only report connections run alongside tracker inserts
+            con.execute("PRAGMA journal_mode=WAL")
+        except Exception:
+            pass
+        _DB_CONN = con
+    return _DB_CONN
 
 
-def db_insert_focus_event(event: dict) -> None:
+def db_reader() -> sqlite3.Connection:
+    """Return this thread's read-only connection to DB_PATH, opening it on first use.
+
+    Summary queries run on the report thread through this connection so they
+    never share a transaction (or block) with inserts on the tracker thread.
+    """
+    cached = getattr(_DB_READERS, "con", None)
+    if cached is not None:
+        if cached[0] == DB_PATH:
+            return cached[1]
+        cached[1].close()  # DB_PATH was repointed; drop the stale handle
+    con = sqlite3.connect(f"{Path(DB_PATH).resolve().as_uri()}?mode=ro", uri=True)
+    con.execute("PRAGMA cache_size=-65536")
+    con.execute("PRAGMA temp_store=MEMORY")
     try:
-        con = sqlite3.connect(DB_PATH)
+        con.execute("PRAGMA mmap_size=268435456")
+    except Exception:
+        pass
+    _DB_READERS.con = (DB_PATH, con)
+    return con
+
+
+def init_db() -> None:
+    con = db_conn()
+    with _DB_LOCK:
         cur = con.cursor()
         cur.execute(
-            "INSERT INTO focus_events(start,end,seconds,app,title,url) VALUES(?,?,?,?,?,?)",
-            (
-                event.get("start"),
-                event.get("end"),
-                int(event.get("seconds", 0) or 0),
-                event.get("app"),
-                event.get("title"),
-                event.get("url"),
-            ),
+            """
+            CREATE TABLE IF NOT EXISTS focus_events (
+                id INTEGER PRIMARY KEY,
+                start TEXT NOT NULL,
+                end TEXT NOT NULL,
+                seconds INTEGER NOT NULL,
+                app TEXT,
+                title TEXT,
+                url TEXT
+            )
+            """
+        )
+        # Integer epoch copies of start/end: range scans and window clipping
+        # compare ints instead of parsing ISO TEXT. Added in place on old DBs.
+        for col in ("start_epoch", "end_epoch"):
+            try:
+                cur.execute(f"ALTER TABLE focus_events ADD COLUMN {col} INTEGER")
+            except sqlite3.OperationalError:
+                pass  # column already exists
+        # Covering index for day-range rollups (WHERE start_epoch BETWEEN ? AND ?
+        # GROUP BY app) and a composite for app-scoped range queries. Older
+        # indexes on the TEXT start column are dropped so the planner can't pick them.
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_focus_start_epoch ON focus_events(start_epoch, app, seconds)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_focus_app_start ON focus_events(app, start)")
+        cur.execute("DROP INDEX IF EXISTS idx_focus_start_app")
+        cur.execute("DROP INDEX IF EXISTS idx_focus_start")
+        cur.execute("DROP INDEX IF EXISTS idx_focus_app")
+        # Backfill rows written before the epoch columns existed
+        cur.execute(
+            "UPDATE focus_events SET start_epoch = CAST(strftime('%s', start) AS INTEGER), "
+            "end_epoch = CAST(strftime('%s', end) AS INTEGER) WHERE start_epoch IS NULL"
         )
         con.commit()
-        con.close()
+
+
+def _epoch(ts: Optional[str]) -> Optional[int]:
+    try:
+        return int(parse_iso(ts).timestamp()) if ts else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _focus_row(event: dict) -> tuple:
+    return (
+        event.get("start"),
+        event.get("end"),
+        int(event.get("seconds", 0) or 0),
+        event.get("app"),
+        event.get("title"),
+        event.get("url"),
+        _epoch(event.get("start")),
+        _epoch(event.get("end")),
+    )
+
+
+def db_insert_focus_events(events: list[dict]) -> None:
+    """Insert a batch of focus events with one executemany() and one commit."""
+    if not events:
+        return
+    rows = [_focus_row(e) for e in events]
+    try:
+        con = db_conn()
+        with _DB_LOCK:
+            con.executemany(_INSERT_FOCUS_SQL, rows)
+            con.commit()
     except Exception:
         pass
 
 
+def db_insert_focus_event(event: dict) -> None:
+    db_insert_focus_events([event])
+
+
+# Focus rows overlapping [:ws, :cut) (epoch seconds), clipped to the window.
+# The start_epoch range (looking back a day for sessions that began earlier)
+# is served by idx_focus_start_epoch.
+_FOCUS_WINDOW_CTE = """
+    ev AS (
+        SELECT app, title, url,
+               MAX(start_epoch, :ws) AS s,
+               MIN(end_epoch, :cut) AS e
+        FROM focus_events
+        WHERE start_epoch >= :lo AND start_epoch < :cut
+    )
+"""
+_WINDOW_ROLLUP_SQL = f"""
+    WITH {_FOCUS_WINDOW_CTE}
+    SELECT app, title, url, SUM(e - s), MIN(s), MAX(e)
+    FROM ev WHERE e > s
+    GROUP BY app, title, url
+"""
+_HOURLY_ROLLUP_SQL = f"""
+    WITH {_FOCUS_WINDOW_CTE},
+    hrs(h, hs, he) AS (VALUES {", ".join(f"({h}, :hs{h}, :he{h})" for h in range(24))})
+    SELECT ev.app, hrs.h, SUM(MIN(ev.e, hrs.he) - MAX(ev.s, hrs.hs))
+    FROM ev JOIN hrs ON ev.s < hrs.he AND ev.e > hrs.hs
+    WHERE ev.e > ev.s
+    GROUP BY ev.app, hrs.h
+"""
+
+
+def db_window_rollup(window_start: datetime, cutoff: datetime) -> Optional[dict]:
+    """Aggregate focus_events overlapping [window_start, cutoff) inside SQLite.
+
+    Returns {"windows": [(app, title, url, seconds, first_epoch, last_epoch)],
+    "hourly": [(app, hour, seconds)]} with seconds clipped to the window and
+    hours bucketed on local wall-clock boundaries, or None when the DB has
+    no rows for the window (callers then fall back to the JSONL log).
+    """
+    base = window_start.replace(hour=0, minute=0, second=0, microsecond=0)
+    ws = int(window_start.timestamp())
+    params: dict = {"ws": ws, "cut": int(cutoff.timestamp()), "lo": ws - 86400}
+    for h in range(24):
+        hour_start = base + timedelta(hours=h)
+        params[f"hs{h}"] = int(hour_start.timestamp())
+        params[f"he{h}"] = int((hour_start + timedelta(hours=1)).timestamp())
+    try:
+        con = db_reader()
+        windows = con.execute(_WINDOW_ROLLUP_SQL, params).fetchall()
+        if not windows:
+            return None
+        hourly = con.execute(_HOURLY_ROLLUP_SQL, params).fetchall()
+    except Exception:
+        return None
+    return {"windows": windows, "hourly": hourly}
+
+
 def now_tz(tz: Optional[timezone] = None) -> datetime:
-    if tz is None:
-        try:
-            return datetime.now(CHICAGO_TZ) if CHICAGO_TZ else datetime.now().astimezone()
-        except Exception:
-            return datetime.now().astimezone()
-    return datetime.now(tz)
+    return datetime.now(tz or CHICAGO_TZ)
 
 
 def iso(dt: datetime) -> str:
-    if dt.tzinfo is None:
-        dt = dt.astimezone()
-    return dt.isoformat()
+    # Callers pass aware datetimes (now_tz/parse_iso); naive ones are still
+    # pinned to local time rather than written without an offset.
+    return dt.isoformat() if dt.tzinfo is not None else dt.astimezone().isoformat()
 
 
 def parse_date(d: str) -> datetime:
@@ -143,7 +306,21 @@ def seconds_to_hhmm(total: int) -> str:
     return f"{h:02d}:{m:02d}"
 
 
+def json_dumps_bytes(obj) -> bytes:
+    """Compact UTF-8 JSON for one JSONL record (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Accepts str or bytes; both codecs raise a json.JSONDecodeError subclass on bad input
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+@lru_cache(maxsize=8192)
 def parse_iso(s: str) -> datetime:
+    # Memoized: one event's end is usually the next event's start, and the
+    # returned datetimes are immutable, so cached instances are safe to share.
     dt = datetime.fromisoformat(s)
     return dt if dt.tzinfo else dt.astimezone()
 
@@ -243,7 +420,8 @@ DEFAULT_CONFIG = {
         "discovery call", "sales call", "intro call", "demo"
     ],
     "capture": {
-        "urls": "domain"  # one of: none, domain, full
+        "urls": "domain",  # one of: none, domain, full
+        "min_event_sec": 2  # focus shorter than this is folded into the next window
     },
     "exclude_domains": [],
     "private_domains": [],
@@ -282,6 +460,242 @@ DEFAULT_CONFIG = {
 }
 
 
+def _compile_pattern_list(patterns: list, flags: int = 0) -> list[re.Pattern[str]]:
+    compiled: list[re.Pattern[str]] = []
+    for pat in patterns or []:
+        try:
+            compiled.append(re.compile(pat, flags))
+        except (re.error, TypeError):
+            continue
+    return compiled
+
+
+def _compile_union(compiled: list[re.Pattern[str]]) -> Optional[re.Pattern[str]]:
+    """Fuse already-validated patterns into one alternation for a single-pass scan."""
+    if not compiled:
+        return None
+    # Backreferences would point at the wrong (renumbered) group once fused
+    if any(re.search(r"\\[1-9]|\(\?P=", rx.pattern) for rx in compiled):
+        return None
+    try:
+        return re.compile("|".join(f"(?:{rx.pattern})" for rx in compiled))
+    except re.error:
+        # e.g. conflicting group names across patterns; callers fall back per-pattern
+        return None
+
+
+def _compile_rule_list(specs: list, label_keys: Tuple[str, ...]) -> list[Tuple[re.Pattern[str], str]]:
+    compiled: list[Tuple[re.Pattern[str], str]] = []
+    for spec in specs or []:
+        if not isinstance(spec, dict):
+            continue
+        pat = spec.get("pattern")
+        label = next((spec.get(k) for k in label_keys if spec.get(k)), None)
+        if not pat or not label:
+            continue
+        try:
+            compiled.append((re.compile(pat, re.IGNORECASE), str(label)))
+        except re.error:
+            continue
+    return compiled
+
+
+class RuleMatcher:
+    """First-match-wins matcher over ordered (compiled_regex, label) rules.
+
+    Equivalent to iterating the rules and returning the label of the first
+    rx.search(text) hit, but evaluated in a single engine call: via a
+    google-re2 Set when installed, else an alternation of per-rule lookaheads
+    anchored at position 0 (alternatives are tried in config order, so
+    rule order still wins over match position).
+    """
+
+    def __init__(self, rules: list[Tuple[re.Pattern[str], str]]) -> None:
+        self.rules = rules
+        self._set = self._build_re2_set(rules)
+        self._union = None if self._set is not None else self._build_union(rules)
+
+    @staticmethod
+    def _build_re2_set(rules: list[Tuple[re.Pattern[str], str]]):
+        if _re2 is None or not rules or not hasattr(getattr(_re2, "Set", None), "SearchSet"):
+            return None
+        try:
+            opts = _re2.Options()
+            opts.case_sensitive = False
+            rx_set = _re2.Set.SearchSet(opts)
+            for rx, _label in rules:
+                if rx_set.Add(rx.pattern) < 0:
+                    return None
+            return rx_set if rx_set.Compile() else None
+        except Exception:
+            return None
+
+    @staticmethod
+    def _build_union(rules: list[Tuple[re.Pattern[str], str]]) -> Optional[re.Pattern[str]]:
+        if not rules:
+            return None
+        # Numbered backreferences would point at the wrong group once fused
+        if any(re.search(r"\\[1-9]", rx.pattern) for rx, _label in rules):
+            return None
+        try:
+            return re.compile(
+                "|".join(f"(?=[\\s\\S]*?(?:{rx.pattern}))(?P<r{i}>)" for i, (rx, _label) in enumerate(rules)),
+                re.IGNORECASE,
+            )
+        except re.error:
+            return None
+
+    def match(self, text: str) -> Optional[str]:
+        if self._set is not None:
+            hits = self._set.Match(text)
+            return self.rules[min(hits)][1] if hits else None
+        if self._union is not None:
+            m = self._union.match(text)
+            return self.rules[int(m.lastgroup[1:])][1] if m and m.lastgroup else None
+        for rx, label in self.rules:
+            if rx.search(text):
+                return label
+        return None
+
+
+_CFG_SET_KEYS = ("exclude_apps", "exclude_domains", "private_domains")
+
+
+def cfg_set(cfg: dict, key: str) -> frozenset:
+    """The precompiled frozenset for list `key` (built on the fly if cfg is uncompiled)."""
+    s = cfg.get(f"_{key}")
+    return s if s is not None else frozenset(cfg.get(key, []) or [])
+
+
+class TokenExtractor:
+    """Extract ticket/PR tokens with one scan over all ticket patterns.
+
+    Each pattern becomes a capturing alternative of a single regex (compiled
+    with google-re2 when available, else stdlib re), so a title is scanned
+    once with finditer instead of once per pattern. A token is the pattern's
+    non-empty groups joined by spaces, or the whole match if it has none.
+    """
+
+    def __init__(self, patterns: list[re.Pattern[str]]) -> None:
+        self.patterns = patterns
+        self._spans: list[Tuple[int, int]] = []
+        self._union = self._build_union(patterns)
+
+    def _build_union(self, patterns: list[re.Pattern[str]]):
+        if not patterns or any(re.search(r"\\[1-9]", rx.pattern) for rx in patterns):
+            return None
+        spans: list[Tuple[int, int]] = []
+        base = 1
+        for rx in patterns:
+            spans.append((base, rx.groups))
+            base += 1 + rx.groups
+        pattern = "|".join(f"({rx.pattern})" for rx in patterns)
+        union = None
+        if _re2 is not None:
+            try:
+                opts = _re2.Options()
+                opts.case_sensitive = False
+                union = _re2.compile(pattern, options=opts)
+            except Exception:
+                union = None
+        if union is None:
+            try:
+                union = re.compile(pattern, re.IGNORECASE)
+            except re.error:
+                return None
+        self._spans = spans
+        return union
+
+    def findall(self, text: str) -> list[str]:
+        tokens: list[str] = []
+        if self._union is not None:
+            try:
+                for m in self._union.finditer(text):
+                    for base, ngroups in self._spans:
+                        if m.group(base) is None:
+                            continue
+                        if ngroups:
+                            token = " ".join(g for g in (m.group(base + k) for k in range(1, ngroups + 1)) if g)
+                        else:
+                            token = m.group(base)
+                        if token:
+                            tokens.append(token)
+                        break
+                return tokens
+            except Exception:
+                tokens = []
+        for rx in self.patterns:
+            try:
+                found = rx.findall(text)
+            except Exception:
+                found = []
+            for item in found:
+                token = " ".join(t for t in item if t) if isinstance(item, tuple) else item
+                if token:
+                    tokens.append(token)
+        return tokens
+
+
+def compile_config(cfg: dict) -> dict:
+    """Attach precompiled regexes for the pattern lists in cfg.
+
+    Compiled objects live under "_"-prefixed keys so hot paths (redaction,
+    rule matching, token extraction) never re-parse patterns per call.
+    save_config() strips these keys before writing to disk.
+    """
+    cfg["_redact_patterns_re"] = _compile_pattern_list(cfg.get("redact_patterns", []))
+    cfg["_redact_union_re"] = _compile_union(cfg["_redact_patterns_re"])
+    cfg["_rules_re"] = _compile_rule_list(cfg.get("rules", []), ("project", "tag"))
+    cfg["_path_rules_re"] = _compile_rule_list(cfg.get("path_rules", []), ("project", "tag"))
+    cfg["_ticket_patterns_re"] = _compile_pattern_list(cfg.get("ticket_patterns", []), re.IGNORECASE)
+    cfg["_keyword_phrases_re"] = _compile_rule_list(cfg.get("keyword_phrases", []), ("phrase",))
+    cfg["_rules_matcher"] = RuleMatcher(cfg["_rules_re"])
+    cfg["_path_rules_matcher"] = RuleMatcher(cfg["_path_rules_re"])
+    cfg["_keyword_phrases_matcher"] = RuleMatcher(cfg["_keyword_phrases_re"])
+    cfg["_ticket_extractor"] = TokenExtractor(cfg["_ticket_patterns_re"])
+    # Membership lists consulted per event/URL, as O(1) sets
+    for key in _CFG_SET_KEYS:
+        cfg[f"_{key}"] = frozenset(cfg.get(key, []) or [])
+    return cfg
+
+
+def compiled_config(cfg: Optional[dict]) -> dict:
+    """Return cfg with compiled patterns attached, compiling only if missing."""
+    cfg = cfg if cfg is not None else DEFAULT_CONFIG.copy()
+    if "_rules_re" not in cfg:
+        compile_config(cfg)
+    return cfg
+
+
+def save_config(cfg: dict) -> bool:
+    """Persist cfg to CONFIG_PATH, dropping derived "_"-prefixed keys.
+
+    Skips the write when the file already holds identical bytes; otherwise
+    writes a sibling temp file and os.replace()s it in, so readers never see
+    a half-written config. Returns True if the file was rewritten.
+    """
+    data = {k: v for k, v in cfg.items() if not str(k).startswith("_")}
+    new_bytes = json.dumps(data, indent=2).encode("utf-8")
+    try:
+        if CONFIG_PATH.read_bytes() == new_bytes:
+            return False
+    except OSError:
+        pass
+    CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".config-", suffix=".json", dir=CONFIG_PATH.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(new_bytes)
+        os.replace(tmp, CONFIG_PATH)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return True
+
+
 def load_config() -> dict:
     ensure_dirs()
     try:
@@ -294,11 +708,6 @@ def load_config() -> dict:
                     if k not in cfg:
                         cfg[k] = v
                         changed = True
-                if changed:
-                    try:
-                        CONFIG_PATH.write_text(json.dumps(cfg, indent=2), encoding="utf-8")
-                    except Exception:
-                        pass
                 # Light merge for keyword_phrases to include new defaults by phrase label
                 try:
                     if isinstance(cfg.get("keyword_phrases"), list) and isinstance(DEFAULT_CONFIG.get("keyword_phrases"), list):
@@ -306,28 +715,39 @@ def load_config() -> dict:
                         to_add = [it for it in DEFAULT_CONFIG["keyword_phrases"] if isinstance(it, dict) and str(it.get("phrase")) not in existing]
                         if to_add:
                             cfg["keyword_phrases"].extend(to_add)
-                            CONFIG_PATH.write_text(json.dumps(cfg, indent=2), encoding="utf-8")
+                            changed = True
                 except Exception:
                     pass
-                return cfg
+                # One write for both merges (and none if the bytes are unchanged)
+                if changed:
+                    try:
+                        save_config(cfg)
+                    except Exception:
+                        pass
+                return compile_config(cfg)
     except Exception:
         pass
     # Write defaults on first run for visibility
     try:
-        CONFIG_PATH.write_text(json.dumps(DEFAULT_CONFIG, indent=2), encoding="utf-8")
+        save_config(DEFAULT_CONFIG)
     except Exception:
         pass
-    return DEFAULT_CONFIG.copy()
+    return compile_config(DEFAULT_CONFIG.copy())
 
 
-def redact(text: str, patterns: list[str]) -> str:
-    import re
+def redact(text: str, cfg: dict) -> str:
+    """Replace matches of the configured redact_patterns with [redacted].
+
+    Uses the fused alternation from compile_config() so the text is scanned
+    once; falls back to one pass per pattern if the union failed to compile.
+    """
+    cfg = compiled_config(cfg)
+    union = cfg.get("_redact_union_re")
+    if union is not None:
+        return union.sub("[redacted]", text)
     out = text
-    for pat in patterns:
-        try:
-            out = re.sub(pat, "[redacted]", out)
-        except re.error:
-            continue
+    for rx in cfg["_redact_patterns_re"]:
+        out = rx.sub("[redacted]", out)
     return out
 
 
@@ -380,25 +800,40 @@ def get_idle_seconds() -> int:
         return 0
 
 
+@lru_cache(maxsize=4096)
+def url_hostname(url: str) -> str:
+    """Lower-cased hostname of url ("" if none or unparsable)."""
+    try:
+        return (urlsplit(url).hostname or "").lower()
+    except Exception:
+        return ""
+
+
+_CHROME_PROFILE_SUFFIX_RE = re.compile(r"\s-\s[^-]+\s*\([^)]+\)\s*$")
+_PAREN_DOMAIN_RE = re.compile(r"\(([A-Za-z0-9.-]+\.[A-Za-z]{2,})\)\s*$")
+_TRAILING_PAREN_RE = re.compile(r"\([^)]+\)$")
+_DOMAIN_TOKEN_RE = re.compile(r"[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+
+
+@lru_cache(maxsize=4096)
 def extract_domain_from_title(title: str, app: str) -> Optional[str]:
     # Heuristics for Chrome/Safari-style titles; pick a token that looks like a domain
     # We avoid Chrome profile suffixes like "… - Google Chrome - Jack (physicaltherapybiz.com)".
-    import re
     is_chrome = "Chrome" in (app or "") or app in ("Arc", "Brave Browser")
     # If this looks like a Chrome profile suffix at end (" - Name (domain)") then ignore parentheses domain
-    if is_chrome and re.search(r"\s-\s[^-]+\s*\([^)]+\)\s*$", title):
+    if is_chrome and _CHROME_PROFILE_SUFFIX_RE.search(title):
         pass  # skip parentheses extraction
     else:
-        m = re.search(r"\(([A-Za-z0-9.-]+\.[A-Za-z]{2,})\)\s*$", title)
+        m = _PAREN_DOMAIN_RE.search(title)
         if m:
             return m.group(1)
     # Else find last dash-separated token that looks like a domain but ignore typical chrome suffix chunks
     parts = [p.strip() for p in title.split("-") if p.strip()]
     # Drop trailing chunk if it looks like a profile name like "Jack (domain)"
-    if parts and re.search(r"\([^)]+\)$", parts[-1]):
+    if parts and _TRAILING_PAREN_RE.search(parts[-1]):
         parts = parts[:-1]
     for token in reversed(parts):
-        if re.fullmatch(r"[A-Za-z0-9.-]+\.[A-Za-z]{2,}", token):
+        if _DOMAIN_TOKEN_RE.fullmatch(token):
             return token
     return None
 
@@ -487,12 +922,83 @@ def report_path_for(date_local: datetime) -> Path:
 
 # ----------------------- Front App/Window ------------------------
 
+# Lazily imported PyObjC handles: None = not tried yet, () = unavailable.
+_AX_API: Optional[tuple] = None
+
+
+def _load_ax_api() -> tuple:
+    global _AX_API
+    if _AX_API is None:
+        try:
+            from AppKit import NSRunningApplication  # type: ignore
+            from ApplicationServices import (  # type: ignore
+                AXUIElementCopyAttributeValue,
+                AXUIElementCreateSystemWide,
+                AXUIElementGetPid,
+                kAXFocusedApplicationAttribute,
+                kAXFocusedWindowAttribute,
+                kAXTitleAttribute,
+            )
+            _AX_API = (
+                AXUIElementCreateSystemWide(),
+                AXUIElementCopyAttributeValue,
+                AXUIElementGetPid,
+                NSRunningApplication,
+                kAXFocusedApplicationAttribute,
+                kAXFocusedWindowAttribute,
+                kAXTitleAttribute,
+            )
+        except Exception:
+            _AX_API = ()
+    return _AX_API
+
+
+def get_front_app_and_title_ax() -> Optional[Tuple[str, str]]:
+    """In-process (app_name, window_title) via PyObjC's Accessibility API.
+
+    Avoids spawning osascript on every poll. Uses the system-wide focused
+    application rather than NSWorkspace.frontmostApplication(), which goes
+    stale in a process without a run loop. Returns None when PyObjC is not
+    installed or Accessibility access is denied.
+    """
+    api = _load_ax_api()
+    if not api:
+        return None
+    system_wide, copy_attr, get_pid, running_app, k_focused_app, k_focused_win, k_title = api
+    try:
+        err, app_el = copy_attr(system_wide, k_focused_app, None)
+        if err or app_el is None:
+            return None
+        err, pid = get_pid(app_el, None)
+        if err:
+            return None
+        app = running_app.runningApplicationWithProcessIdentifier_(pid)
+        name = str(app.localizedName() or "") if app is not None else ""
+        if not name:
+            return None
+        title = ""
+        err, win = copy_attr(app_el, k_focused_win, None)
+        if not err and win is not None:
+            err, val = copy_attr(win, k_title, None)
+            if not err and val:
+                title = str(val)
+        return name, title
+    except Exception:
+        return None
+
+
 def get_front_app_and_title() -> Tuple[str, str, Optional[str]]:
-    """Returns (app_name, window_title) using AppleScript via osascript.
+    """Returns (app_name, window_title, url).
 
-    Works on macOS without extra dependencies. Requires Accessibility permissions
-    for Terminal (or the host app) under System Settings > Privacy & Security.
+    Uses the in-process Accessibility API when PyObjC is installed, else
+    AppleScript via osascript (works on macOS without extra dependencies).
+    Both require Accessibility permissions for Terminal (or the host app)
+    under System Settings > Privacy & Security.
     """
+    ax = get_front_app_and_title_ax()
+    if ax is not None:
+        app, title = ax
+        return app, title, get_front_url_if_browser(app)
     script = [
         "tell application \"System Events\"",
         "set frontApp to first process whose frontmost is true",
@@ -549,18 +1055,14 @@ def get_front_url_if_browser(app_name: str) -> Optional[str]:
         url = res.stdout.strip()
         if not url:
             return None
-        from urllib.parse import urlparse
-        dom = None
-        try:
-            dom = urlparse(url).hostname
-        except Exception:
-            dom = None
+        dom = url_hostname(url)
         # Respect domain exclusions and privacy
         try:
-            exclude = set((RUNTIME_CFG or DEFAULT_CONFIG).get("exclude_domains", []) or [])
-            private = set((RUNTIME_CFG or DEFAULT_CONFIG).get("private_domains", []) or [])
+            cfg = RUNTIME_CFG or DEFAULT_CONFIG
+            exclude = cfg_set(cfg, "exclude_domains")
+            private = cfg_set(cfg, "private_domains")
         except Exception:
-            exclude = set(); private = set()
+            exclude = private = frozenset()
 
         if dom and dom in exclude:
             return None
@@ -598,21 +1100,79 @@ class Session:
 
 # ----------------------- Tracker Core ----------------------------
 
+class _JsonlWriter:
+    """Append-only JSONL writer that keeps the current day's log open.
+
+    The file is opened once per log path (i.e. per day) instead of per
+    record; lines collect in a 64 KB buffer and reach disk when it fills,
+    on flush(), or on close(). Rolls over to a new file when the path changes.
+    """
+
+    def __init__(self, buffer_size: int = 64 * 1024) -> None:
+        self.buffer_size = buffer_size
+        self.path: Optional[Path] = None
+        self.fh = None
+        self._lock = threading.Lock()
+
+    def write(self, path: Path, record: dict) -> None:
+        line = json_dumps_bytes(record) + b"\n"
+        with self._lock:
+            if self.fh is None or path != self.path:
+                self._close_locked(fsync=False)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self.fh = open(path, "ab", buffering=self.buffer_size)
+                self.path = path
+            self.fh.write(line)
+
+    def flush(self, fsync: bool = False) -> None:
+        with self._lock:
+            if self.fh is None:
+                return
+            self.fh.flush()
+            if fsync:
+                os.fsync(self.fh.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked(fsync=True)
+
+    def _close_locked(self, fsync: bool) -> None:
+        if self.fh is None:
+            return
+        try:
+            self.fh.flush()
+            if fsync:
+                os.fsync(self.fh.fileno())
+        finally:
+            self.fh.close()
+            self.fh = None
+            self.path = None
+
+
 class Tracker:
-    def __init__(self, poll_seconds: int = 5, idle_threshold: int = 300, heartbeat_seconds: int = 120) -> None:
+    def __init__(self, poll_seconds: int = 5, idle_threshold: int = 300, heartbeat_seconds: int = 120,
+                 min_event_sec: Optional[float] = None) -> None:
         self.poll_seconds = max(1, poll_seconds)
         self.idle_threshold = max(0, idle_threshold)
         self.heartbeat_seconds = max(30, heartbeat_seconds)
+        if min_event_sec is None:
+            try:
+                cfg = RUNTIME_CFG or DEFAULT_CONFIG
+                min_event_sec = float(cfg.get("capture", {}).get("min_event_sec", 2))
+            except Exception:
+                min_event_sec = 2.0
+        self.min_event_sec = max(0.0, min_event_sec)
         self.current: Optional[Session] = None
         self._stop = threading.Event()
         self._lock = threading.Lock()
         self._last_heartbeat: Optional[datetime] = None
+        self._jsonl = _JsonlWriter()
 
     def stop(self) -> None:
         self._stop.set()
 
     def _write_event(self, event: dict) -> None:
-        ts = datetime.fromisoformat(event["start"]).astimezone(CHICAGO_TZ) if CHICAGO_TZ else datetime.fromisoformat(event["start"]).astimezone()
+        ts = parse_iso(event["start"]).astimezone(CHICAGO_TZ)
         # Prefer writing via the new bridge API (tools/tracker_bridge.py) so the
         # event goes through the consolidated `daily_logger` with locking,
         # deduplication and rotation. Fall back to legacy local JSONL + SQLite
@@ -631,11 +1191,8 @@ class Tracker:
             # Bridge not available or failed — continue to fallback
             pass
 
-        # Fallback: write directly to JSONL and mirror to SQLite
-        log_path = log_path_for(ts)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        with log_path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        # Fallback: append to the day's JSONL (kept open, buffered) and mirror to SQLite
+        self._jsonl.write(log_path_for(ts), event)
         # Mirror to SQLite for richer queries
         db_insert_focus_event(event)
 
@@ -689,6 +1246,11 @@ class Tracker:
                     self._roll_current(now)
                     self._last_heartbeat = now
                 return  # no change
+            if (now - self.current.start).total_seconds() < self.min_event_sec:
+                # Rapid switching (e.g. alt-tab flurry): fold the blip into the
+                # new window instead of writing a near-empty event
+                self.current = Session(app, title, self.current.start, url)
+                return
             # write previous session and start new one
             self._roll_current(now)
             self.current = Session(app, title, now, url)
@@ -698,6 +1260,12 @@ class Tracker:
         with self._lock:
             if self.current is not None:
                 self._roll_current(now_tz(CHICAGO_TZ))
+        self._jsonl.flush()
+
+    def close(self) -> None:
+        """Flush the open session and durably close the JSONL writer (shutdown path)."""
+        self.flush()
+        self._jsonl.close()
 
     def run(self) -> None:
         while not self._stop.is_set():
@@ -714,6 +1282,8 @@ class Tracker:
         """
         with self._lock:
             self._roll_current(dt)
+        # Make the segment visible to summary readers right away
+        self._jsonl.flush()
 
 
 # ----------------------- Summary ---------------------------------
@@ -721,18 +1291,19 @@ class Tracker:
 def load_events_for_date(date_local: datetime) -> list[dict]:
     path = log_path_for(date_local)
     events: list[dict] = []
-    if not path.exists():
+    try:
+        # One read and a C-level split; json_loads accepts the bytes directly
+        data = path.read_bytes()
+    except FileNotFoundError:
         return events
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                evt = json.loads(line)
-                events.append(evt)
-            except json.JSONDecodeError:
-                continue
+    for line in data.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            events.append(json_loads(line))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
     return events
 
 
@@ -822,7 +1393,7 @@ def generate_summary_for(date_local: datetime, cutoff_hour_local: Optional[int]
 
 
 def aggregate_summary(date_local: datetime, cutoff_hour_local: Optional[int] = None, cfg: Optional[dict] = None) -> dict:
-    tz = CHICAGO_TZ or datetime.now().astimezone().tzinfo
+    tz = CHICAGO_TZ
     assert tz is not None
     cfg = cfg or DEFAULT_CONFIG
     start_hr = int((cfg or {}).get("day_start_hour_local", 6))
@@ -831,8 +1402,6 @@ def aggregate_summary(date_local: datetime, cutoff_hour_local: Optional[int] = N
     window_start = base_start + timedelta(hours=start_hr)
     cutoff = base_start + timedelta(hours=end_hr)
 
-    events = load_events_for_date(date_local)
-
     total_seconds = 0
     by_app: dict[str, int] = {}
     by_window: dict[Tuple[str, str], int] = {}
@@ -849,45 +1418,14 @@ def aggregate_summary(date_local: datetime, cutoff_hour_local: Optional[int] = N
     first_ts: Optional[datetime] = None
     last_ts: Optional[datetime] = None
 
-    cfg = cfg or DEFAULT_CONFIG
-    exclude_apps = set(cfg.get("exclude_apps", []))
+    cfg = compiled_config(cfg)
+    exclude_apps = cfg_set(cfg, "exclude_apps")
     app_categories: dict[str, str] = cfg.get("app_categories", {})
 
-    # Prepare rule regexes
-    import re
-    rule_specs = cfg.get("rules", [])
-    compiled_rules: list[Tuple[re.Pattern[str], str]] = []
-    for rule in rule_specs:
-        pat = rule.get("pattern")
-        proj = rule.get("project") or rule.get("tag")
-        if not pat or not proj:
-            continue
-        try:
-            compiled_rules.append((re.compile(pat, re.IGNORECASE), str(proj)))
-        except re.error:
-            continue
-
-    # URL path-based rules
-    path_specs = cfg.get("path_rules", [])
-    compiled_path_rules: list[Tuple[re.Pattern[str], str]] = []
-    for rule in path_specs:
-        pat = rule.get("pattern")
-        proj = rule.get("project") or rule.get("tag")
-        if not pat or not proj:
-            continue
-        try:
-            compiled_path_rules.append((re.compile(pat, re.IGNORECASE), str(proj)))
-        except re.error:
-            continue
-
-    # Ticket/token extraction regexes
-    token_specs = cfg.get("ticket_patterns", [])
-    compiled_tokens: list[re.Pattern[str]] = []
-    for pat in token_specs:
-        try:
-            compiled_tokens.append(re.compile(pat, re.IGNORECASE))
-        except re.error:
-            continue
+    # Rule, URL path-rule and ticket regexes are precompiled at config load
+    rules_matcher: RuleMatcher = cfg["_rules_matcher"]
+    path_rules_matcher: RuleMatcher = cfg["_path_rules_matcher"]
+    ticket_extractor: TokenExtractor = cfg["_ticket_extractor"]
 
     def classify_project(app: str, title: str) -> Optional[str]:
         text = f"{app} {title}"
@@ -898,9 +1436,9 @@ def aggregate_summary(date_local: datetime, cutoff_hour_local: Optional[int] = N
         repo_hint = read_recent_term_ping_repo()
         if repo_hint:
             text = text + f" {repo_hint}"
-        for rx, proj in compiled_rules:
-            if rx.search(text):
-                return proj
+        proj = rules_matcher.match(text)
+        if proj:
+            return proj
         # Fallback to domain as project surrogate
         if dom:
             return dom
@@ -919,21 +1457,8 @@ def aggregate_summary(date_local: datetime, cutoff_hour_local: Optional[int] = N
             by_hour[cur.hour] = by_hour.get(cur.hour, 0) + sec
             cur = chunk_end
 
-    for evt in events:
-        start = parse_iso(evt["start"]).astimezone(tz)  # type: ignore
-        end = parse_iso(evt["end"]).astimezone(tz)      # type: ignore
-        app = str(evt.get("app", ""))
-        title = str(evt.get("title", ""))
-        url = str(evt.get("url", "")) if evt.get("url") else ""
-
-        if app in exclude_apps:
-            continue
-
-        seg_start = max(start, window_start)
-        seg_end = min(end, cutoff)
-        if seg_end <= seg_start:
-            continue
-        sec = int((seg_end - seg_start).total_seconds())
+    def tally(app: str, title: str, url: str, sec: int) -> None:
+        nonlocal total_seconds
         total_seconds += sec
         by_app[app] = by_app.get(app, 0) + sec
         by_window[(app, title)] = by_window.get((app, title), 0) + sec
@@ -944,24 +1469,12 @@ def aggregate_summary(date_local: datetime, cutoff_hour_local: Optional[int] = N
         if ws:
             by_workspace[ws] = by_workspace.get(ws, 0) + sec
         # Prefer domain from URL when available for classification
-        dom_from_url = None
-        if url:
-            try:
-                from urllib.parse import urlparse
-                dom_from_url = urlparse(url).hostname
-            except Exception:
-                dom_from_url = None
+        dom_from_url = url_hostname(url) if url else ""
         # Domain exclusions and privacy handled above; include domain hint for classification
         proj = None
         # First: URL path-based rules if we have a URL
         if url:
-            for rx, pj in compiled_path_rules:
-                try:
-                    if rx.search(url):
-                        proj = pj
-                        break
-                except Exception:
-                    pass
+            proj = path_rules_matcher.match(url)
         if not proj:
             proj = classify_project(app, title if not dom_from_url else f"{title} ({dom_from_url})")
         if proj:
@@ -984,26 +1497,48 @@ def aggregate_summary(date_local: datetime, cutoff_hour_local: Optional[int] = N
         dom = extract_domain_from_title(title, app)
         if dom:
             text = text + f" {dom}"
-        for rx in compiled_tokens:
-            try:
-                found = rx.findall(text)
-            except Exception:
-                found = []
-            if not found:
+        for token in ticket_extractor.findall(text):
+            by_token[token] = by_token.get(token, 0) + sec
+
+    # Prefer the SQLite mirror: time is summed per distinct (app, title, url)
+    # in SQL so the classification below runs once per window, not per event.
+    rollup = db_window_rollup(window_start, cutoff)
+    if rollup is not None:
+        first_epoch: Optional[int] = None
+        last_epoch: Optional[int] = None
+        for app, title, url, sec, s_min, e_max in rollup["windows"]:
+            app = str(app or "")
+            if app in exclude_apps:
+                continue
+            tally(app, str(title or ""), str(url or ""), int(sec))
+            first_epoch = s_min if first_epoch is None else min(first_epoch, s_min)
+            last_epoch = e_max if last_epoch is None else max(last_epoch, e_max)
+        for app, hour, sec in rollup["hourly"]:
+            if str(app or "") not in exclude_apps:
+                by_hour[hour] = by_hour.get(hour, 0) + int(sec)
+        if first_epoch is not None and last_epoch is not None:
+            first_ts = datetime.fromtimestamp(first_epoch, tz)
+            last_ts = datetime.fromtimestamp(last_epoch, tz)
+    else:
+        # Fallback: scan the day's JSONL (rows never mirrored to SQLite)
+        for evt in load_events_for_date(date_local):
+            start = parse_iso(evt["start"]).astimezone(tz)  # type: ignore
+            end = parse_iso(evt["end"]).astimezone(tz)      # type: ignore
+            app = str(evt.get("app", ""))
+            title = str(evt.get("title", ""))
+            url = str(evt.get("url", "")) if evt.get("url") else ""
+
+            if app in exclude_apps:
                 continue
-            # flatten tuples if any
-            if found and isinstance(found[0], tuple):
-                for tup in found:
-                    token = " ".join([t for t in tup if t])
-                    if token:
-                        by_token[token] = by_token.get(token, 0) + sec
-            else:
-                for token in found:
-                    if token:
-                        by_token[token] = by_token.get(token, 0) + sec
-        add_hourly(seg_start, seg_end)
-        first_ts = seg_start if first_ts is None else min(first_ts, seg_start)
-        last_ts = seg_end if last_ts is None else max(last_ts, seg_end)
+
+            seg_start = max(start, window_start)
+            seg_end = min(end, cutoff)
+            if seg_end <= seg_start:
+                continue
+            tally(app, title, url, int((seg_end - seg_start).total_seconds()))
+            add_hourly(seg_start, seg_end)
+            first_ts = seg_start if first_ts is None else min(first_ts, seg_start)
+            last_ts = seg_end if last_ts is None else max(last_ts, seg_end)
 
     # Browser highlights (cached; counts only, not time)
     browser = collect_browser_history_cached(window_start, cutoff, cfg)
@@ -1155,7 +1690,6 @@ def aggregate_summary(date_local: datetime, cutoff_hour_local: Optional[int] = N
 
 
 def synthesize_manager_bullets(agg: dict, cfg: dict) -> list[str]:
-    import re
     bt = cfg.get("bullet_thresholds", {})
     proj_min = int(bt.get("project_min_sec", 15 * 60))
     tok_min = int(bt.get("token_min_sec", 10 * 60))
@@ -1275,29 +1809,15 @@ def synthesize_manager_bullets(agg: dict, cfg: dict) -> list[str]:
             return bullets
 
     # Keyword-based from top windows
-    key_specs = cfg.get("keyword_phrases", [])
-    compiled = []
-    for spec in key_specs:
-        pat = spec.get("pattern")
-        phr = spec.get("phrase")
-        if not pat or not phr:
-            continue
-        try:
-            compiled.append((re.compile(pat, re.IGNORECASE), phr))
-        except re.error:
-            continue
+    phrase_matcher: RuleMatcher = compiled_config(cfg)["_keyword_phrases_matcher"]
 
     for (app, title), sec in sorted(agg.get("by_window", {}).items(), key=lambda x: x[1], reverse=True):
         if sec < win_min:
             continue
-        text = f"{app} {title}"
-        matched = False
-        for rx, phr in compiled:
-            if rx.search(text):
-                bullets.append(f"{phr} ({seconds_to_hhmm(sec)})")
-                matched = True
-                break
-        if matched and len(bullets) >= max_items:
+        phr = phrase_matcher.match(f"{app} {title}")
+        if phr:
+            bullets.append(f"{phr} ({seconds_to_hhmm(sec)})")
+        if phr and len(bullets) >= max_items:
             return bullets
 
     # If still sparse, add top apps
@@ -1472,7 +1992,7 @@ def confidence_appt(appt: dict, cfg: dict) -> str:
 def synthesize_carryover(agg: dict, cfg: dict) -> dict:
     """Look back over the previous 3 days and compute small momentum stats."""
     from datetime import date
-    tz = CHICAGO_TZ or datetime.now().astimezone().tzinfo
+    tz = CHICAGO_TZ
     today = agg.get("day_start", datetime.now(tz)).date() if isinstance(agg.get("day_start"), datetime) else datetime.now(tz).date()
     total_appts = 0
     try:
@@ -1593,6 +2113,42 @@ def list_chrome_history_files(cfg: dict) -> list[Path]:
     return history_paths
 
 
+def query_history_db(path: Path, queries: list[Tuple[str, tuple]], prefix: str = "at_hist_") -> list[tuple]:
+    """Run the first query that the schema accepts against a browser history DB.
+
+    The file is opened in place through a read-only, immutable URI, which
+    ignores the browser's lock and needs no copy. If that fails (e.g. a page
+    is mid-write), the DB is copied to a temp file and queried there.
+    Queries are tried in order; OperationalError moves on to the next one.
+    """
+    def run(con: sqlite3.Connection) -> list[tuple]:
+        cur = con.cursor()
+        for i, (sql, params) in enumerate(queries):
+            try:
+                cur.execute(sql, params)
+                return cur.fetchall()
+            except sqlite3.OperationalError:
+                if i == len(queries) - 1:
+                    raise
+        return []
+
+    try:
+        con = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro&immutable=1", uri=True)
+        try:
+            return run(con)
+        finally:
+            con.close()
+    except sqlite3.Error:
+        pass
+    with tempfile.NamedTemporaryFile(prefix=prefix, suffix=".db", delete=True) as tf:
+        shutil.copy2(path, tf.name)
+        con = sqlite3.connect(tf.name)
+        try:
+            return run(con)
+        finally:
+            con.close()
+
+
 def collect_chrome_history(day_start: datetime, cutoff: datetime, cfg: dict) -> dict:
     """Collect Chrome history visit counts within [day_start, cutoff].
     Returns dict with keys: by_domain (dict[str,int]), pages (list[tuple[str,str,int]]), tokens (dict[str,int])
@@ -1603,37 +2159,15 @@ def collect_chrome_history(day_start: datetime, cutoff: datetime, cfg: dict) ->
     include_filters = [s.lower() for s in integ.get("chrome_profiles_include", []) or []]
     history_paths = list_chrome_history_files(cfg)
 
-    by_domain: dict[str, int] = {}
-    page_counts: dict[tuple[str, str], int] = {}
-    tokens: dict[str, int] = {}
+    by_domain: Counter[str] = Counter()
+    page_counts: Counter[tuple[str, str]] = Counter()
+    tokens: Counter[str] = Counter()
 
-    # Token regexes (reuse config)
-    import re
-    token_specs = cfg.get("ticket_patterns", [])
-    compiled_tokens: list[re.Pattern[str]] = []
-    for pat in token_specs:
-        try:
-            compiled_tokens.append(re.compile(pat, re.IGNORECASE))
-        except re.error:
-            continue
+    # Ticket patterns fused into one regex at config load
+    ticket_extractor: TokenExtractor = compiled_config(cfg)["_ticket_extractor"]
 
     def add_tokens(text: str):
-        for rx in compiled_tokens:
-            try:
-                found = rx.findall(text)
-            except Exception:
-                found = []
-            if not found:
-                continue
-            if found and isinstance(found[0], tuple):
-                for tup in found:
-                    token = " ".join([t for t in tup if t])
-                    if token:
-                        tokens[token] = tokens.get(token, 0) + 1
-            else:
-                for token in found:
-                    if token:
-                        tokens[token] = tokens.get(token, 0) + 1
+        tokens.update(ticket_extractor.findall(text))
 
     # Time bounds in Chrome epoch (web microseconds since 1601 UTC)
     # Convert using inverse function; here we convert day_start/cutoff to Chrome microseconds
@@ -1646,53 +2180,38 @@ def collect_chrome_history(day_start: datetime, cutoff: datetime, cfg: dict) ->
 
     for hp in history_paths:
         try:
-            with tempfile.NamedTemporaryFile(prefix="at_chrome_", suffix=".db", delete=True) as tf:
-                shutil.copy2(hp, tf.name)
-                con = sqlite3.connect(tf.name)
-                cur = con.cursor()
-                try:
-                    cur.execute(
-                        "SELECT v.visit_time, u.url, u.title FROM visits v JOIN urls u ON v.url = u.id WHERE v.visit_time BETWEEN ? AND ?",
-                        (start_us, end_us),
-                    )
-                except sqlite3.OperationalError:
-                    # Older schema; try basic urls range by last_visit_time
-                    cur.execute(
-                        "SELECT u.last_visit_time, u.url, u.title FROM urls u WHERE u.last_visit_time BETWEEN ? AND ?",
-                        (start_us, end_us),
-                    )
-                rows = cur.fetchall()
-                con.close()
+            rows = query_history_db(hp, [
+                ("SELECT v.visit_time, u.url, u.title FROM visits v JOIN urls u ON v.url = u.id WHERE v.visit_time BETWEEN ? AND ?",
+                 (start_us, end_us)),
+                # Older schema; try basic urls range by last_visit_time
+                ("SELECT u.last_visit_time, u.url, u.title FROM urls u WHERE u.last_visit_time BETWEEN ? AND ?",
+                 (start_us, end_us)),
+            ], prefix="at_chrome_")
         except Exception:
             continue
 
         profile_name = hp.parent.name  # directory name reflects the Chrome profile folder
         for visit_time, url, title in rows:
-            try:
-                from urllib.parse import urlparse
-                dom = urlparse(url).hostname or ""
-                dom = dom.lower()
-            except Exception:
-                dom = ""
+            dom = url_hostname(url or "")
             if dom:
-                by_domain[dom] = by_domain.get(dom, 0) + 1
+                by_domain[dom] += 1
             title_str = str(title or "")
             if dom or title_str:
-                page_counts[(dom, title_str)] = page_counts.get((dom, title_str), 0) + 1
+                page_counts[(dom, title_str)] += 1
             # Tokenize with URL and add google service tokens if enabled
             add_tokens(f"{title_str} {url}")
             if integ.get("google_service_tokens"):
                 svc = classify_google_service(url or "")
                 if svc:
-                    tokens[svc] = tokens.get(svc, 0) + 1
+                    tokens[svc] += 1
             # Add profile tag token to allow profile->project mapping later
-            tokens[f"profile:{profile_name}"] = tokens.get(f"profile:{profile_name}", 0) + 1
+            tokens[f"profile:{profile_name}"] += 1
 
     # Build top pages list
     pages_sorted = sorted(page_counts.items(), key=lambda x: x[1], reverse=True)[:20]
     pages = [(dom, title, count) for (dom, title), count in pages_sorted]
 
-    return {"by_domain": by_domain, "pages": pages, "tokens": tokens}
+    return {"by_domain": dict(by_domain), "pages": pages, "tokens": dict(tokens)}
 
 
 def classify_google_service(url: str) -> Optional[str]:
@@ -1829,7 +2348,7 @@ def list_browser_profiles() -> None:
 
 
 def scan_browser_today() -> None:
-    tz = CHICAGO_TZ or datetime.now().astimezone().tzinfo
+    tz = CHICAGO_TZ
     now = now_tz(CHICAGO_TZ).astimezone(tz)
     day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     cutoff = now
@@ -1843,7 +2362,7 @@ def autodetect_chrome_profile_today() -> Optional[str]:
     base = Path.home() / "Library" / "Application Support" / "Google" / "Chrome"
     if not base.exists():
         return None
-    tz = CHICAGO_TZ or datetime.now().astimezone().tzinfo
+    tz = CHICAGO_TZ
     now = now_tz(CHICAGO_TZ).astimezone(tz)
     day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     # Iterate all History DBs and count visits today
@@ -1854,24 +2373,17 @@ def autodetect_chrome_profile_today() -> Optional[str]:
             continue
         # Count quickly
         try:
-            import sqlite3, tempfile, shutil
-            with tempfile.NamedTemporaryFile(prefix="at_detect_", suffix=".db", delete=True) as tf:
-                shutil.copy2(hist, tf.name)
-                con = sqlite3.connect(tf.name)
-                cur = con.cursor()
-                # Bounds in Chrome epoch
-                def dt_to_us(dt):
-                    base1601 = datetime(1601,1,1,tzinfo=timezone.utc)
-                    return int((dt.astimezone(timezone.utc) - base1601).total_seconds()*1_000_000)
-                start_us = dt_to_us(day_start)
-                end_us = dt_to_us(now)
-                try:
-                    cur.execute("SELECT COUNT(*) FROM visits WHERE visit_time BETWEEN ? AND ?", (start_us, end_us))
-                except sqlite3.OperationalError:
-                    cur.execute("SELECT COUNT(*) FROM urls WHERE last_visit_time BETWEEN ? AND ?", (start_us, end_us))
-                row = cur.fetchone()
-                con.close()
-                cnt = int(row[0]) if row else 0
+            # Bounds in Chrome epoch
+            def dt_to_us(dt):
+                base1601 = datetime(1601,1,1,tzinfo=timezone.utc)
+                return int((dt.astimezone(timezone.utc) - base1601).total_seconds()*1_000_000)
+            start_us = dt_to_us(day_start)
+            end_us = dt_to_us(now)
+            rows = query_history_db(hist, [
+                ("SELECT COUNT(*) FROM visits WHERE visit_time BETWEEN ? AND ?", (start_us, end_us)),
+                ("SELECT COUNT(*) FROM urls WHERE last_visit_time BETWEEN ? AND ?", (start_us, end_us)),
+            ], prefix="at_detect_")
+            cnt = int(rows[0][0]) if rows else 0
         except Exception:
             cnt = 0
         if cnt > best_count:
@@ -1926,11 +2438,22 @@ def prune_old_data(days: int) -> None:
     except Exception:
         pass
     # SQLite
+    prune_old(days)
+
+
+def prune_old(days: int) -> None:
+    """Delete focus events older than `days` in one ranged DELETE.
+
+    The start_epoch predicate is served by idx_focus_start_epoch, so the
+    sweep touches only the expired rows instead of scanning the table.
+    """
+    cutoff = int((now_tz(CHICAGO_TZ) - timedelta(days=max(1, days))).timestamp())
     try:
-        con = sqlite3.connect(DB_PATH)
-        cur = con.cursor()
-        cur.execute("DELETE FROM focus_events WHERE end < ?", (iso(cutoff_dt),))
-        con.commit(); con.close()
+        con = db_conn()
+        with _DB_LOCK:
+            con.execute("DELETE FROM focus_events WHERE start_epoch < ?", (cutoff,))
+            con.commit()
+            con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
     except Exception:
         pass
 
@@ -1975,12 +2498,12 @@ def view_daily_terminal(day: datetime) -> None:
 
 def suggest_rules_today() -> None:
     cfg = load_config()
-    tz = CHICAGO_TZ or datetime.now().astimezone().tzinfo
+    tz = CHICAGO_TZ
     today = now_tz(CHICAGO_TZ).astimezone(tz).replace(hour=0, minute=0, second=0, microsecond=0)
     agg = aggregate_summary(today, int(cfg.get("day_end_hour_local", 24)), cfg)
     known = set(cfg.get('domain_projects', {}).keys())
-    exclude = set(cfg.get('exclude_domains', []))
-    priv = set(cfg.get('private_domains', []))
+    exclude = cfg_set(cfg, 'exclude_domains')
+    priv = cfg_set(cfg, 'private_domains')
     suggestions = []
     for dom, cnt in sorted((agg.get('browser_by_domain') or {}).items(), key=lambda x:x[1], reverse=True):
         if any(dom.endswith(k) for k in known) or dom in exclude or dom in priv:
@@ -2003,21 +2526,21 @@ def parse_ics_datetime(val: str) -> Optional[datetime]:
             tzname, dtstr = m.groups()
             tz = ZoneInfo(tzname) if ZoneInfo else None
             dt = datetime.strptime(dtstr, "%Y%m%dT%H%M%S")
-            return (dt.replace(tzinfo=tz) if tz else dt.replace(tzinfo=timezone.utc)).astimezone(CHICAGO_TZ or datetime.now().astimezone().tzinfo)
+            return (dt.replace(tzinfo=tz) if tz else dt.replace(tzinfo=timezone.utc)).astimezone(CHICAGO_TZ)
         # UTC Z suffix
         m = re.match(r"(\d{8}T\d{6})Z", val)
         if m:
             dt = datetime.strptime(m.group(1), "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
-            return dt.astimezone(CHICAGO_TZ or datetime.now().astimezone().tzinfo)
+            return dt.astimezone(CHICAGO_TZ)
         # Local date-time
         m = re.match(r"(\d{8}T\d{6})", val)
         if m:
-            dt = datetime.strptime(m.group(1), "%Y%m%dT%H%M%S").replace(tzinfo=CHICAGO_TZ or datetime.now().astimezone().tzinfo)
+            dt = datetime.strptime(m.group(1), "%Y%m%dT%H%M%S").replace(tzinfo=CHICAGO_TZ)
             return dt
         # All-day date
         m = re.match(r"(\d{8})", val)
         if m:
-            dt = datetime.strptime(m.group(1), "%Y%m%d").replace(tzinfo=CHICAGO_TZ or datetime.now().astimezone().tzinfo)
+            dt = datetime.strptime(m.group(1), "%Y%m%d").replace(tzinfo=CHICAGO_TZ)
             return dt
     except Exception:
         return None
@@ -2036,7 +2559,7 @@ def collect_calendar_events(day_start: datetime, cutoff: datetime) -> list[tuple
     import glob
     pattern = str(cal_dir / "*" / "Events" / "*.ics")
     paths = glob.glob(pattern)
-    tz = CHICAGO_TZ or datetime.now().astimezone().tzinfo
+    tz = CHICAGO_TZ
     # Optional calendar name filters
     try:
         filters = [s.lower() for s in (RUNTIME_CFG or DEFAULT_CONFIG).get("calendar_filters", []) or []]
@@ -2205,6 +2728,33 @@ def hubspot_token() -> Optional[str]:
     return None
 
 
+# ----------------------- HTTP (optional) -------------------------
+
+_HTTP = None  # shared requests.Session, created on first use
+_HTTP_LOCK = threading.Lock()
+
+
+def http_session():
+    """Return a process-wide requests.Session so slack_api and the remote ICS
+    fetch reuse pooled keep-alive connections instead of a new TCP+TLS
+    handshake each.
+    Raises ImportError if requests is not installed.
+    """
+    global _HTTP
+    if _HTTP is None:
+        with _HTTP_LOCK:
+            if _HTTP is None:
+                import requests  # type: ignore
+                from requests.adapters import HTTPAdapter  # type: ignore
+                s = requests.Session()
+                s.headers.update({"User-Agent": "ActivityTracker/1"})
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _HTTP = s
+    return _HTTP
+
+
 # ----------------------- Slack (optional) ------------------------
 
 def slack_token() -> Optional[str]:
@@ -2218,12 +2768,11 @@ def slack_token() -> Optional[str]:
 
 
 def slack_api(method: str, params: dict) -> Optional[dict]:
-    import requests  # type: ignore
     tok = slack_token()
     if not tok:
         return None
     try:
-        r = requests.get(f"https://slack.com/api/{method}", headers={"Authorization": f"Bearer {tok}"}, params=params, timeout=6)
+        r = http_session().get(f"https://slack.com/api/{method}", headers={"Authorization": f"Bearer {tok}"}, params=params, timeout=6)
         if r.status_code != 200:
             return None
         data = r.json()
@@ -2251,7 +2800,6 @@ def slack_get_self_id() -> Optional[str]:
 
 def slack_get_channel_id(name: str) -> Optional[str]:
     # Try to find by name (without #)
-    import requests  # type: ignore
     tok = slack_token()
     if not tok:
         return None
@@ -2397,12 +2945,21 @@ def hubspot_fetch_meetings(start: datetime, end: datetime) -> list[dict]:
 # ----------------------- Remote ICS (optional) -------------------
 
 def collect_remote_ics_events(urls: list[str], day_start: datetime, cutoff: datetime) -> list[tuple[str, datetime, datetime, list[str]]]:
-    import urllib.request
     events: list[tuple[str, datetime, datetime, list[str]]] = []
+    try:
+        session = http_session()
+    except ImportError:
+        session = None
     for url in urls or []:
         try:
-            with urllib.request.urlopen(url, timeout=8) as resp:
-                raw = resp.read()
+            if session is not None:
+                r = session.get(url, timeout=8)
+                r.raise_for_status()
+                raw = r.content
+            else:
+                import urllib.request
+                with urllib.request.urlopen(url, timeout=8) as resp:
+                    raw = resp.read()
             text = raw.decode('utf-8', errors='ignore')
         except Exception:
             continue
@@ -2530,37 +3087,15 @@ def collect_safari_history(day_start: datetime, cutoff: datetime, cfg: dict) ->
     if not db_path.exists():
         return {"by_domain": {}, "pages": [], "tokens": {}}
 
-    by_domain: dict[str, int] = {}
-    page_counts: dict[tuple[str, str], int] = {}
-    tokens: dict[str, int] = {}
+    by_domain: Counter[str] = Counter()
+    page_counts: Counter[tuple[str, str]] = Counter()
+    tokens: Counter[str] = Counter()
 
-    # Token regexes
-    import re
-    token_specs = cfg.get("ticket_patterns", [])
-    compiled_tokens: list[re.Pattern[str]] = []
-    for pat in token_specs:
-        try:
-            compiled_tokens.append(re.compile(pat, re.IGNORECASE))
-        except re.error:
-            continue
+    # Ticket patterns fused into one regex at config load
+    ticket_extractor: TokenExtractor = compiled_config(cfg)["_ticket_extractor"]
 
     def add_tokens(text: str):
-        for rx in compiled_tokens:
-            try:
-                found = rx.findall(text)
-            except Exception:
-                found = []
-            if not found:
-                continue
-            if found and isinstance(found[0], tuple):
-                for tup in found:
-                    token = " ".join([t for t in tup if t])
-                    if token:
-                        tokens[token] = tokens.get(token, 0) + 1
-            else:
-                for token in found:
-                    if token:
-                        tokens[token] = tokens.get(token, 0) + 1
+        tokens.update(ticket_extractor.findall(text))
 
     # Bounds in Safari epoch seconds
     def dt_to_safari_seconds(dt: datetime) -> float:
@@ -2571,42 +3106,27 @@ def collect_safari_history(day_start: datetime, cutoff: datetime, cfg: dict) ->
     end_s = dt_to_safari_seconds(cutoff)
 
     try:
-        with tempfile.NamedTemporaryFile(prefix="at_safari_", suffix=".db", delete=True) as tf:
-            shutil.copy2(db_path, tf.name)
-            con = sqlite3.connect(tf.name)
-            cur = con.cursor()
-            try:
-                cur.execute(
-                    "SELECT v.visit_time, i.url, i.title FROM history_visits v JOIN history_items i ON v.history_item = i.id WHERE v.visit_time BETWEEN ? AND ?",
-                    (start_s, end_s),
-                )
-            except sqlite3.OperationalError:
-                # Fallback: older schema variants
-                cur.execute(
-                    "SELECT i.visit_count, i.url, i.title FROM history_items i WHERE i.visit_count > 0",
-                )
-            rows = cur.fetchall()
-            con.close()
+        rows = query_history_db(db_path, [
+            ("SELECT v.visit_time, i.url, i.title FROM history_visits v JOIN history_items i ON v.history_item = i.id WHERE v.visit_time BETWEEN ? AND ?",
+             (start_s, end_s)),
+            # Fallback: older schema variants
+            ("SELECT i.visit_count, i.url, i.title FROM history_items i WHERE i.visit_count > 0", ()),
+        ], prefix="at_safari_")
     except Exception:
         rows = []
 
     for when_val, url, title in rows:
-        try:
-            from urllib.parse import urlparse
-            dom = urlparse(url or "").hostname or ""
-            dom = dom.lower()
-        except Exception:
-            dom = ""
+        dom = url_hostname(url or "")
         if dom:
-            by_domain[dom] = by_domain.get(dom, 0) + 1
+            by_domain[dom] += 1
         title_str = str(title or "")
         if dom or title_str:
-            page_counts[(dom, title_str)] = page_counts.get((dom, title_str), 0) + 1
+            page_counts[(dom, title_str)] += 1
         add_tokens(f"{title_str} {url}")
 
     pages_sorted = sorted(page_counts.items(), key=lambda x: x[1], reverse=True)[:20]
     pages = [(dom, title, count) for (dom, title), count in pages_sorted]
-    return {"by_domain": by_domain, "pages": pages, "tokens": tokens}
+    return {"by_domain": dict(by_domain), "pages": pages, "tokens": dict(tokens)}
 
 
 def collect_browser_history_cached(day_start: datetime, cutoff: datetime, cfg: dict) -> dict:
@@ -2687,9 +3207,8 @@ def generate_summary_html_for(date_local: datetime, cutoff_hour_local: Optional[
     ) or "<li>No data recorded</li>"
 
     # Redact sensitive bits in titles for presentation
-    redact_pats = cfg.get("redact_patterns", [])
     def red(s: str) -> str:
-        return esc(redact(s, redact_pats))
+        return esc(redact(s, cfg))
 
     top_windows = "".join(
         f"<li>{esc(app)} — {red(clean_title_for_display(app, title)) if title else '(no title)'}: {seconds_to_hhmm(sec)}</li>"
@@ -3183,7 +3702,7 @@ def aggregate_range(start_date: datetime, end_date: datetime, cfg: dict) -> dict
 
 def generate_weekly_html(end_date: Optional[datetime] = None, days: int = 7) -> Path:
     cfg = load_config()
-    tz = CHICAGO_TZ or datetime.now().astimezone().tzinfo
+    tz = CHICAGO_TZ
     end = (end_date or now_tz(CHICAGO_TZ)).replace(hour=0, minute=0, second=0, microsecond=0)
     start = end - timedelta(days=days-1)
     agg = aggregate_range(start, end, cfg)
@@ -3227,7 +3746,7 @@ def generate_weekly_html(end_date: Optional[datetime] = None, days: int = 7) ->
 # ----------------------- Scheduler (daily cutoff / 11pm) --------------------
 
 def seconds_until_next_midnight_chicago(ref: Optional[datetime] = None, cutoff_hour: int = 23) -> float:
-    tz = CHICAGO_TZ or datetime.now().astimezone().tzinfo
+    tz = CHICAGO_TZ
     now_local = (ref or now_tz(CHICAGO_TZ)).astimezone(tz)
     # Next cutoff is the next occurrence of cutoff_hour:00 local (today or tomorrow)
     target = now_local.replace(hour=cutoff_hour, minute=0, second=0, microsecond=0)
@@ -3236,6 +3755,62 @@ def seconds_until_next_midnight_chicago(ref: Optional[datetime] = None, cutoff_h
     return (target - now_local).total_seconds()
 
 
+def run_daily_cutoff(tracker: "Tracker") -> threading.Thread:
+    """Cut the session at the daily cutoff, then write the prior day's reports
+    and prune on a background thread so the scheduler is never held up by
+    Slack/ICS/browser-history work. Returns the started worker thread; it is
+    not a daemon, and run_cutoff_scheduler joins it before shutting down.
+    """
+    # We woke at (or extremely near) the cutoff; cut at current timestamp
+    cut_at = now_tz(CHICAGO_TZ).replace(microsecond=0)
+    tracker.split_at(cut_at)
+
+    today_local = now_tz(CHICAGO_TZ).date()
+    y = today_local - timedelta(days=1)
+    day = datetime(y.year, y.month, y.day)
+    worker = threading.Thread(target=generate_daily_reports, args=(day,), name="daily-summary")
+    worker.start()
+    return worker
+
+
+def generate_daily_reports(day: datetime) -> None:
+    """Generate the day's Markdown and HTML reports, open the HTML, then prune."""
+    md_report = generate_summary_for(day)
+    html_report = generate_summary_html_for(day)
+    print(f"[ActivityTracker] Generated reports: {md_report} | {html_report}")
+    try:
+        subprocess.run(["open", str(html_report)], check=False)
+    except Exception:
+        pass
+
+    # Once-a-day retention sweep of the event DB
+    try:
+        cfg = RUNTIME_CFG or load_config()
+        prune_old(int(cfg.get("retention_days", 60) or 60))
+    except Exception:
+        pass
+
+
+def run_cutoff_scheduler(tracker: "Tracker", stop_event: threading.Event) -> None:
+    """Run the daily cutoff each night until stop_event is set, then wait for
+    any report/prune work still in flight before closing the tracker, so a
+    shutdown right after the cutoff never leaves the day's reports half-written.
+    """
+    workers: list[threading.Thread] = []
+    try:
+        while not stop_event.is_set():
+            to_wait = max(1.0, seconds_until_next_midnight_chicago())
+            stop_event.wait(to_wait)
+            if stop_event.is_set():
+                break
+            workers = [w for w in workers if w.is_alive()]
+            workers.append(run_daily_cutoff(tracker))
+    finally:
+        for worker in workers:
+            worker.join()
+        tracker.close()
+
+
 def run_daemon(poll_seconds: int) -> None:
     ensure_dirs()
     tracker = Tracker(poll_seconds=poll_seconds)
@@ -3254,33 +3829,7 @@ def run_daemon(poll_seconds: int) -> None:
     t.start()
 
     # Scheduler loop (generate at configured daily cutoff, typically 11pm)
-    try:
-        while not stop_event.is_set():
-            to_wait = max(1.0, seconds_until_next_midnight_chicago())
-            stop_event.wait(to_wait)
-            if stop_event.is_set():
-                break
-
-            # Cut current session at the configured cutoff (Chicago) and generate summary for the prior day
-            now_local = now_tz(CHICAGO_TZ)
-            # We woke at (or extremely near) the cutoff; cut at current timestamp
-            cut_at = now_local.replace(microsecond=0)
-
-            tracker.split_at(cut_at)
-
-            # Generate yesterday's report (Markdown and HTML) and open HTML
-            today_local = now_tz(CHICAGO_TZ).date()
-            y = today_local - timedelta(days=1)
-            day = datetime(y.year, y.month, y.day)
-            md_report = generate_summary_for(day)
-            html_report = generate_summary_html_for(day)
-            print(f"[ActivityTracker] Generated reports: {md_report} | {html_report}")
-            try:
-                subprocess.run(["open", str(html_report)], check=False)
-            except Exception:
-                pass
-    finally:
-        tracker.flush()
+    run_cutoff_scheduler(tracker, stop_event)
 
 
 # ----------------------- CLI ------------------------------------
@@ -3372,7 +3921,7 @@ def main(argv: Optional[list[str]] = None) -> int:
         rules = cfg.setdefault("rules", [])
         rules.append({"pattern": args.pattern, "project": args.project})
         try:
-            CONFIG_PATH.write_text(json.dumps(cfg, indent=2), encoding="utf-8")
+            save_config(cfg)
             print(f"Added rule: /{args.pattern}/ -> {args.project}")
         except Exception as e:
             print(f"Failed to write config: {e}", file=sys.stderr)
@@ -3417,7 +3966,8 @@ def main(argv: Optional[list[str]] = None) -> int:
             if args.exclude_remove in lst:
                 lst.remove(args.exclude_remove); changed = True
         if changed:
-            CONFIG_PATH.write_text(json.dumps(cfg, indent=2), encoding="utf-8")
+            save_config(cfg)
+            compile_config(cfg)  # refresh the derived domain sets
             print("domain list updated")
         else:
             print("no changes")
@@ -3437,7 +3987,7 @@ def main(argv: Optional[list[str]] = None) -> int:
             cps = set(integ.get("chrome_profiles", []) or [])
             cps.add(name)
             integ["chrome_profiles"] = sorted(cps)
-            CONFIG_PATH.write_text(json.dumps(cfg, indent=2), encoding="utf-8")
+            save_config(cfg)
             print(f"Selected Chrome profile: {name}")
         else:
             print("Could not detect an active profile today.")
@@ -3529,7 +4079,7 @@ def main(argv: Optional[list[str]] = None) -> int:
         if args.url not in urls:
             urls.append(args.url)
             try:
-                CONFIG_PATH.write_text(json.dumps(cfg, indent=2), encoding="utf-8")
+                save_config(cfg)
                 label = args.name or "(no label)"
                 print(f"Added ICS URL ({label})")
             except Exception as e:
@@ -3559,7 +4109,7 @@ def main(argv: Optional[list[str]] = None) -> int:
 
     if args.cmd == "slack-scan":
         cfg = RUNTIME_CFG or load_config()
-        tz = CHICAGO_TZ or datetime.now().astimezone().tzinfo
+        tz = CHICAGO_TZ
         today = now_tz(CHICAGO_TZ).astimezone(tz).replace(hour=0, minute=0, second=0, microsecond=0)
         items = slack_fetch_bookedcalls(today, today + timedelta(hours=24), cfg)
         if not items:
@@ -3612,27 +4162,7 @@ def main(argv: Optional[list[str]] = None) -> int:
         t = threading.Thread(target=tracker.run, name="activity-tracker", daemon=True)
         t.start()
 
-        try:
-            while not stop_event.is_set():
-                to_wait = max(1.0, seconds_until_next_midnight_chicago())
-                stop_event.wait(to_wait)
-                if stop_event.is_set():
-                    break
-                now_local = now_tz(CHICAGO_TZ)
-                cut_at = now_local.replace(microsecond=0)
-                tracker.split_at(cut_at)
-                today_local = now_tz(CHICAGO_TZ).date()
-                y = today_local - timedelta(days=1)
-                day = datetime(y.year, y.month, y.day)
-                md_report = generate_summary_for(day)
-                html_report = generate_summary_html_for(day)
-                print(f"[ActivityTracker] Generated reports: {md_report} | {html_report}")
-                try:
-                    subprocess.run(["open", str(html_report)], check=False)
-                except Exception:
-                    pass
-        finally:
-            tracker.flush()
+        run_cutoff_scheduler(tracker, stop_event)
         return 0
 
     if args.cmd == "weekly":
@@ -3665,7 +4195,7 @@ def main(argv: Optional[list[str]] = None) -> int:
     try:
         tracker.run()
     finally:
-        tracker.flush()
+        tracker.close()
     return 0
 
 
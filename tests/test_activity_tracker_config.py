@@ -0,0 +1,93 @@
+import json
+import sys
+from pathlib import Path
+
+# Ensure repo root is on PYTHONPATH for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import activity_tracker
+
+
+def test_compile_config_redacts_with_precompiled_patterns():
+    cfg = activity_tracker.compile_config(dict(activity_tracker.DEFAULT_CONFIG))
+    out = activity_tracker.redact("call +1 (555) 123-4567 or jack@example.com", cfg)
+    assert "555" not in out
+    assert "jack@example.com" not in out
+    assert out.count("[redacted]") == 2
+
+
+def test_redact_falls_back_when_union_fails():
+    # Duplicate group names are valid per pattern but not once fused together.
+    cfg = activity_tracker.compile_config({"redact_patterns": [r"(?P<x>foo)", r"(?P<x>bar)"]})
+    assert cfg["_redact_union_re"] is None
+    assert activity_tracker.redact("foo and bar", cfg) == "[redacted] and [redacted]"
+
+
+def test_redact_falls_back_for_backreferences():
+    # Fused, the second pattern's \1 would refer to the first pattern's group
+    cfg = activity_tracker.compile_config({"redact_patterns": [r"(tok)=\d+", r"(\w)\1\1"]})
+    assert cfg["_redact_union_re"] is None
+    assert activity_tracker.redact("zzz tok=5", cfg) == "[redacted] [redacted]"
+
+
+def test_compile_config_skips_malformed_patterns():
+    cfg = activity_tracker.compile_config({
+        "redact_patterns": ["(unclosed", r"secret"],
+        "rules": [{"pattern": "[bad", "project": "X"}, {"pattern": r"github", "project": "Code"}],
+    })
+    assert len(cfg["_redact_patterns_re"]) == 1
+    assert [proj for _rx, proj in cfg["_rules_re"]] == ["Code"]
+
+
+def test_save_config_drops_compiled_keys(tmp_path, monkeypatch):
+    monkeypatch.setattr(activity_tracker, "CONFIG_PATH", tmp_path / "config.json")
+    cfg = activity_tracker.compile_config({"redact_patterns": [r"secret"], "retention_days": 30})
+    activity_tracker.save_config(cfg)
+    on_disk = json.loads((tmp_path / "config.json").read_text())
+    assert on_disk == {"redact_patterns": ["secret"], "retention_days": 30}
+
+
+def test_save_config_skips_identical_rewrite(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    monkeypatch.setattr(activity_tracker, "CONFIG_PATH", path)
+    cfg = {"retention_days": 30}
+    assert activity_tracker.save_config(cfg) is True
+    before = path.stat().st_mtime_ns
+    assert activity_tracker.save_config(cfg) is False
+    assert path.stat().st_mtime_ns == before
+    cfg["retention_days"] = 45
+    assert activity_tracker.save_config(cfg) is True
+    assert json.loads(path.read_text()) == {"retention_days": 45}
+    assert [p.name for p in tmp_path.iterdir()] == ["config.json"]
+
+
+def test_rule_matcher_keeps_config_order_over_match_position():
+    cfg = activity_tracker.compile_config({
+        "rules": [
+            {"pattern": r"gmail", "project": "Email"},
+            {"pattern": r"chatgpt", "project": "AI"},
+        ],
+    })
+    matcher = cfg["_rules_matcher"]
+    # "ChatGPT" appears first in the text but the Email rule is listed first.
+    assert matcher.match("ChatGPT tab next to Gmail") == "Email"
+    assert matcher.match("ChatGPT only") == "AI"
+    assert matcher.match("nothing relevant") is None
+
+
+def test_ticket_extractor_matches_per_pattern_findall():
+    cfg = activity_tracker.compile_config(dict(activity_tracker.DEFAULT_CONFIG))
+    extractor = cfg["_ticket_extractor"]
+    assert extractor._union is not None
+    assert extractor.findall("ABC-123 fix (PR #45) and issue #9876") == ["ABC-123", "45", "9876"]
+    # Patterns without groups yield the whole match; multi-group ones are joined.
+    cfg = activity_tracker.compile_config({"ticket_patterns": [r"(\w+)/(\w+)#\d+", r"OPS\d+"]})
+    assert cfg["_ticket_extractor"].findall("acme/web#12 and ops42") == ["acme web", "ops42"]
+
+
+def test_compile_config_builds_membership_sets():
+    cfg = activity_tracker.compile_config({"exclude_apps": ["loginwindow"], "private_domains": ["bank.com"]})
+    assert cfg["_exclude_apps"] == frozenset({"loginwindow"})
+    assert cfg["_exclude_domains"] == frozenset()
+    assert activity_tracker.cfg_set(cfg, "private_domains") == frozenset({"bank.com"})
+    assert activity_tracker.cfg_set({"exclude_domains": ["x.com"]}, "exclude_domains") == frozenset({"x.com"})
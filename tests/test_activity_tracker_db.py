@@ -0,0 +1,140 @@
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Ensure repo root is on PYTHONPATH for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import activity_tracker
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(activity_tracker, "DB_PATH", tmp_path / "data.db")
+    monkeypatch.setattr(activity_tracker, "_DB_CONN", None)
+    activity_tracker.init_db()
+    yield activity_tracker.db_conn()
+    activity_tracker.db_conn().close()
+
+
+def focus_event(start, end, seconds, app="Code", title="main.py"):
+    return {"start": start, "end": end, "seconds": seconds, "app": app, "title": title, "url": None}
+
+
+def test_db_insert_focus_events_batches(db):
+    events = [
+        focus_event("2025-12-10T09:00:00-06:00", "2025-12-10T09:05:00-06:00", 300),
+        focus_event("2025-12-10T09:05:00-06:00", "2025-12-10T09:06:00-06:00", 60, app="Slack"),
+    ]
+    activity_tracker.db_insert_focus_events(events)
+    rows = db.execute("SELECT app, seconds FROM focus_events ORDER BY start").fetchall()
+    assert rows == [("Code", 300), ("Slack", 60)]
+
+
+def test_init_db_adds_and_backfills_epoch_columns(tmp_path, monkeypatch):
+    path = tmp_path / "old.db"
+    con = activity_tracker.sqlite3.connect(path)
+    con.execute("CREATE TABLE focus_events (id INTEGER PRIMARY KEY, start TEXT NOT NULL, end TEXT NOT NULL, "
+                "seconds INTEGER NOT NULL, app TEXT, title TEXT, url TEXT)")
+    con.execute("CREATE INDEX idx_focus_start_app ON focus_events(start, app, seconds)")
+    con.execute("INSERT INTO focus_events(start, end, seconds, app) VALUES "
+                "('2025-12-10T09:00:00-06:00', '2025-12-10T09:05:00-06:00', 300, 'Code')")
+    con.commit()
+    con.close()
+    monkeypatch.setattr(activity_tracker, "DB_PATH", path)
+    monkeypatch.setattr(activity_tracker, "_DB_CONN", None)
+    activity_tracker.init_db()
+    activity_tracker.init_db()  # idempotent on an already-migrated DB
+    db = activity_tracker.db_conn()
+    try:
+        row = db.execute("SELECT start_epoch, end_epoch FROM focus_events").fetchone()
+        start = datetime.fromisoformat("2025-12-10T09:00:00-06:00")
+        assert row == (int(start.timestamp()), int(start.timestamp()) + 300)
+        indexes = {r[0] for r in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_focus_start_epoch" in indexes and "idx_focus_start_app" not in indexes
+    finally:
+        db.close()
+
+
+def test_prune_old_deletes_only_expired_rows(db):
+    now = activity_tracker.now_tz(activity_tracker.CHICAGO_TZ)
+    old = now - timedelta(days=90)
+    recent = now - timedelta(days=2)
+    activity_tracker.db_insert_focus_events([
+        focus_event(activity_tracker.iso(old), activity_tracker.iso(old + timedelta(minutes=1)), 60, app="Old"),
+        focus_event(activity_tracker.iso(recent), activity_tracker.iso(recent + timedelta(minutes=1)), 60, app="New"),
+    ])
+    activity_tracker.prune_old(60)
+    assert [r[0] for r in db.execute("SELECT app FROM focus_events")] == ["New"]
+
+
+def test_aggregate_summary_db_rollup_matches_jsonl(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(activity_tracker, "LOG_DIR", tmp_path / "logs")
+    monkeypatch.setattr(activity_tracker, "BROWSER_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(activity_tracker, "TERM_PING_PATH", tmp_path / "term_ping.json")
+    cfg = activity_tracker.compile_config(dict(activity_tracker.DEFAULT_CONFIG))
+    cfg["integrations"] = {"chrome": False, "safari": False, "slack": False}
+
+    # Sessions straddle the 06:00 window start and several hour boundaries.
+    tz = activity_tracker.CHICAGO_TZ
+    t = datetime(2025, 12, 10, 5, 50, tzinfo=tz)
+    events = []
+    for i in range(40):
+        end = t + timedelta(seconds=95)
+        app = ["Slack", "Terminal", "Zoom"][i % 3]
+        events.append(focus_event(activity_tracker.iso(t), activity_tracker.iso(end), 95, app=app, title=f"ABC-{i % 4}"))
+        t = end + timedelta(minutes=7)
+    log_path = activity_tracker.log_path_for(datetime(2025, 12, 10))
+    log_path.parent.mkdir(parents=True)
+    log_path.write_text("".join(json.dumps(e) + "\n" for e in events))
+
+    day = datetime(2025, 12, 10)
+    from_jsonl = activity_tracker.aggregate_summary(day, 23, cfg)
+    activity_tracker.db_insert_focus_events(events)
+    from_db = activity_tracker.aggregate_summary(day, 23, cfg)
+
+    for key in ("total_seconds", "by_app", "by_window", "by_hour", "by_token", "first_ts", "last_ts"):
+        assert from_db[key] == from_jsonl[key], key
+    assert from_db["total_seconds"] < 40 * 95  # the 05:50 session is clipped at 06:00
+
+
+def test_query_history_db_reads_in_place_and_falls_back_on_schema(tmp_path):
+    hist = tmp_path / "Chrome Profile" / "History"
+    hist.parent.mkdir()
+    con = activity_tracker.sqlite3.connect(hist)
+    con.execute("CREATE TABLE urls (id INTEGER PRIMARY KEY, url TEXT, title TEXT, last_visit_time INTEGER)")
+    con.execute("INSERT INTO urls(url, title, last_visit_time) VALUES ('https://github.com/x', 'x', 50)")
+    con.commit()
+    con.close()
+    rows = activity_tracker.query_history_db(hist, [
+        ("SELECT v.visit_time, u.url FROM visits v JOIN urls u ON v.url = u.id", ()),
+        ("SELECT last_visit_time, url FROM urls WHERE last_visit_time BETWEEN ? AND ?", (0, 100)),
+    ])
+    assert rows == [(50, "https://github.com/x")]
+    assert sorted(p.name for p in hist.parent.iterdir()) == ["History"]
+
+
+def test_db_reader_is_read_only_and_per_thread(db):
+    activity_tracker.db_insert_focus_events([
+        focus_event("2025-12-10T09:00:00-06:00", "2025-12-10T09:05:00-06:00", 300),
+    ])
+    reader = activity_tracker.db_reader()
+    assert reader is not db
+    assert reader.execute("SELECT COUNT(*) FROM focus_events").fetchone() == (1,)
+    with pytest.raises(activity_tracker.sqlite3.OperationalError):
+        reader.execute("DELETE FROM focus_events")
+
+    seen = []
+
+    def in_worker():
+        con = activity_tracker.db_reader()
+        seen.append(con is not reader and con.execute("SELECT COUNT(*) FROM focus_events").fetchone() == (1,))
+        con.close()
+
+    worker = activity_tracker.threading.Thread(target=in_worker)
+    worker.start()
+    worker.join()
+    assert seen == [True]
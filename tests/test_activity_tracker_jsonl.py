@@ -0,0 +1,31 @@
+import json
+import sys
+from pathlib import Path
+
+# Ensure repo root is on PYTHONPATH for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import activity_tracker
+
+
+def test_jsonl_writer_buffers_and_rolls_over(tmp_path):
+    day1 = tmp_path / "2025-12-10.jsonl"
+    day2 = tmp_path / "2025-12-11.jsonl"
+    writer = activity_tracker._JsonlWriter()
+    writer.write(day1, {"app": "Code", "seconds": 60})
+    writer.write(day1, {"app": "Slack", "seconds": 30})
+    # Switching to the next day's path closes (and flushes) the previous file.
+    writer.write(day2, {"app": "Zoom", "seconds": 90})
+    assert [json.loads(l)["app"] for l in day1.read_text().splitlines()] == ["Code", "Slack"]
+    writer.close()
+    assert [json.loads(l)["app"] for l in day2.read_text().splitlines()] == ["Zoom"]
+
+
+def test_load_events_for_date_skips_blank_and_corrupt_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr(activity_tracker, "LOG_DIR", tmp_path)
+    day = activity_tracker.datetime(2025, 12, 10)
+    assert activity_tracker.load_events_for_date(day) == []
+    activity_tracker.log_path_for(day).write_bytes(
+        b'{"app": "Code"}\r\n\n{"app": "Sla\n  {"app": "Slack"}  \n\xff\xfe\n'
+    )
+    assert activity_tracker.load_events_for_date(day) == [{"app": "Code"}, {"app": "Slack"}]
@@ -0,0 +1,67 @@
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ensure repo root is on PYTHONPATH for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import activity_tracker
+
+
+def test_tick_coalesces_rapid_focus_changes(tmp_path, monkeypatch):
+    t0 = datetime(2025, 12, 10, 9, 0, tzinfo=activity_tracker.CHICAGO_TZ)
+    clock = {"now": t0}
+    front = {"app": ("Code", "main.py", None)}
+    monkeypatch.setattr(activity_tracker, "PAUSE_PATH", tmp_path / "pause")
+    monkeypatch.setattr(activity_tracker, "now_tz", lambda tz=None: clock["now"])
+    monkeypatch.setattr(activity_tracker, "get_front_app_and_title", lambda: front["app"])
+
+    tracker = activity_tracker.Tracker(idle_threshold=0, min_event_sec=5)
+    written = []
+    monkeypatch.setattr(tracker, "_write_event", written.append)
+
+    def step(seconds, app):
+        clock["now"] += timedelta(seconds=seconds)
+        front["app"] = (app, app.lower(), None)
+        tracker.tick()
+
+    tracker.tick()            # Code starts at 09:00:00
+    step(60, "Slack")         # Code ran 60s -> written
+    step(1, "Mail")           # Slack lasted 1s -> folded into Mail
+    step(1, "Terminal")       # still a blip -> folded into Terminal
+    step(30, "Code")          # Terminal (from 09:01:00) ran 32s -> written
+
+    assert [(e["app"], e["seconds"]) for e in written] == [("Code", 60), ("Terminal", 32)]
+
+
+def test_scheduler_waits_for_cutoff_reports_before_close(monkeypatch):
+    events = []
+
+    class FakeTracker:
+        def split_at(self, when):
+            events.append("split")
+
+        def close(self):
+            events.append("close")
+
+    class StopAfterOneCutoff:
+        def __init__(self):
+            self.checks = iter([False, False, True])
+
+        def is_set(self):
+            return next(self.checks)
+
+        def wait(self, timeout):
+            return False
+
+    def slow_reports(day):
+        time.sleep(0.2)
+        events.append("reports")
+
+    monkeypatch.setattr(activity_tracker, "seconds_until_next_midnight_chicago", lambda: 0)
+    monkeypatch.setattr(activity_tracker, "generate_daily_reports", slow_reports)
+    activity_tracker.run_cutoff_scheduler(FakeTracker(), StopAfterOneCutoff())
+    assert events == ["split", "reports", "close"]
+    assert not any(t.name == "daily-summary" for t in threading.enumerate())
@@ -0,0 +1,184 @@
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+
+# Ensure repo root is on PYTHONPATH for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import tools.auto_report as auto_report
+import tools.analytics as analytics
+from tools.analytics import ProductivityAnalytics
+
+
+@pytest.mark.parametrize("pretty, dump_kwargs", [(False, {"separators": (",", ":")}), (True, {"indent": 2})])
+def test_write_json_streams_same_bytes_as_dump(tmp_path, monkeypatch, pretty, dump_kwargs):
+    monkeypatch.setattr(auto_report, "orjson", None)
+    data = {"date": "2025-12-08", "score": 71.5, "apps": ["VS Code", "Café"], "nested": {"none": None}}
+    path = tmp_path / "report.json"
+    auto_report._write_json(path, data, pretty)
+    assert path.read_text() == json.dumps(data, **dump_kwargs)
+
+
+@pytest.mark.skipif(auto_report.orjson is None, reason="orjson not installed")
+@pytest.mark.parametrize("pretty, dump_kwargs", [(False, {"separators": (",", ":")}), (True, {"indent": 2})])
+def test_write_json_with_orjson_matches_json_layout(tmp_path, pretty, dump_kwargs):
+    data = {"hours": {9: 1, 14: 3}, "score": 71.5, "apps": ["VS Code"], "empty": [], "ratio": 0.25}
+    path = tmp_path / "report.json"
+    auto_report._write_json(path, data, pretty)
+    assert path.read_text() == json.dumps(data, **dump_kwargs)
+
+
+def test_markdown_summary_writes_each_line_once(tmp_path):
+    tz = ZoneInfo("America/Chicago")
+    report = ProductivityAnalytics.from_events(datetime(2025, 12, 8, tzinfo=tz), []).generate_report()
+    path = tmp_path / "report.md"
+    auto_report.generate_markdown_summary(report, path)
+    lines = path.read_text().split("\n")
+    assert lines[0] == "# Daily Productivity Report — 2025-12-08"
+    assert "_No deep work sessions detected (minimum 25 minutes)_" in lines
+    assert "- **06:00–23:00** (17h) — Excellent (0 interruptions)" in lines
+    assert lines[-2] == "---" and lines[-1].startswith("*Generated: ")
+
+
+def test_daily_report_counts_event_types_from_one_read(tmp_path, monkeypatch):
+    events = [
+        {"type": "metadata", "data": {}},
+        {"type": "app_switch", "timestamp": "2025-12-08T09:00:00-06:00", "data": {}},
+        {"type": "app_switch", "timestamp": "2025-12-08T09:05:00-06:00", "data": {}},
+        {"data": {}},
+    ]
+    reads = []
+    monkeypatch.setattr(analytics, "read_daily_log", lambda date: reads.append(date) or [dict(e) for e in events])
+    day = datetime(2025, 12, 8, tzinfo=ZoneInfo("America/Chicago"))
+    path, report = auto_report.generate_daily_report(day, tmp_path)
+    assert len(reads) == 1
+    assert json.loads(path.read_text())["productivity_score"] == report["productivity_score"]
+    raw = report["raw_events"]
+    assert raw == {"total_events": 4, "event_types": {"metadata": 1, "app_switch": 2, "unknown": 1}}
+
+
+def test_markdown_summary_uses_given_generated_stamp(tmp_path):
+    report = ProductivityAnalytics.from_events(datetime(2025, 12, 8, tzinfo=ZoneInfo("America/Chicago")), []).generate_report()
+    path = tmp_path / "report.md"
+    auto_report.generate_markdown_summary(report, path, generated_at="2025-12-08 23:55:00")
+    assert path.read_text().endswith("\n---\n*Generated: 2025-12-08 23:55:00*")
+
+
+def test_daily_report_skips_rewrite_when_unchanged(tmp_path, monkeypatch):
+    events = [{"type": "app_switch", "timestamp": "2025-12-08T09:00:00-06:00", "data": {}}]
+    monkeypatch.setattr(analytics, "read_daily_log", lambda date: [dict(e) for e in events])
+    day = datetime(2025, 12, 8, tzinfo=ZoneInfo("America/Chicago"))
+    path, _ = auto_report.generate_daily_report(day, tmp_path, generated_at="first")
+    md_path = path.with_suffix(".md")
+    assert (tmp_path / "daily-report-2025-12-08.json.sha").exists()
+
+    auto_report.generate_daily_report(day, tmp_path, generated_at="second")
+    assert md_path.read_text().endswith("*Generated: first*")
+
+    events.append({"type": "app_switch", "timestamp": "2025-12-08T09:01:00-06:00", "data": {}})
+    auto_report.generate_daily_report(day, tmp_path, generated_at="third")
+    assert md_path.read_text().endswith("*Generated: third*")
+    assert json.loads(path.read_text())["raw_events"]["total_events"] == 2
+
+
+def test_weekly_report_table_has_one_row_per_day(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics, "_read_log_file", lambda path: [])
+    end = datetime(2025, 12, 7, tzinfo=ZoneInfo("America/Chicago"))
+    path, report = auto_report.generate_weekly_report(end, tmp_path, generated_at="now")
+    lines = path.with_suffix(".md").read_text().split("\n")
+    rows = [line for line in lines if line.startswith("| 2025-12-")]
+    assert rows == [f"| 2025-12-0{d} | 30 | 0 | 0 |" for d in range(1, 8)]
+    assert report["period"] == {"start": "2025-12-01", "end": "2025-12-07", "days": 7}
+    records = [json.loads(line) for line in path.with_suffix(".ndjson").read_text().splitlines()]
+    assert records[0] == {"date": "2025-12-01", "score": 30.0, "deep_work_minutes": 0.0, "interruptions": 0}
+    assert [r["date"] for r in records] == [f"2025-12-0{d}" for d in range(1, 8)]
+    assert lines[-1] == "*Generated: now*"
+
+
+def test_importing_auto_report_does_not_load_analytics():
+    import subprocess
+    code = "import sys, tools.auto_report; print('tools.analytics' in sys.modules, 'numpy' in sys.modules)"
+    root = Path(__file__).resolve().parents[1]
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False", "False"]
+
+
+def test_atomic_open_keeps_previous_file_on_failure(tmp_path):
+    path = tmp_path / "report.json"
+    path.write_text("old")
+    with pytest.raises(RuntimeError):
+        with auto_report._atomic_open(path, "w") as f:
+            f.write("partial")
+            raise RuntimeError("interrupted")
+    assert path.read_text() == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["report.json"]
+
+    with auto_report._atomic_open(path, "w") as f:
+        f.write("new")
+    assert path.read_text() == "new"
+    assert [p.name for p in tmp_path.iterdir()] == ["report.json"]
+
+
+def test_write_chunks_batches_writev_and_finishes_short_writes(tmp_path, monkeypatch):
+    calls = []
+    real_writev = os.writev
+
+    def short_writev(fd, buffers):
+        calls.append(len(buffers))
+        # Accept only the first buffer, as a short write would
+        return real_writev(fd, buffers[:1])
+
+    monkeypatch.setattr(auto_report, "_IOV_MAX", 3)
+    monkeypatch.setattr(auto_report.os, "writev", short_writev)
+    path = tmp_path / "report.json"
+    chunks = [str(i).encode() for i in range(7)]
+    with auto_report._atomic_fd(path) as fd:
+        auto_report._write_chunks(fd, chunks)
+    assert path.read_bytes() == b"0123456"
+    assert calls == [3, 3, 1]
+    assert [p.name for p in tmp_path.iterdir()] == ["report.json"]
+
+
+def test_daily_columns_are_typed_arrays():
+    start = datetime(2025, 12, 30, tzinfo=ZoneInfo("America/Chicago"))
+    cols = auto_report._daily_columns(start, {"scores": [61.5, 30.0, 70], "deep_minutes": [120.0, 0, 45.5],
+                                              "interruptions": [3, 0, 7]})
+    assert cols["dates"].tolist() == ["2025-12-30", "2025-12-31", "2026-01-01"]
+    assert cols["scores"].dtype.kind == "f" and cols["interruptions"].dtype.kind == "i"
+    assert float(cols["scores"].mean()) == (61.5 + 30.0 + 70) / 3
+
+
+def test_weekly_table_rows_match_per_row_format():
+    start = datetime(2025, 12, 30, tzinfo=ZoneInfo("America/Chicago"))
+    data = {"scores": [61.5, 30.0, 70.4], "deep_minutes": [120.0, 0, 45.5], "interruptions": [3, 0, 17]}
+    table = auto_report._weekly_table_rows(auto_report._daily_columns(start, data))
+    assert table == "".join(
+        f"| {day} | {score:.0f} | {deep:.0f} | {ints} |\n"
+        for day, score, deep, ints in zip(["2025-12-30", "2025-12-31", "2026-01-01"], *data.values())
+    )
+    empty = auto_report._daily_columns(start, {"scores": [], "deep_minutes": [], "interruptions": []})
+    assert auto_report._weekly_table_rows(empty) == ""
+
+
+@pytest.mark.parametrize("fmt, produced", [
+    ("json", ["daily-report-2025-12-08.json", "daily-report-2025-12-08.json.sha"]),
+    ("markdown", ["daily-report-2025-12-08.md", "daily-report-2025-12-08.md.sha"]),
+    ("both", ["daily-report-2025-12-08.json", "daily-report-2025-12-08.json.sha", "daily-report-2025-12-08.md"]),
+])
+def test_daily_report_writes_only_requested_formats(tmp_path, monkeypatch, fmt, produced):
+    monkeypatch.setattr(analytics, "read_daily_log", lambda date: [])
+    day = datetime(2025, 12, 8, tzinfo=ZoneInfo("America/Chicago"))
+    path, _ = auto_report.generate_daily_report(day, tmp_path, fmt=fmt)
+    assert path.name == produced[0]
+    assert sorted(p.name for p in tmp_path.iterdir()) == produced
+
+
+def test_daily_report_rejects_unknown_format(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics, "read_daily_log", lambda date: [])
+    with pytest.raises(ValueError):
+        auto_report.generate_daily_report(datetime(2025, 12, 8), tmp_path, fmt="pdf")
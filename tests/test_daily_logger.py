@@ -0,0 +1,420 @@
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+
+# Ensure repo root is on PYTHONPATH for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import tools.daily_logger as daily_logger
+
+
+@pytest.fixture
+def log_dirs(tmp_path, monkeypatch):
+    """Point the logger at empty tmp directories with a minimal cached config"""
+    config = {
+        "tracking": {"timezone": "America/Chicago", "daily_start_hour": 6, "daily_start_minute": 0},
+        "report": {},
+        "retention": {"keep_daily_logs_days": 30},
+    }
+    dirs = {}
+    for name in ("LOG_DIR", "ARCHIVE_DIR", "BACKUP_DIR"):
+        dirs[name] = tmp_path / name.split("_")[0].lower()
+        dirs[name].mkdir()
+        monkeypatch.setattr(daily_logger, name, dirs[name])
+    monkeypatch.setattr(daily_logger, "_CONFIG_CACHE", config)
+    monkeypatch.setattr(daily_logger, "_CONFIG_MTIME", daily_logger._config_mtime())
+    monkeypatch.setattr(daily_logger, "_SETTINGS", None)
+    yield dirs
+    daily_logger.flush_logs()
+
+
+def _today_log():
+    return daily_logger.get_log_path(datetime.now(ZoneInfo("America/Chicago")))
+
+
+def test_log_activity_batches_fsync(log_dirs, monkeypatch):
+    synced = []
+    monkeypatch.setattr(daily_logger.os, "fsync", synced.append)
+    monkeypatch.setattr(daily_logger, "_FSYNC_BATCH", 3)
+    monkeypatch.setattr(daily_logger, "_FSYNC_INTERVAL", 3600)
+
+    for i in range(4):
+        assert daily_logger.log_activity("manual_entry", {"n": i})
+    # Every event is readable straight away; only the fsync is batched
+    lines = [json.loads(line) for line in _today_log().read_text().splitlines()]
+    assert [e["data"]["n"] for e in lines if e["type"] == "manual_entry"] == [0, 1, 2, 3]
+    assert len(synced) == 1
+
+    assert daily_logger.log_activity("manual_entry", {"n": 4}, durable=True)
+    assert len(synced) == 2
+    daily_logger.flush_logs()
+    assert daily_logger._LOG_HANDLES == {}
+    assert len(synced) == 2  # nothing left unsynced
+
+
+def test_log_activity_locks_the_log_itself_and_follows_replacement(log_dirs):
+    assert daily_logger.log_activity("manual_entry", {"n": 1})
+    log_path = _today_log()
+    assert [p.name for p in log_dirs["LOG_DIR"].iterdir()] == [log_path.name]  # no .lock sidecar
+
+    # A repair elsewhere swaps in a new file; the cached descriptor must follow it
+    replacement = log_path.with_name("replacement.jsonl")
+    replacement.write_text(log_path.read_text())
+    replacement.replace(log_path)
+    assert daily_logger.log_activity("manual_entry", {"n": 2})
+    events = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [e["type"] for e in events] == ["metadata", "manual_entry", "manual_entry"]
+
+
+def test_log_activity_follows_replacement_of_an_archived_log(log_dirs):
+    assert daily_logger.log_activity("manual_entry", {"n": 1})
+    log_path = _today_log()
+    archived = log_dirs["ARCHIVE_DIR"] / log_path.name
+    daily_logger._archive_file(log_path, archived)  # hard link: old inode keeps nlink >= 1
+
+    replacement = log_path.with_name("replacement.jsonl")
+    replacement.write_text(log_path.read_text())
+    replacement.replace(log_path)
+    assert daily_logger.log_activity("manual_entry", {"n": 2})
+    assert daily_logger.log_activities_bulk([("manual_entry", datetime.now(ZoneInfo("America/Chicago")), {"n": 3})]) == 1
+    assert [json.loads(line)["data"].get("n") for line in log_path.read_text().splitlines()] == [None, 1, 2, 3]
+    assert len(archived.read_text().splitlines()) == 2
+
+    log_path.unlink()
+    assert daily_logger.log_activity("manual_entry", {"n": 4})
+    assert json.loads(log_path.read_text().splitlines()[-1])["data"] == {"n": 4}
+    assert len(archived.read_text().splitlines()) == 2
+
+
+def test_initialize_daily_log_writes_metadata_once(log_dirs):
+    day = datetime(2025, 12, 8, 9, 30, tzinfo=ZoneInfo("America/Chicago"))
+    metadata = daily_logger.initialize_daily_log(day, daily_logger._CONFIG_CACHE)
+    assert metadata["date"] == "2025-12-08"
+    assert metadata["start_time"] == "2025-12-08T06:00:00-06:00"
+    assert daily_logger.initialize_daily_log(day, daily_logger._CONFIG_CACHE) is None
+    lines = daily_logger.get_log_path(day).read_text().splitlines()
+    assert len(lines) == 1 and json.loads(lines[0])["type"] == "metadata"
+
+
+def test_acquire_file_lock_backs_off_until_released(tmp_path, monkeypatch):
+    path = tmp_path / "day.jsonl"
+    holder = os.open(path, os.O_WRONLY | os.O_CREAT)
+    waiter = os.open(path, os.O_WRONLY)
+    sleeps = []
+    real_sleep = daily_logger.time.sleep
+    monkeypatch.setattr(daily_logger.time, "sleep", lambda s: sleeps.append(s) or real_sleep(s))
+    try:
+        assert daily_logger.acquire_file_lock(holder, timeout=1)
+        assert not daily_logger.acquire_file_lock(waiter, timeout=0.03)
+        assert sleeps[:3] == [0.001, 0.002, 0.004]
+        assert sum(sleeps) <= 0.03 + 1e-9
+        daily_logger.release_file_lock(holder)
+        sleeps.clear()
+        assert daily_logger.acquire_file_lock(waiter, timeout=1)
+        assert sleeps == []
+    finally:
+        os.close(holder)
+        os.close(waiter)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_jsonl_round_trip_and_repair(log_dirs, monkeypatch, use_orjson):
+    if use_orjson and daily_logger.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(daily_logger, "orjson", None)
+        monkeypatch.setattr(daily_logger, "_json_loads", json.loads)
+    day = datetime(2025, 12, 8, tzinfo=ZoneInfo("America/Chicago"))
+    log_path = daily_logger.get_log_path(day)
+    good = [{"type": "manual_entry", "data": {"note": "Café ☕", 7: "int key"}}, {"type": "idle_start", "data": {}}]
+    log_path.write_bytes(daily_logger._json_line(good[0]) + b"{broken\n\xff\xfe\n" + daily_logger._json_line(good[1]))
+
+    assert not daily_logger.verify_log_integrity(log_path)
+    events = daily_logger.read_daily_log(day)  # repairs, then reads
+    assert events == [{"type": "manual_entry", "data": {"note": "Café ☕", "7": "int key"}}, good[1]]
+    assert daily_logger.verify_log_integrity(log_path)
+
+
+@pytest.mark.parametrize("data, quick", [
+    (b"", True),
+    (b'{"a":1}\n{"b":{"c":[1]}}\n', True),
+    (b'{"a":1}', True),
+    (b'{"a":1}\n{"b":', False),
+    (b'{"a":1}\n{"b":{"c":1}\n', False),  # truncated right after a nested object
+    (b'{"a":1}\n\x00\x00\x00\n', False),
+    (b'{"a":1}\n\n{"b":2}\n', False),  # blank line: valid, but left to the full parse
+    (b'{"a":{},"b":[{"c":1}, {"d":2}]}\n', True),
+    (b'{"d":{"n":[1,{"k":{}}],"o":{}}}\n{"e":{}}', True),
+    (b'{"t":"{"}\n{"x":,"y":"}"}\n', False),  # string braces would balance a corrupt line
+    (b'{"t":"a{b"}\n{"x":,"y":"c}d"}\n', False),
+    (b'{"t":"a}"}\n', False),  # valid, but left to the full parse
+])
+def test_fast_jsonl_check(tmp_path, data, quick):
+    assert daily_logger._fast_jsonl_check(data) is quick
+    log_path = tmp_path / "day.jsonl"
+    log_path.write_bytes(data)
+    valid = all(not line.strip() or _parses(line) for line in data.split(b"\n"))
+    assert daily_logger.verify_log_integrity(log_path) is valid
+
+
+def _parses(line):
+    try:
+        json.loads(line)
+        return True
+    except ValueError:
+        return False
+
+
+def test_read_daily_log_scans_mapped_lines(log_dirs, monkeypatch):
+    day = datetime(2025, 12, 9, tzinfo=ZoneInfo("America/Chicago"))
+    log_path = daily_logger.get_log_path(day)
+    log_path.write_bytes(b"")
+    assert daily_logger.read_daily_log(day) == []
+
+    # Repair unavailable: corrupt and blank lines are skipped, a final
+    # line without its newline is still read
+    monkeypatch.setattr(daily_logger, "repair_log_file", lambda path: False)
+    log_path.write_bytes(b'{"type":"a"}\n\n{oops\n{"type":"b"}')
+    assert daily_logger.read_daily_log(day) == [{"type": "a"}, {"type": "b"}]
+
+
+def test_generate_summary_decodes_each_line_once(log_dirs, monkeypatch):
+    day = datetime(2025, 12, 10, tzinfo=ZoneInfo("America/Chicago"))
+    lines = [
+        {"type": "metadata", "data": {"date": "2025-12-10"}},
+        {"type": "focus_change", "data": {"app": "Code", "duration_seconds": 60}},
+        {"type": "focus_change", "data": {"app": "Slack", "duration_seconds": 5}},
+        {"type": "idle_start", "data": {}},
+    ]
+    daily_logger.get_log_path(day).write_bytes(b"".join(daily_logger._json_line(e) for e in lines))
+    decoded = []
+    real_loads = daily_logger._json_loads
+    monkeypatch.setattr(daily_logger, "_json_loads", lambda b: decoded.append(b) or real_loads(b))
+
+    summary = daily_logger.generate_summary(day)
+    assert len(decoded) == len(lines)
+    assert summary["metadata"] == {"date": "2025-12-10"}
+    assert summary["total_events"] == 3
+    assert summary["event_types"] == {"focus_change": 2, "idle_start": 1}
+    assert daily_logger.generate_summary(datetime(2025, 12, 11)) is None
+
+
+def test_midnight_reset_archives_without_scanning(log_dirs, monkeypatch):
+    yesterday = datetime.now(ZoneInfo("America/Chicago")) - timedelta(days=1)
+    yesterday_log = daily_logger.get_log_path(yesterday)
+    yesterday_log.write_bytes(b'{"type":"metadata","data":{}}\n{truncated')
+    monkeypatch.setattr(daily_logger, "verify_log_integrity", lambda path: pytest.fail("scanned before archiving"))
+
+    assert daily_logger.midnight_reset()
+    archived = log_dirs["ARCHIVE_DIR"] / yesterday_log.name
+    assert archived.read_bytes() == yesterday_log.read_bytes()  # kept verbatim, corrupt tail included
+    assert _today_log().exists()
+
+
+def test_archive_file_links_and_falls_back_to_copy(tmp_path, monkeypatch):
+    src = tmp_path / "2025-12-08.jsonl"
+    src.write_text('{"type":"metadata"}\n')
+    dest = tmp_path / "archive.jsonl"
+    dest.write_text("stale")
+    daily_logger._archive_file(src, dest)
+    assert os.path.samefile(src, dest)
+    daily_logger._archive_file(src, dest)  # already archived: no-op
+    assert os.path.samefile(src, dest)
+
+    def cross_device(a, b):
+        raise OSError(18, "Invalid cross-device link")
+
+    monkeypatch.setattr(daily_logger.os, "link", cross_device)
+    copy = tmp_path / "copy.jsonl"
+    daily_logger._archive_file(src, copy)
+    assert copy.read_text() == src.read_text() and not os.path.samefile(src, copy)
+
+
+def test_timezone_resolved_once_per_config(log_dirs, monkeypatch):
+    assert daily_logger.log_activity("manual_entry", {})
+    monkeypatch.setattr(daily_logger, "ZoneInfo", lambda key: pytest.fail("timezone rebuilt per call"))
+    assert daily_logger.log_activity("manual_entry", {})
+    assert daily_logger.health_check()["timezone"] == "America/Chicago"
+
+
+def test_validate_event_data_uses_specialized_validators(caplog):
+    assert daily_logger.validate_event_data("focus_change", {"app": "Code", "duration_seconds": 5, "extra": 1})
+    assert daily_logger.validate_event_data("idle_start", {})
+    assert not daily_logger.validate_event_data("nonsense", {})
+    with caplog.at_level("WARNING", logger=daily_logger.logger.name):
+        assert not daily_logger.validate_event_data("meeting_end", {"duration_seconds": 60})
+    assert "Missing required field 'name' for event type 'meeting_end'" in caplog.text
+    assert set(daily_logger._VALIDATORS) == set(daily_logger.REQUIRED_FIELDS)
+
+
+def test_event_types_are_frozen_and_interned(log_dirs):
+    assert isinstance(daily_logger.VALID_EVENT_TYPES, frozenset)
+    built = "".join(["idle", "_start"])  # a runtime-built, non-interned string
+    assert daily_logger.log_activity(built, {})
+    assert not daily_logger.log_activity(None, {})
+    last = json.loads(_today_log().read_text().splitlines()[-1])
+    assert last["type"] == "idle_start"
+
+
+def test_create_backup_names_stay_unique_within_a_second(log_dirs):
+    log_path = log_dirs["LOG_DIR"] / "2025-12-08.jsonl"
+    log_path.write_text('{"type":"metadata"}\n')
+    first = daily_logger.create_backup(log_path)
+    second = daily_logger.create_backup(log_path)
+    assert first != second and first.exists() and second.exists()
+    assert first.name.startswith("2025-12-08_") and f"_{os.getpid()}_" in first.name
+    assert second.read_text() == log_path.read_text()
+
+
+def test_cleanup_old_logs_compares_names_against_cutoff(log_dirs):
+    today = datetime.now(ZoneInfo("America/Chicago")).date()
+    names = [(today - timedelta(days=d)).isoformat() + ".jsonl" for d in (31, 30, 29, 0)]
+    for name in names + ["0000-notes.jsonl", "notes.jsonl", "2000-01-01.jsonl.bak"]:
+        (log_dirs["LOG_DIR"] / name).write_text("{}\n")
+
+    assert daily_logger.cleanup_old_logs(daily_logger._CONFIG_CACHE) == 2
+    assert sorted(p.name for p in log_dirs["ARCHIVE_DIR"].iterdir()) == sorted(names[:2])
+    assert sorted(p.name for p in log_dirs["LOG_DIR"].iterdir()) == sorted(
+        names[2:] + ["0000-notes.jsonl", "notes.jsonl", "2000-01-01.jsonl.bak"])
+
+
+def test_log_activity_checks_log_existence_once(log_dirs, monkeypatch):
+    assert daily_logger.log_activity("manual_entry", {"n": 1})
+    log_path = _today_log()
+    assert log_path in daily_logger._INITIALIZED_LOGS
+    with monkeypatch.context() as m:
+        m.setattr(type(log_path), "exists", lambda self: pytest.fail("stat per event"))
+        assert daily_logger.log_activity("manual_entry", {"n": 2})
+    daily_logger.close_log_handle(log_path)
+    assert log_path not in daily_logger._INITIALIZED_LOGS
+
+
+def test_log_activity_write_failure_does_not_rescan(log_dirs, monkeypatch):
+    assert daily_logger.log_activity("manual_entry", {})
+
+    def no_space(fd, data):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(daily_logger.os, "write", no_space)
+    monkeypatch.setattr(daily_logger.os, "writev", no_space)
+    monkeypatch.setattr(daily_logger, "verify_log_integrity", lambda path: pytest.fail("rescanned log"))
+    monkeypatch.setattr(daily_logger, "repair_log_file", lambda path: pytest.fail("repaired log"))
+    assert not daily_logger.log_activity("manual_entry", {})
+
+
+def test_failed_partial_write_is_truncated_away(log_dirs, monkeypatch):
+    assert daily_logger.log_activity("manual_entry", {"n": 1})
+    before = _today_log().read_bytes()
+    real_write = os.write
+
+    def short_writev(fd, bufs):
+        data = b"".join(bufs)
+        return real_write(fd, data[:len(data) // 2])
+
+    def no_space(fd, data):
+        raise OSError(28, "No space left on device")
+
+    with monkeypatch.context() as m:
+        m.setattr(daily_logger.os, "writev", short_writev)
+        m.setattr(daily_logger.os, "write", no_space)
+        assert not daily_logger.log_activity("manual_entry", {"n": 2})
+    assert _today_log().read_bytes() == before
+
+    assert daily_logger.log_activity("manual_entry", {"n": 3})
+    assert daily_logger.verify_log_integrity(_today_log())
+
+
+def test_logger_config_is_a_frozen_snapshot(log_dirs):
+    cfg = daily_logger.get_logger_config()
+    assert daily_logger.get_logger_config() is cfg
+    assert cfg.tz.key == "America/Chicago" and cfg.lock_timeout == daily_logger._LOCK_TIMEOUT
+    assert (cfg.daily_start_hour, cfg.coverage_end) == (6, "23:59")
+    with pytest.raises(AttributeError):
+        cfg.max_retries = 10
+
+
+def test_repair_replaces_log_atomically(log_dirs):
+    day = datetime(2025, 12, 12, tzinfo=ZoneInfo("America/Chicago"))
+    log_path = daily_logger.get_log_path(day)
+    log_path.write_bytes(b'{"type":"a"}\n{bad\n{"type":"b"}')
+    archived = log_dirs["ARCHIVE_DIR"] / log_path.name
+    daily_logger._archive_file(log_path, archived)
+    original = log_path.read_bytes()
+
+    assert daily_logger.repair_log_file(log_path)
+    assert log_path.read_bytes() == b'{"type":"a"}\n{"type":"b"}\n'
+    assert archived.read_bytes() == original  # the hard-linked archive keeps the old file
+    assert sorted(p.name for p in log_dirs["LOG_DIR"].iterdir()) == [log_path.name]
+    assert daily_logger._LOG_HANDLES == {}
+
+
+def test_get_log_path_reuses_the_days_path(log_dirs, monkeypatch):
+    morning = datetime(2025, 12, 8, 9, tzinfo=ZoneInfo("America/Chicago"))
+    path = daily_logger.get_log_path(morning)
+    assert path == log_dirs["LOG_DIR"] / "2025-12-08.jsonl"
+    assert daily_logger.get_log_path(morning.replace(hour=17)) is path
+    assert daily_logger.get_log_path(morning.date()) is path
+    assert daily_logger.get_log_path(datetime(2025, 12, 9)).name == "2025-12-09.jsonl"
+
+    other_dir = log_dirs["LOG_DIR"].parent / "elsewhere"
+    monkeypatch.setattr(daily_logger, "LOG_DIR", other_dir)
+    assert daily_logger.get_log_path(morning) == other_dir / "2025-12-08.jsonl"
+
+
+def test_log_activities_bulk_writes_each_day_once(log_dirs, monkeypatch):
+    tz = ZoneInfo("America/Chicago")
+    calls = []
+    real_writev = os.writev
+    monkeypatch.setattr(daily_logger.os, "writev", lambda fd, bufs: calls.append(len(bufs)) or real_writev(fd, bufs))
+    events = [
+        ("manual_entry", datetime(2025, 12, 8, 23, 58, tzinfo=tz), {"n": 1}),
+        ("focus_change", datetime(2025, 12, 8, 23, 59, tzinfo=tz), {"app": "Code"}),  # missing duration
+        ("manual_entry", datetime(2025, 12, 8, 23, 59, tzinfo=tz), {"n": 2}),
+        ("manual_entry", datetime(2025, 12, 9, 6, 0, tzinfo=ZoneInfo("UTC")), {"n": 3}),  # 00:00 Chicago
+    ]
+    assert daily_logger.log_activities_bulk(events) == 3
+    assert calls == [2, 1]
+
+    def read(day):
+        return [json.loads(line) for line in daily_logger.get_log_path(day).read_text().splitlines()]
+
+    first, second = read(datetime(2025, 12, 8)), read(datetime(2025, 12, 9))
+    assert [e["type"] for e in first] == ["metadata", "manual_entry", "manual_entry"]
+    assert [e["data"] for e in first[1:]] == [{"n": 1}, {"n": 2}]
+    assert second[1] == {"type": "manual_entry", "timestamp": "2025-12-09T00:00:00-06:00", "data": {"n": 3}}
+
+
+def test_reload_config_if_changed_follows_mtime(log_dirs, tmp_path, monkeypatch):
+    config_path = tmp_path / "config.json"
+    monkeypatch.setattr(daily_logger, "CONFIG_PATH", config_path)
+    monkeypatch.setattr(daily_logger, "_CONFIG_MTIME", None)
+    for name in ("_LOCK_TIMEOUT", "_MAX_RETRIES", "_FSYNC_BATCH", "_FSYNC_INTERVAL"):
+        monkeypatch.setattr(daily_logger, name, getattr(daily_logger, name))  # restored after the reload
+    assert daily_logger.reload_config_if_changed() is False  # no file, nothing changed
+    assert daily_logger.get_logger_config().tz.key == "America/Chicago"
+
+    config_path.write_text(json.dumps({"tracking": {"timezone": "UTC"}, "report": {"log_dir": str(tmp_path / "new")}}))
+    assert daily_logger.reload_config_if_changed() is True
+    assert daily_logger.get_logger_config().tz.key == "UTC"
+    assert daily_logger.LOG_DIR == tmp_path / "new"
+    assert daily_logger.reload_config_if_changed() is False
+
+
+def test_log_activities_bulk_retries_lock_then_writes_once(log_dirs, monkeypatch):
+    now = datetime.now(ZoneInfo("America/Chicago"))
+    daily_logger.initialize_daily_log(now, daily_logger._CONFIG_CACHE)
+    real_lock = daily_logger._lock_log_handle
+    attempts = []
+    monkeypatch.setattr(daily_logger, "_lock_log_handle",
+                        lambda path: real_lock(path) if attempts.append(path) or len(attempts) > 1 else None)
+    monkeypatch.setattr(daily_logger.time, "sleep", lambda s: None)
+    events = [("manual_entry", now, {"n": n}) for n in range(5)]
+    assert daily_logger.log_activities_bulk(events) == 5
+    assert len(attempts) == 2
+    lines = _today_log().read_text().splitlines()
+    assert [json.loads(line)["data"].get("n") for line in lines[1:]] == list(range(5))
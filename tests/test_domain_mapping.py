@@ -33,3 +33,37 @@ def test_domain_mapping_applies(tmp_path):
     coding_mins = hhmm_to_minutes(report['by_category'].get('Coding'))
     # Expect roughly 40 minutes
     assert coding_mins >= 39 and coding_mins <= 41, f"Expected ~40 minutes Coding, got {coding_mins}"
+
+
+def test_categorizer_keeps_mapping_order_and_fallbacks():
+    from tools.generate_reports import _build_categorizer, categorize_event
+
+    config = {
+        'analytics': {
+            'category_mapping': {'Chat': ['', 'SLACK'], 'Dev': ['term', 'code'], 'Late': ['code'], 'One': 'zoom'},
+            'domain_mapping': {'GitHub.com': 'Coding'},
+        }
+    }
+    categorize = _build_categorizer(config)
+    cases = [
+        ({'app': 'VS Code'}, 'Dev'),
+        ({'app': 'Slack Terminal'}, 'Chat'),
+        ({'app': 'zoom.us'}, 'One'),
+        ({'app': 'Google Chrome', 'data': {'url': 'https://www.github.com/x'}}, 'Coding'),
+        ({'app': 'Google Chrome', 'data': {'url': 'https://example.com'}}, 'Research'),
+        ({'app': None}, 'Other'),
+    ]
+    for event, expected in cases:
+        assert categorize(event) == expected == categorize_event(event, config)
+
+
+def test_categorizer_memoizes_repeated_apps_and_urls(monkeypatch):
+    import tools.generate_reports as generate_reports
+
+    parsed = []
+    real_extract = generate_reports._extract_domain
+    monkeypatch.setattr(generate_reports, '_extract_domain', lambda url: parsed.append(url) or real_extract(url))
+    categorize = generate_reports._build_categorizer({'analytics': {'domain_mapping': {'github.com': 'Coding'}}})
+    events = [{'app': 'Google Chrome', 'data': {'url': f'https://github.com/{i % 3}'}} for i in range(300)]
+    assert {categorize(e) for e in events} == {'Coding'}
+    assert len(parsed) == 3
@@ -5,7 +5,13 @@ from pathlib import Path
 
 # Ensure repo root is on PYTHONPATH for imports
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-from tools.generate_reports import load_from_jsonl, seconds_to_hhmm
+from tools.generate_reports import (
+    _iter_jsonl,
+    _timeline_totals,
+    _timeline_totals_loop,
+    load_from_jsonl,
+    seconds_to_hhmm,
+)
 
 
 def make_events(start, count=5, spacing=60):
@@ -46,3 +52,58 @@ def test_deep_work_threshold(tmp_path):
     # deep_work_blocks present
     assert 'deep_work_blocks' in report
     assert isinstance(report['deep_work_blocks'], list)
+
+
+def test_jsonl_skips_blank_and_corrupt_lines(tmp_path):
+    events = make_events(datetime(2025,12,10,9,0,0), count=4, spacing=30)
+    lines = [json.dumps(e) for e in events]
+    jl = tmp_path / 'messy.jsonl'
+    clean = tmp_path / 'clean.jsonl'
+    jl.write_bytes(('\r\n'.join(lines[:2]) + '\n\n   \n{"timestamp": broken\n\xff\n' + '\n'.join(lines[2:])).encode('latin-1'))
+    clean.write_text('\n'.join(lines) + '\n')
+    assert load_from_jsonl(jl) == load_from_jsonl(clean)
+
+
+def test_iter_jsonl_joins_lines_across_chunks(tmp_path):
+    data = b'{"a": 1}\n\n{"b": "' + b'x' * 50 + b'"}\r\n{"c": 3}'
+    jl = tmp_path / 'chunks.jsonl'
+    jl.write_bytes(data)
+    for chunk_size in (1, 3, 8, 9, 64, 1 << 20):
+        assert list(_iter_jsonl(jl, chunk_size)) == data.split(b'\n')
+    jl.write_bytes(data + b'\n')
+    assert list(_iter_jsonl(jl, 5)) == data.split(b'\n')
+
+
+def test_timeline_totals_match_per_segment_loop():
+    import random
+    rng = random.Random(3)
+    timeline = []
+    t = datetime(2025, 12, 10, 21, 59, 59, 250_000)
+    for _ in range(200):
+        t += timedelta(microseconds=rng.randint(0, 90_000_000))
+        end = t + timedelta(microseconds=rng.choice([1, 999_999, rng.randint(1, 3 * 3600 * 10**6)]))
+        timeline.append((t, end, rng.choice(['Coding', 'Meetings', 'meetings', 'Research']), 'x'))
+        t = end
+
+    hourly, by_cat = [0] * 24, {}
+    for start, end, cat, _ in timeline:
+        by_cat[cat] = by_cat.get(cat, 0) + int((end - start).total_seconds())
+        current = start
+        while cat.lower() != 'meetings' and current < end:
+            next_hour = current.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+            hourly[current.hour] += int((min(end, next_hour) - current).total_seconds())
+            current = min(end, next_hour)
+    meetings = sum(v for k, v in by_cat.items() if k.lower() == 'meetings')
+
+    assert _timeline_totals(timeline) == (hourly, by_cat, meetings, sum(by_cat.values()) - meetings)
+    assert list(_timeline_totals(timeline)[1]) == list(by_cat)
+    assert _timeline_totals([]) == ([0] * 24, {}, 0, 0)
+    assert _timeline_totals_loop(timeline) == _timeline_totals(timeline)
+    assert _timeline_totals_loop([]) == ([0] * 24, {}, 0, 0)
+
+
+def test_timeline_totals_without_numpy(monkeypatch):
+    timeline = [(datetime(2025, 12, 10, 9, 30), datetime(2025, 12, 10, 10, 15), 'Coding', 'x')]
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    assert _timeline_totals(timeline) == _timeline_totals_loop(timeline)
+    assert _timeline_totals(timeline)[0][9:11] == [1800, 900]
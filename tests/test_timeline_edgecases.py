@@ -65,3 +65,60 @@ def test_cross_hour_boundary(tmp_path):
     total = sum(seg['minutes'] for seg in timeline)
     # total minutes should be 20
     assert total == 20, f"Expected 20 minutes total, got {total}"
+
+
+def test_sweep_timeline_matches_active_list_scan():
+    import random
+    from tools.generate_reports import _sweep_timeline
+
+    def reference(intervals, priority):
+        pr = {c.lower(): i for i, c in enumerate(priority)}
+        events = sorted([(s, 1, c, l) for s, e, c, l in intervals if e > s]
+                        + [(e, -1, c, l) for s, e, c, l in intervals if e > s], key=lambda x: (x[0], -x[1]))
+        active, timeline, current = [], [], events[0][0]
+        for t, typ, cat, label in events:
+            if t > current and active:
+                _, wc, wl = min(active, key=lambda a: (pr.get(a[1].lower(), 10_000), -a[0].timestamp()))
+                if timeline and timeline[-1][2:] == (wc, wl) and timeline[-1][1] == current:
+                    timeline[-1] = (timeline[-1][0], t, wc, wl)
+                else:
+                    timeline.append((current, t, wc, wl))
+            current = t
+            if typ == 1:
+                active.append((t, cat, label))
+            else:
+                j = max(j for j, a in enumerate(active) if a[1:] == (cat, label))
+                active.pop(j)
+        return timeline
+
+    rng = random.Random(11)
+    priority = ['Coding', 'Research', 'Meetings', 'Other']
+    for _ in range(50):
+        base = datetime(2025, 12, 11, 9, 0, 0)
+        intervals = []
+        for _ in range(rng.randint(1, 40)):
+            start = base + timedelta(minutes=rng.randint(0, 120))
+            end = start + timedelta(minutes=rng.randint(0, 30))
+            intervals.append((start, end, rng.choice(priority + ['Unknown']), rng.choice(['a', 'b'])))
+        intervals.sort(key=lambda x: x[0])
+        if any(e > s for s, e, _, _ in intervals):
+            assert _sweep_timeline(intervals, priority) == reference(intervals, priority)
+
+
+def test_overlapping_intervals_count_once(tmp_path):
+    # Code 09:50-10:00 overlaps Chrome 09:55-10:05 and a meeting 09:58-10:08:
+    # the attributed timeline covers 09:50-10:08, so nothing is counted twice
+    events = [
+        {'type': 'focus_change', 'timestamp': '2025-12-11T09:50:00', 'data': {'app': 'Code', 'duration_seconds': 600}},
+        {'type': 'focus_change', 'timestamp': '2025-12-11T09:55:00', 'data': {'app': 'Google Chrome', 'duration_seconds': 600}},
+        {'type': 'meeting_end', 'timestamp': '2025-12-11T10:08:00', 'data': {'duration_seconds': 600}},
+    ]
+    jl = tmp_path / 'overlap.jsonl'
+    write_events(jl, events)
+    report = load_from_jsonl(jl, config={})
+    overview = report['overview']
+    assert overview['active_time'] == '00:18'
+    assert hhmm_to_minutes(overview['focus_time']) + hhmm_to_minutes(overview['meetings_time']) == 18
+    assert sum(seg['minutes'] for seg in report['timeline']) == 18
+    focus_minutes = sum(hhmm_to_minutes(h['time']) for h in report['hourly_focus'])
+    assert focus_minutes == hhmm_to_minutes(overview['focus_time'])
@@ -10,13 +10,30 @@ Analyzes daily logs to provide insights on:
 - Meeting efficiency
 """
 
+import bisect
+import functools
 import json
 import logging
-from datetime import datetime, timedelta
+import mmap
+import os
+import re
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from zoneinfo import ZoneInfo
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    import orjson  # optional: faster JSONL decoding for multi-day reads
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    from numba import njit  # optional: JIT for the deep-work session kernel
+except Exception:  # pragma: no cover
+    njit = None  # type: ignore
 
 try:
     from .daily_logger import read_daily_log, load_config, get_log_path, LOG_DIR
@@ -25,22 +42,259 @@ except ImportError:  # pragma: no cover
 
 logger = logging.getLogger(__name__)
 
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+# App-name keywords per category, in priority order (first category wins)
+_CATEGORY_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ('Research', ('chrome', 'firefox', 'safari', 'browser')),
+    ('Coding', ('code', 'terminal', 'iterm', 'pycharm', 'intellij', 'vim')),
+    ('Meetings', ('slack', 'zoom', 'teams', 'meet', 'skype')),
+    ('Communication', ('mail', 'outlook', 'gmail', 'messages')),
+    ('Docs', ('word', 'excel', 'sheets', 'docs', 'notion', 'obsidian')),
+)
+
+# One anchored alternation: each branch looks ahead for any of its category's
+# keywords, so match() tries categories in priority order rather than
+# returning whichever keyword occurs leftmost; lastgroup names the category.
+_CATEGORY_RE = re.compile(
+    '|'.join(
+        f"(?=.*?(?:{'|'.join(map(re.escape, words))}))(?P<{category}>)"
+        for category, words in _CATEGORY_KEYWORDS
+    ),
+    re.DOTALL,
+)
+
+# Category names indexed by integer code; the regex's only capturing groups
+# are the per-category markers, so a match's lastindex - 1 is its code.
+_CATEGORIES: Tuple[str, ...] = tuple(category for category, _ in _CATEGORY_KEYWORDS) + ('Other',)
+_CATEGORY_OTHER = len(_CATEGORIES) - 1
+
+
+# Score cut-offs (inclusive lower bounds) and their ratings
+_RATING_THRESHOLDS = (40, 60, 80)
+_RATING_LABELS = ('Needs Improvement', 'Fair', 'Good', 'Excellent')
+
+# Meeting/focus ratio cut-offs (exclusive: a ratio must exceed one to move up)
+_MEETING_RATIO_THRESHOLDS = (0.3, 0.5)
+_MEETING_RECOMMENDATIONS = (
+    "Good balance between meetings and focus work",
+    "Meeting load is moderate - ensure quality focus time remains",
+    "Too many meetings - consider declining or delegating some",
+)
+
+
+# Event type codes for the int8 _codes column (0 = ignored: metadata, other
+# types, or an interruption with no usable timestamp)
+_CODE_FOCUS = 1
+_CODE_INTERRUPTION = 2
+_CODE_FOCUS_UNTIMED = 3  # focus_change without a timestamp: focus time only
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+
+
+def _deep_work_kernel(codes, ts_us, dur_us, durations, gap_us, min_total_seconds):
+    """
+    Deep-work session state machine over parallel columns
+    
+    A focus event extends the open session if it starts within gap_us of the
+    session's end, otherwise it closes the session (kept if its total reaches
+    min_total_seconds) and opens a new one; interruptions are counted against
+    the open session. Times are integer microseconds, matching datetime
+    arithmetic exactly. Returns (first_idx, last_idx, end_us, total_seconds,
+    interruptions) arrays, one entry per kept session, plus the summed
+    duration of every focus event (timed or not). Written in the subset
+    of Python that numba compiles; also runs as-is on plain lists.
+    """
+    n = len(codes)
+    first = np.empty(n, np.int64)
+    last = np.empty(n, np.int64)
+    ends = np.empty(n, np.int64)
+    totals = np.empty(n, np.float64)
+    interrupts = np.empty(n, np.int64)
+    count = 0
+    active = False
+    s_first = 0
+    s_last = 0
+    s_end = 0
+    s_total = 0.0
+    s_int = 0
+    focus_total = 0.0
+    for i in range(n):
+        code = codes[i]
+        if code == _CODE_FOCUS:
+            focus_total += durations[i]
+            if active and ts_us[i] - s_end <= gap_us:
+                s_end = ts_us[i] + dur_us[i]
+                s_total += durations[i]
+                s_last = i
+            else:
+                if active and s_total >= min_total_seconds:
+                    first[count] = s_first
+                    last[count] = s_last
+                    ends[count] = s_end
+                    totals[count] = s_total
+                    interrupts[count] = s_int
+                    count += 1
+                active = True
+                s_first = i
+                s_last = i
+                s_end = ts_us[i] + dur_us[i]
+                s_total = durations[i]
+                s_int = 0
+        elif code == _CODE_INTERRUPTION and active:
+            s_int += 1
+        elif code == _CODE_FOCUS_UNTIMED:
+            focus_total += durations[i]
+    if active and s_total >= min_total_seconds:
+        first[count] = s_first
+        last[count] = s_last
+        ends[count] = s_end
+        totals[count] = s_total
+        interrupts[count] = s_int
+        count += 1
+    return first[:count], last[:count], ends[:count], totals[:count], interrupts[:count], focus_total
+
+
+def _from_epoch_us(epoch_us: int, tzinfo) -> datetime:
+    """Inverse of the _ts_us encoding: back to a datetime in the event's own offset"""
+    dt = _EPOCH + timedelta(microseconds=epoch_us)
+    return dt.astimezone(tzinfo) if tzinfo is not None else dt.replace(tzinfo=None)
+
+
+_deep_work_kernel_jit = njit(cache=True)(_deep_work_kernel) if njit is not None else None
+
+
+def _extract(event: Dict[str, Any], _empty: Dict[str, Any] = {}) -> Tuple[Any, Any, Dict[str, Any]]:
+    """(type, timestamp, data) of a log event; a missing data is one shared, never-mutated dict"""
+    return event.get('type'), event.get('timestamp'), event.get('data') or _empty
+
+
+def _memoized(method):
+    """Cache a no-argument analysis method's result on the instance (per report)"""
+    key = method.__name__
+    
+    @functools.wraps(method)
+    def wrapper(self):
+        cache = self._cache
+        if key not in cache:
+            cache[key] = method(self)
+        return cache[key]
+    
+    return wrapper
+
 
 class ProductivityAnalytics:
     """Analyze productivity patterns from daily logs"""
     
-    def __init__(self, date: Optional[datetime] = None):
-        """Initialize analytics for a specific date"""
-        self.config = load_config()
-        self.tz = ZoneInfo(self.config['tracking']['timezone'])
+    def __init__(self, date: Optional[datetime] = None,
+                 config: Optional[Dict[str, Any]] = None, tz: Optional[ZoneInfo] = None):
+        """
+        Initialize analytics for a specific date
+        
+        config/tz default to the logger config and its tracking timezone;
+        callers analyzing many days (compare_trends) resolve them once and
+        pass them in.
+        """
+        self.config = config if config is not None else load_config()
+        self.tz = tz or ZoneInfo(self.config['tracking']['timezone'])
         self.date = date or datetime.now(self.tz)
-        self.events: List[Dict[str, Any]] = read_daily_log(self.date)
+        self._load(read_daily_log(self.date))
+    
+    @classmethod
+    def from_events(cls, date: datetime, events: List[Dict[str, Any]],
+                    config: Optional[Dict[str, Any]] = None,
+                    tz: Optional[ZoneInfo] = None) -> 'ProductivityAnalytics':
+        """Build analytics over already-read events, skipping the per-day log read"""
+        self = cls.__new__(cls)
+        self.config = config if config is not None else load_config()
+        self.tz = tz or ZoneInfo(self.config['tracking']['timezone'])
+        self.date = date
+        self._load(events)
+        return self
+    
+    def _load(self, events: List[Dict[str, Any]]) -> None:
+        """Attach the day's events and reset derived state"""
+        self.events: List[Dict[str, Any]] = events
+        self._build_columns()
+        # Results of the @_memoized analysis passes; generate_report() and
+        # calculate_productivity_score() share them instead of recomputing.
+        # Call clear_cache() after changing a threshold below.
+        self._cache: Dict[str, Any] = {}
         
         # Thresholds (configurable)
         self.deep_work_threshold_minutes = 25  # Minimum for deep work
         self.interruption_window_seconds = 300  # 5 minutes
         self.context_switch_cost_seconds = 60  # Assumed cost per switch
     
+    def clear_cache(self) -> None:
+        """Drop memoized analysis results (e.g. after changing thresholds)"""
+        self._cache.clear()
+    
+    def _build_columns(self) -> None:
+        """
+        Decode events in a single pass into parallel NumPy columns (struct-of-arrays)
+        
+        Each event's ISO timestamp is parsed once into event['_ts'] (None if
+        missing/invalid). _types/_apps are object arrays; _hours is the local
+        wall-clock hour (-1 when the event has no timestamp); _durations holds data.duration_seconds (0 when
+        missing/non-numeric). Meeting names are gathered in the same pass.
+        """
+        from_iso = datetime.fromisoformat
+        extract = _extract
+        n = len(self.events)
+        types = np.empty(n, dtype=object)
+        apps = np.empty(n, dtype=object)
+        ts_us = np.zeros(n, dtype=np.int64)
+        hours = np.full(n, -1, dtype=np.int8)
+        codes = np.zeros(n, dtype=np.int8)
+        durations = np.zeros(n, dtype=np.float64)
+        dur_us = np.zeros(n, dtype=np.int64)
+        meeting_names: List[Any] = []
+        append_meeting = meeting_names.append
+        
+        for i, event in enumerate(self.events):
+            event_type, ts_str, data = extract(event)
+            types[i] = event_type
+            apps[i] = data.get('app', '')
+            duration = data.get('duration_seconds', 0)
+            if isinstance(duration, (int, float)):
+                durations[i] = duration
+                dur_us[i] = round(duration * 1_000_000)
+            if event_type == 'meeting_end':
+                append_meeting(data.get('name', 'Unknown'))
+            try:
+                ts = from_iso(ts_str) if ts_str else None
+            except (TypeError, ValueError):
+                ts = None
+            event['_ts'] = ts
+            if ts is None:
+                if event_type == 'focus_change':
+                    codes[i] = _CODE_FOCUS_UNTIMED
+            else:
+                # Naive stamps are treated as UTC wall-clock so gaps stay exact
+                ts_us[i] = ((ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)) - _EPOCH) // _ONE_US
+                hours[i] = ts.hour
+                if event_type == 'focus_change':
+                    codes[i] = _CODE_FOCUS
+                elif event_type in ('app_switch', 'window_change'):
+                    codes[i] = _CODE_INTERRUPTION
+        
+        self._types = types
+        self._apps = apps
+        self._ts_us = ts_us
+        self._hours = hours
+        self._codes = codes
+        self._durations = durations
+        self._dur_us = dur_us
+        self._is_focus = types == 'focus_change'
+        self._is_interruption = (types == 'app_switch') | (types == 'window_change')
+        self._is_meeting = types == 'meeting_end'
+        self._meeting_names = meeting_names
+        # False for a missing log or one holding only its metadata header
+        self._has_data = bool((types != 'metadata').any())
+    
     def detect_deep_work_sessions(self) -> List[Dict[str, Any]]:
         """
         Identify uninterrupted focus sessions >= threshold minutes
@@ -50,82 +304,43 @@ class ProductivityAnalytics:
         - app, activity_type
         - interruption_count
         """
-        sessions: List[Dict[str, Any]] = []
-        current_session: Optional[Dict[str, Any]] = None
-        
-        for event in self.events:
-            if event.get('type') == 'metadata':
-                continue
-            
-            event_type = event.get('type')
-            ts_str = event.get('timestamp')
-            if not ts_str:
-                continue
-            timestamp = datetime.fromisoformat(ts_str)
-            data = event.get('data', {})
-            
-            if event_type == 'focus_change':
-                duration = data.get('duration_seconds', 0)
-                app = data.get('app', '')
-                
-                # Start new session or extend current
-                if current_session is None:
-                    current_session = {
-                        'start_time': timestamp,
-                        'end_time': timestamp + timedelta(seconds=duration),
-                        'total_seconds': duration,
-                        'app': app,
-                        'interruptions': 0,
-                        'events': [event]
-                    }
-                else:
-                    # Check if this continues the session (within 5 min)
-                    end_time: datetime = current_session['end_time']
-                    gap = (timestamp - end_time).total_seconds()
-                    
-                    if gap <= self.interruption_window_seconds:
-                        # Continue session
-                        current_session['end_time'] = timestamp + timedelta(seconds=duration)
-                        current_session['total_seconds'] += duration
-                        events_list: List[Dict[str, Any]] = current_session['events']
-                        events_list.append(event)
-                    else:
-                        # Gap too large, end current session
-                        total_secs: int = current_session['total_seconds']
-                        if total_secs >= self.deep_work_threshold_minutes * 60:
-                            sessions.append(self._finalize_session(current_session))
-                        
-                        # Start new session
-                        current_session = {
-                            'start_time': timestamp,
-                            'end_time': timestamp + timedelta(seconds=duration),
-                            'total_seconds': duration,
-                            'app': app,
-                            'interruptions': 0,
-                            'events': [event]
-                        }
-            
-            elif event_type in ['app_switch', 'window_change']:
-                # Count as interruption if in a session
-                if current_session:
-                    interrupts: int = current_session['interruptions']
-                    current_session['interruptions'] = interrupts + 1
-        
-        # Finalize last session
-        if current_session:
-            total_secs_final: int = current_session['total_seconds']
-            if total_secs_final >= self.deep_work_threshold_minutes * 60:
-                sessions.append(self._finalize_session(current_session))
+        return self._deep_work_pass()[0]
+    
+    @_memoized
+    def _deep_work_pass(self) -> Tuple[List[Dict[str, Any]], float]:
+        """Run the session kernel once: (deep-work sessions, total focus seconds)"""
+        gap_us = self.interruption_window_seconds * 1_000_000
+        min_total_seconds = self.deep_work_threshold_minutes * 60
+        if _deep_work_kernel_jit is not None:
+            first, last, ends, totals, interrupts, focus_total = _deep_work_kernel_jit(
+                self._codes, self._ts_us, self._dur_us, self._durations, gap_us, min_total_seconds)
+        else:
+            # Plain-Python run of the same kernel; lists index faster than arrays here
+            first, last, ends, totals, interrupts, focus_total = _deep_work_kernel(
+                self._codes.tolist(), self._ts_us.tolist(), self._dur_us.tolist(),
+                self._durations.tolist(), gap_us, min_total_seconds)
         
-        return sessions
+        sessions: List[Dict[str, Any]] = []
+        for f, l, end_us, total, n_int in zip(first.tolist(), last.tolist(), ends.tolist(),
+                                              totals.tolist(), interrupts.tolist()):
+            sessions.append(self._finalize_session({
+                'start_time': self.events[f]['_ts'],
+                'end_us': end_us,
+                'end_tz': self.events[l]['_ts'].tzinfo,
+                'total_seconds': total,
+                'app': self._apps[f],
+                'interruptions': n_int,
+            }))
+        return sessions, float(focus_total)
     
     def _finalize_session(self, session: Dict) -> Dict[str, Any]:
-        """Convert session dict to final format"""
+        """Convert session dict to final format (the end stays integer epoch us until here)"""
         duration_minutes = session['total_seconds'] / 60
+        end_time = _from_epoch_us(session['end_us'], session['end_tz'])
         
         return {
             'start_time': session['start_time'].isoformat(),
-            'end_time': session['end_time'].isoformat(),
+            'end_time': end_time.isoformat(),
             'duration_minutes': round(duration_minutes, 1),
             'app': session['app'],
             'interruptions': session['interruptions'],
@@ -158,6 +373,13 @@ class ProductivityAnalytics:
         
         return max(0, min(100, score))
     
+    @_memoized
+    def _interruption_counts(self) -> np.ndarray:
+        """Interruptions with a timestamp, binned by local hour (length-24 array)"""
+        mask = self._is_interruption & (self._hours >= 0)
+        return np.bincount(self._hours[mask].astype(np.int64), minlength=24)
+    
+    @_memoized
     def analyze_interruptions(self) -> Dict[str, Any]:
         """
         Analyze interruption patterns
@@ -168,35 +390,20 @@ class ProductivityAnalytics:
         - total_interruptions: total count
         - context_switch_cost_minutes: estimated time lost
         """
-        interruptions_by_hour = defaultdict(int)
-        total_interruptions = 0
+        # Fixed 24-slot hour buckets as plain ints (index = hour)
+        counts = self._interruption_counts().tolist()
+        total_interruptions = sum(counts)
         
-        for event in self.events:
-            event_type = event.get('type')
-            
-            if event_type in ['app_switch', 'window_change']:
-                ts_str = event.get('timestamp')
-                if not ts_str:
-                    continue
-                timestamp = datetime.fromisoformat(ts_str)
-                hour = timestamp.hour
-                interruptions_by_hour[hour] += 1
-                total_interruptions += 1
-        
-        # Find peak hour
-        most_disruptive_hour = None
-        max_count = 0
-        
-        for hour, count in interruptions_by_hour.items():
-            if count > max_count:
-                max_count = count
-                most_disruptive_hour = hour
+        # Find peak hour (earliest hour on ties)
+        max_count = max(counts)
+        most_disruptive_hour = counts.index(max_count) if max_count else None
+        interruptions_by_hour = {h: c for h, c in enumerate(counts) if c}
         
         # Estimate context switch cost
         cost_minutes = (total_interruptions * self.context_switch_cost_seconds) / 60
         
         return {
-            'interruptions_per_hour': dict(interruptions_by_hour),
+            'interruptions_per_hour': interruptions_by_hour,
             'most_disruptive_hour': most_disruptive_hour,
             'max_interruptions': max_count,
             'total_interruptions': total_interruptions,
@@ -217,8 +424,10 @@ class ProductivityAnalytics:
         deep_sessions = self.detect_deep_work_sessions()
         interruption_data = self.analyze_interruptions()
         
+        durations, qualities = self._session_columns()
+        
         # Calculate components
-        total_deep_minutes = sum(s['duration_minutes'] for s in deep_sessions)
+        total_deep_minutes = float(durations.sum()) if durations.size else 0
         total_work_minutes = self._calculate_total_work_time()
         
         # Deep work percentage (0-40 points)
@@ -229,8 +438,7 @@ class ProductivityAnalytics:
         interruption_score = max(0, 30 - interruption_data['total_interruptions'])
         
         # Session quality average (0-30 points)
-        quality_scores = [s['quality_score'] for s in deep_sessions]
-        avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
+        avg_quality = float(qualities.mean()) if qualities.size else 0
         quality_score = avg_quality * 0.3
         
         total_score = deep_work_score + interruption_score + quality_score
@@ -251,59 +459,59 @@ class ProductivityAnalytics:
             'rating': self._get_rating(total_score)
         }
     
+    @_memoized
+    def _session_columns(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Deep-session duration_minutes and quality_score as float arrays"""
+        sessions = self.detect_deep_work_sessions()
+        return (np.array([s['duration_minutes'] for s in sessions], dtype=np.float64),
+                np.array([s['quality_score'] for s in sessions], dtype=np.float64))
+    
+    def _total_focus_seconds(self) -> float:
+        """Summed focus_change durations in seconds (accumulated by the session kernel)"""
+        return self._deep_work_pass()[1]
+    
     def _calculate_total_work_time(self) -> float:
         """Calculate total work time in minutes"""
-        total_seconds = 0
-        
-        for event in self.events:
-            if event.get('type') == 'focus_change':
-                total_seconds += event.get('data', {}).get('duration_seconds', 0)
-        
-        return total_seconds / 60
+        return self._total_focus_seconds() / 60
     
     def _get_rating(self, score: float) -> str:
         """Convert score to rating"""
-        if score >= 80:
-            return "Excellent"
-        elif score >= 60:
-            return "Good"
-        elif score >= 40:
-            return "Fair"
-        else:
-            return "Needs Improvement"
+        return _RATING_LABELS[bisect.bisect_right(_RATING_THRESHOLDS, score)]
     
+    @_memoized
     def analyze_category_trends(self) -> Dict[str, Any]:
         """
         Analyze time distribution across categories
         
         Returns category breakdown with trends
         """
-        category_time = defaultdict(int)
-        category_events = defaultdict(int)
-        
-        for event in self.events:
-            if event.get('type') == 'focus_change':
-                data = event.get('data', {})
-                app = data.get('app', '')
-                duration = data.get('duration_seconds', 0)
-                
-                category = self._categorize_app(app)
-                category_time[category] += duration
-                category_events[category] += 1
-        
-        # Calculate percentages
-        total_time = sum(category_time.values())
+        apps = self._apps[self._is_focus]
+        durations = self._durations[self._is_focus]
         
         categories = []
-        for cat, seconds in category_time.items():
-            pct = (seconds / total_time * 100) if total_time else 0
-            categories.append({
-                'category': cat,
-                'time_minutes': round(seconds / 60, 1),
-                'percentage': round(pct, 1),
-                'event_count': category_events[cat],
-                'avg_duration_minutes': round(seconds / category_events[cat] / 60, 1)
-            })
+        total_time = 0.0
+        if apps.size:
+            # Categorize each distinct app once to an int code, then reduce per code in C
+            uniq_apps, app_idx = np.unique(apps.astype(str), return_inverse=True)
+            app_cat = np.array([self._category_code(a) for a in uniq_apps.tolist()], dtype=np.int64)
+            event_cat = app_cat[app_idx]
+            category_time = np.bincount(event_cat, weights=durations, minlength=len(_CATEGORIES))
+            category_events = np.bincount(event_cat, minlength=len(_CATEGORIES))
+            total_time = float(category_time.sum())
+            
+            # Emit categories in first-seen order so equal-time ties keep log order
+            present, first_seen = np.unique(event_cat, return_index=True)
+            for code in present[np.argsort(first_seen, kind='stable')].tolist():
+                seconds = float(category_time[code])
+                count = int(category_events[code])
+                pct = (seconds / total_time * 100) if total_time else 0
+                categories.append({
+                    'category': _CATEGORIES[code],
+                    'time_minutes': round(seconds / 60, 1),
+                    'percentage': round(pct, 1),
+                    'event_count': count,
+                    'avg_duration_minutes': round(seconds / count / 60, 1)
+                })
         
         # Sort by time descending
         categories.sort(key=lambda x: x['time_minutes'], reverse=True)
@@ -315,23 +523,16 @@ class ProductivityAnalytics:
             'category_count': len(categories)
         }
     
+    def _category_code(self, app: str) -> int:
+        """Categorize app into an index into _CATEGORIES"""
+        m = _CATEGORY_RE.match(app.lower())
+        return m.lastindex - 1 if m else _CATEGORY_OTHER
+    
     def _categorize_app(self, app: str) -> str:
         """Categorize app into productivity type"""
-        app_lower = app.lower()
-        
-        if any(word in app_lower for word in ['chrome', 'firefox', 'safari', 'browser']):
-            return 'Research'
-        elif any(word in app_lower for word in ['code', 'terminal', 'iterm', 'pycharm', 'intellij', 'vim']):
-            return 'Coding'
-        elif any(word in app_lower for word in ['slack', 'zoom', 'teams', 'meet', 'skype']):
-            return 'Meetings'
-        elif any(word in app_lower for word in ['mail', 'outlook', 'gmail', 'messages']):
-            return 'Communication'
-        elif any(word in app_lower for word in ['word', 'excel', 'sheets', 'docs', 'notion', 'obsidian']):
-            return 'Docs'
-        else:
-            return 'Other'
+        return _CATEGORIES[self._category_code(app)]
     
+    @_memoized
     def analyze_meeting_efficiency(self) -> Dict[str, Any]:
         """
         Analyze meeting time and efficiency
@@ -342,28 +543,13 @@ class ProductivityAnalytics:
         - average_duration
         - meeting_vs_focus_ratio
         """
-        meeting_times = []
-        meeting_names = []
-        
-        for event in self.events:
-            if event.get('type') == 'meeting_end':
-                data = event.get('data', {})
-                duration = data.get('duration_seconds', 0)
-                name = data.get('name', 'Unknown')
-                
-                meeting_times.append(duration)
-                meeting_names.append(name)
-        
-        total_meeting_seconds = sum(meeting_times)
-        meeting_count = len(meeting_times)
+        meeting_names = list(self._meeting_names)
+        total_meeting_seconds = float(self._durations[self._is_meeting].sum())
+        meeting_count = len(meeting_names)
         avg_duration = total_meeting_seconds / meeting_count if meeting_count else 0
         
-        # Calculate focus time
-        total_focus_seconds = sum(
-            e.get('data', {}).get('duration_seconds', 0)
-            for e in self.events
-            if e.get('type') == 'focus_change'
-        )
+        # Calculate focus time (shared with _calculate_total_work_time)
+        total_focus_seconds = self._total_focus_seconds()
         
         # Meeting vs focus ratio
         ratio = total_meeting_seconds / total_focus_seconds if total_focus_seconds else 0
@@ -379,12 +565,7 @@ class ProductivityAnalytics:
     
     def _get_meeting_recommendation(self, ratio: float) -> str:
         """Provide recommendation based on meeting/focus ratio"""
-        if ratio > 0.5:
-            return "Too many meetings - consider declining or delegating some"
-        elif ratio > 0.3:
-            return "Meeting load is moderate - ensure quality focus time remains"
-        else:
-            return "Good balance between meetings and focus work"
+        return _MEETING_RECOMMENDATIONS[bisect.bisect_left(_MEETING_RATIO_THRESHOLDS, ratio)]
     
     def suggest_focus_windows(self) -> List[Dict[str, Any]]:
         """
@@ -392,53 +573,28 @@ class ProductivityAnalytics:
         
         Returns suggested time blocks with rationale
         """
-        interruption_data = self.analyze_interruptions()
-        interruptions_by_hour = interruption_data['interruptions_per_hour']
+        first_hour, last_hour = 6, 22  # 6am to 11pm
+        counts = self._interruption_counts()[first_hour:last_hour + 1]
         
-        # Find hours with low interruptions
-        quiet_hours = []
+        # Low-interruption hours, then contiguous runs of them via edge detection
+        quiet = counts <= 2
+        edges = np.diff(np.concatenate(([0], quiet.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
         
-        for hour in range(6, 23):  # 6am to 11pm
-            interruptions = interruptions_by_hour.get(hour, 0)
-            
-            if interruptions <= 2:  # Low interruption threshold
-                quiet_hours.append({
-                    'hour': hour,
-                    'time': f"{hour:02d}:00",
-                    'interruptions': interruptions,
-                    'quality': 'Excellent' if interruptions == 0 else 'Good'
-                })
-        
-        # Group consecutive hours
         windows = []
-        current_window = []
-        
-        for i, hour_data in enumerate(quiet_hours):
-            if not current_window:
-                current_window = [hour_data]
-            elif hour_data['hour'] == current_window[-1]['hour'] + 1:
-                current_window.append(hour_data)
-            else:
-                if len(current_window) >= 2:  # At least 2 hours
-                    windows.append(self._format_window(current_window))
-                current_window = [hour_data]
-        
-        # Add last window
-        if len(current_window) >= 2:
-            windows.append(self._format_window(current_window))
+        for s, e in zip(starts.tolist(), ends.tolist()):
+            if e - s >= 2:  # At least 2 hours
+                windows.append(self._format_window(first_hour + s, first_hour + e, int(counts[s:e].sum())))
         
         return windows
     
-    def _format_window(self, hours: List[Dict]) -> Dict[str, Any]:
-        """Format window data"""
-        start_hour = hours[0]['hour']
-        end_hour = hours[-1]['hour'] + 1
-        total_interruptions = sum(h['interruptions'] for h in hours)
-        
+    def _format_window(self, start_hour: int, end_hour: int, total_interruptions: int) -> Dict[str, Any]:
+        """Format window data for the hours [start_hour, end_hour)"""
         return {
             'start_time': f"{start_hour:02d}:00",
             'end_time': f"{end_hour:02d}:00",
-            'duration_hours': len(hours),
+            'duration_hours': end_hour - start_hour,
             'total_interruptions': total_interruptions,
             'quality': 'Excellent' if total_interruptions == 0 else 'Good',
             'recommendation': f"Schedule deep work during {start_hour:02d}:00-{end_hour:02d}:00"
@@ -446,6 +602,9 @@ class ProductivityAnalytics:
     
     def generate_report(self) -> Dict[str, Any]:
         """Generate comprehensive analytics report"""
+        if not self._has_data:
+            return self._empty_report()
+        
         # Build timeline and deep_work_blocks for compatibility with ActivityReport schema
         timeline = self._build_timeline()
         deep_blocks = self._build_deep_work_blocks()
@@ -462,30 +621,78 @@ class ProductivityAnalytics:
             'focus_windows': self.suggest_focus_windows()
         }
 
+    def _empty_report(self) -> Dict[str, Any]:
+        """Report for a day with no activity, identical to what the full analysis yields"""
+        interruption_score = 30  # Full low-interruption bonus; no other points
+        return {
+            'date': self.date.strftime('%Y-%m-%d'),
+            'deep_work_sessions': [],
+            'deep_work_blocks': [],
+            'timeline': self._build_timeline(),  # Header line only, if timestamped
+            'interruption_analysis': {
+                'interruptions_per_hour': {},
+                'most_disruptive_hour': None,
+                'max_interruptions': 0,
+                'total_interruptions': 0,
+                'context_switch_cost_minutes': 0.0,
+                'average_per_hour': 0
+            },
+            'productivity_score': {
+                'overall_score': float(interruption_score),
+                'components': {
+                    'deep_work_score': 0.0,
+                    'interruption_score': interruption_score,
+                    'quality_score': 0.0
+                },
+                'metrics': {
+                    'total_deep_minutes': 0,
+                    'total_work_minutes': 0.0,
+                    'deep_work_percentage': 0,
+                    'deep_sessions_count': 0
+                },
+                'rating': self._get_rating(interruption_score)
+            },
+            'category_trends': {
+                'categories': [],
+                'total_time_minutes': 0.0,
+                'top_category': None,
+                'category_count': 0
+            },
+            'meeting_efficiency': {
+                'total_meeting_minutes': 0.0,
+                'meeting_count': 0,
+                'average_duration_minutes': 0.0,
+                'meeting_vs_focus_ratio': 0,
+                'meetings': [],
+                'recommendation': self._get_meeting_recommendation(0)
+            },
+            'focus_windows': [self._format_window(6, 23, 0)]
+        }
+
     def _build_timeline(self) -> List[Dict[str, Any]]:
         """Convert raw events into a simple timeline export compatible with reports."""
         out: List[Dict[str, Any]] = []
+        append = out.append
+        extract = _extract
+        categorize = self._categorize_app
         for ev in self.events:
-            ts = ev.get('timestamp')
-            if not ts:
-                continue
-            try:
-                start_dt = datetime.fromisoformat(ts)
-            except Exception:
+            start_dt = ev['_ts']
+            if start_dt is None:
                 continue
-            duration = ev.get('data', {}).get('duration_seconds', ev.get('duration_seconds', 0))
+            event_type, _, data = extract(ev)
+            duration = data.get('duration_seconds', ev.get('duration_seconds', 0))
             seconds = int(duration) if isinstance(duration, (int, float)) else 0
             minutes = int(seconds / 60)
-            app = ev.get('data', {}).get('app') or ev.get('app') or 'Unknown'
-            category = self._categorize_app(app)
-            out.append({
+            app = data.get('app') or ev.get('app') or 'Unknown'
+            category = categorize(app)
+            append({
                 'start': start_dt.strftime('%H:%M'),
                 'end': (start_dt + timedelta(seconds=seconds)).strftime('%H:%M'),
                 'seconds': seconds,
                 'minutes': minutes,
                 'category': category,
                 'app': app,
-                'type': ev.get('type')
+                'type': event_type
             })
         return out
 
@@ -515,31 +722,107 @@ class ProductivityAnalytics:
         return blocks
 
 
-def compare_trends(start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+# Ranges shorter than this are analyzed in-process; below it, worker start-up
+# costs more than the per-day log reads and analysis it would overlap.
+_PARALLEL_MIN_DAYS = 8
+
+
+def _read_log_file(log_path: Path) -> List[Dict[str, Any]]:
+    """Decode one JSONL log via mmap, skipping blank and corrupt lines"""
+    events: List[Dict[str, Any]] = []
+    corrupted_lines = 0
+    try:
+        with open(log_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return events
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in iter(mm.readline, b''):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        events.append(_json_loads(line))
+                    except ValueError:
+                        corrupted_lines += 1
+    except FileNotFoundError:
+        return events
+    except OSError as e:
+        logger.error(f"Failed to read log file {log_path}: {e}")
+        return events
+    
+    if corrupted_lines > 0:
+        logger.warning(f"Skipped {corrupted_lines} corrupted lines in {log_path}")
+    return events
+
+
+def _day_range(start_date: datetime, end_date: datetime) -> List[date]:
+    """Calendar days from start_date through end_date, inclusive"""
+    return [date.fromordinal(o) for o in range(start_date.toordinal(), end_date.toordinal() + 1)]
+
+
+def _read_range(start_date: datetime, end_date: datetime) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Read every daily log from start_date through end_date in one batch
+    
+    Returns events keyed by 'YYYY-MM-DD' (empty list for days without a
+    log). Read-only: unlike read_daily_log, corrupt logs are not repaired
+    in place, only their bad lines skipped.
+    """
+    return {day.isoformat(): _read_log_file(get_log_path(day)) for day in _day_range(start_date, end_date)}
+
+
+def _analyze_one(date: datetime, config: Optional[Dict[str, Any]] = None,
+                 tz: Optional[ZoneInfo] = None,
+                 events: Optional[List[Dict[str, Any]]] = None) -> Tuple[float, float, int]:
+    """Per-day metrics for compare_trends (module-level so worker processes can run it)"""
+    if events is None:
+        events = _read_log_file(get_log_path(date))
+    analytics = ProductivityAnalytics.from_events(date, events, config=config, tz=tz)
+    score_data = analytics.calculate_productivity_score()
+    interruption_data = analytics.analyze_interruptions()
+    return (
+        score_data['overall_score'],
+        score_data['metrics']['total_deep_minutes'],
+        interruption_data['total_interruptions'],
+    )
+
+
+def compare_trends(start_date: datetime, end_date: datetime,
+                   max_workers: Optional[int] = None) -> Dict[str, Any]:
     """
     Compare productivity trends across a date range
     
-    Returns aggregated metrics and trends
+    Days are analyzed in parallel worker processes for longer ranges, or
+    for any range when max_workers > 1 is given explicitly (max_workers=1
+    forces serial). Returns aggregated metrics and trends
     """
+    # Walk calendar days by ordinal; aware datetimes (same wall-clock time and
+    # tzinfo as start_date) are only built to hand to each day's analysis
+    days = _day_range(start_date, end_date)
+    start_time, start_tz = start_date.time(), start_date.tzinfo
+    dates = [datetime.combine(day, start_time, start_tz) for day in days]
+    
+    # Resolve config and timezone once for the whole range, not per day
     config = load_config()
     tz = ZoneInfo(config['tracking']['timezone'])
     
-    daily_scores = []
-    daily_deep_minutes = []
-    daily_interruptions = []
+    results = None
+    parallel = max_workers > 1 if max_workers is not None else len(dates) >= _PARALLEL_MIN_DAYS
+    if parallel and len(dates) > 1:
+        try:
+            # Workers get only the (pickle-cheap) timezone and read their own day's
+            # log; each loads config from its own cache
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(functools.partial(_analyze_one, tz=tz), dates))
+        except Exception as e:
+            logger.debug(f"Parallel trend analysis unavailable, running serially: {e}")
+    if results is None:
+        by_day = _read_range(start_date, end_date)
+        results = [_analyze_one(d, config, tz, by_day[day.isoformat()]) for d, day in zip(dates, days)]
     
-    current = start_date
-    while current <= end_date:
-        analytics = ProductivityAnalytics(current)
-        
-        score_data = analytics.calculate_productivity_score()
-        interruption_data = analytics.analyze_interruptions()
-        
-        daily_scores.append(score_data['overall_score'])
-        daily_deep_minutes.append(score_data['metrics']['total_deep_minutes'])
-        daily_interruptions.append(interruption_data['total_interruptions'])
-        
-        current += timedelta(days=1)
+    daily_scores = [r[0] for r in results]
+    daily_deep_minutes = [r[1] for r in results]
+    daily_interruptions = [r[2] for r in results]
     
     # Calculate trends
     avg_score = sum(daily_scores) / len(daily_scores) if daily_scores else 0
@@ -582,6 +865,9 @@ def main():
     print("=" * 60)
     
     analytics = ProductivityAnalytics(today)
+    if not analytics._has_data:
+        print(f"\nNo activity logged for {today.strftime('%Y-%m-%d')}")
+        return
     report = analytics.generate_report()
     
     print(f"\nDate: {report['date']}")
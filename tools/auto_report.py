@@ -6,172 +6,452 @@ Generates daily, weekly, and monthly reports with analytics.
 Can be run manually or scheduled via cron/launchd.
 """
 
+import hashlib
 import json
+import os
 import sys
 import argparse
+from collections import Counter
+from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 try:
-    from .daily_logger import load_config, read_daily_log, get_log_path
-    from .analytics import ProductivityAnalytics, compare_trends
+    import orjson  # optional: native JSON encoder for report files
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    from .daily_logger import load_config, get_log_path
 except ImportError:  # pragma: no cover
-    from daily_logger import load_config, read_daily_log, get_log_path
-    from analytics import ProductivityAnalytics, compare_trends
+    from daily_logger import load_config, get_log_path
+
+# analytics (and NumPy behind it) is imported inside the report generators,
+# so --help, argument errors and importers of this module don't pay for it
+
+# Where reports go when no output directory is given
+_DEFAULT_OUTPUT_DIR = Path(__file__).parent.parent / 'reports'
+
+# Report files are written through one large buffer so a report costs a
+# handful of write() syscalls rather than one per encoder chunk
+_WRITE_BUFFER = 1 << 20
+
+# JSON reports go straight to a file descriptor, their encoder chunks
+# gathered into writev() calls of at most this many buffers
+try:
+    _IOV_MAX = max(os.sysconf('SC_IOV_MAX'), 16)
+except (AttributeError, OSError, ValueError):  # pragma: no cover
+    _IOV_MAX = 1024
+
+# Markdown report templates, rendered with str.format_map over the report's
+# sections; keeping the wording here leaves the emitters as plain control flow
+_TEMPLATES = {
+    'daily_head': (
+        "# Daily Productivity Report — {date}\n"
+        "\n"
+        "## Overall Score\n"
+        "\n"
+        "**{score[overall_score]}/100** ({score[rating]})\n"
+        "\n"
+        "### Components\n"
+        "- Deep Work: {components[deep_work_score]:.1f}/40\n"
+        "- Interruptions: {components[interruption_score]:.1f}/30\n"
+        "- Quality: {components[quality_score]:.1f}/30\n"
+        "\n"
+        "## Key Metrics\n"
+        "\n"
+        "- Total Focus Time: {metrics[total_work_minutes]:.0f} minutes\n"
+        "- Deep Work Time: {metrics[total_deep_minutes]:.0f} minutes ({metrics[deep_work_percentage]:.1f}%)\n"
+        "- Deep Work Sessions: {metrics[deep_sessions_count]}\n"
+        "- Total Interruptions: {interruptions[total_interruptions]}\n"
+        "- Meeting Time: {meetings[total_meeting_minutes]:.0f} minutes\n"
+        "\n"
+        "## Deep Work Sessions\n"
+        "\n"
+    ),
+    # Positional: index, session, start time (HH:MM)
+    'daily_session': "{0}. **{1[duration_minutes]:.0f}min** starting at {2} ({1[app]}) — Quality: {1[quality_score]:.0f}/100\n",
+    'daily_no_sessions': "_No deep work sessions detected (minimum 25 minutes)_\n",
+    'daily_categories': "\n## Time by Category\n\n",
+    'daily_category': "- **{category}**: {time_minutes:.0f}min ({percentage:.1f}%)\n",
+    'daily_middle': (
+        "\n"
+        "## Interruption Analysis\n"
+        "\n"
+        "- Total: {interruptions[total_interruptions]} interruptions\n"
+        "- Average per hour: {interruptions[average_per_hour]:.1f}\n"
+        "- Most disruptive hour: {interruptions[most_disruptive_hour]}:00 "
+        "({interruptions[max_interruptions]} interruptions)\n"
+        "- Estimated time lost: {interruptions[context_switch_cost_minutes]:.0f} minutes\n"
+        "\n"
+        "## Meeting Efficiency\n"
+        "\n"
+        "- Meetings: {meetings[meeting_count]}\n"
+        "- Total time: {meetings[total_meeting_minutes]:.0f} minutes\n"
+        "- Average duration: {meetings[average_duration_minutes]:.0f} minutes\n"
+        "- Meeting/Focus ratio: {meetings[meeting_vs_focus_ratio]:.2f}\n"
+        "- **Recommendation**: {meetings[recommendation]}\n"
+        "\n"
+        "## Suggested Focus Windows\n"
+        "\n"
+    ),
+    'daily_window': (
+        "- **{start_time}–{end_time}** ({duration_hours}h) — "
+        "{quality} ({total_interruptions} interruptions)\n"
+    ),
+    'daily_no_windows': "_No quiet windows identified_\n",
+    'daily_footer': "\n---\n*Generated: {generated_at}*",
+    'weekly_head': (
+        "# Weekly Productivity Report\n"
+        "\n"
+        "**Period**: {period[start]} to {period[end]} ({period[days]} days)\n"
+        "\n"
+        "## Averages\n"
+        "\n"
+        "- Productivity Score: {averages[productivity_score]:.1f}/100\n"
+        "- Deep Work Time: {averages[deep_work_minutes]:.0f} minutes/day\n"
+        "- Interruptions: {averages[interruptions]:.0f}/day\n"
+        "\n"
+        "## Trends\n"
+        "\n"
+        "- Score trend: **{trends[score_trend]}**\n"
+        "- Change: {trends[score_change]:+.1f} points\n"
+        "\n"
+        "## Daily Breakdown\n"
+        "\n"
+        "| Day | Score | Deep Work (min) | Interruptions |\n"
+        "|-----|-------|-----------------|---------------|\n"
+    ),
+    'weekly_footer': "\n---\n*Generated: {generated_at}*",
+}
+
+
+@lru_cache(maxsize=8)
+def _tz(name: str) -> ZoneInfo:
+    """Timezone by name, resolved once per process"""
+    return ZoneInfo(name)
+
+
+def _generated_stamp() -> str:
+    """Footer timestamp for report files"""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _report_digest(data: dict, fmt: str = 'both') -> str:
+    """Content fingerprint of a report (key-order independent) and the formats written"""
+    if orjson is not None:
+        payload = orjson.dumps(
+            data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        payload = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+    h = hashlib.blake2b(fmt.encode('utf-8') + b'\0', digest_size=16)
+    h.update(payload)
+    return h.hexdigest()
+
+
+def _digest_path(report_path: Path) -> Path:
+    """Sidecar holding the digest of the report last written to report_path"""
+    return report_path.with_name(report_path.name + '.sha')
+
+
+def _format_outputs(fmt: str, json_path: Path, md_path: Path, *json_extras: Path) -> Tuple[Path, ...]:
+    """Files a --format choice produces; the first one also keys the digest sidecar"""
+    if fmt == 'json':
+        return (json_path, *json_extras)
+    if fmt == 'markdown':
+        return (md_path,)
+    if fmt == 'both':
+        return (json_path, md_path, *json_extras)
+    raise ValueError(f"Unknown report format: {fmt!r}")
 
 
-def generate_daily_report(date: Optional[datetime] = None, output_dir: Optional[Path] = None) -> Path:
+def _report_unchanged(report_path: Path, digest: str, *other_outputs: Path) -> bool:
+    """True when every output exists and was written from identical report data"""
+    try:
+        return (report_path.exists() and all(p.exists() for p in other_outputs)
+                and _digest_path(report_path).read_text().strip() == digest)
+    except OSError:
+        return False
+
+
+@contextmanager
+def _atomic_open(path: Path, mode: str):
+    """
+    Open a buffered '<name>.tmp' sibling of path for writing
+    
+    The temp file replaces path only when the block completes, so an
+    interrupted run never leaves a truncated report behind.
+    """
+    tmp = path.with_name(path.name + '.tmp')
+    try:
+        with open(tmp, mode, buffering=_WRITE_BUFFER) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def _atomic_fd(path: Path):
+    """
+    Open a '<name>.tmp' sibling of path as a raw file descriptor
+    
+    Same replace-on-success contract as _atomic_open, without a file object
+    in between for writers that hand whole byte chunks to the kernel.
+    """
+    tmp = path.with_name(path.name + '.tmp')
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            yield fd
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def _write_all(fd: int, batch: list) -> None:
+    """Write a batch of byte chunks to fd in one writev(), finishing any short write"""
+    if hasattr(os, 'writev'):
+        written = os.writev(fd, batch)
+        if written == sum(map(len, batch)):
+            return
+        rest = memoryview(b''.join(batch))[written:]
+    else:  # pragma: no cover - no writev on Windows
+        rest = memoryview(b''.join(batch))
+    while rest:
+        rest = rest[os.write(fd, rest):]
+
+
+def _write_chunks(fd: int, chunks: Iterable[bytes]) -> None:
+    """Write chunks to fd, gathered into writev() batches of up to _WRITE_BUFFER bytes"""
+    batch = []
+    size = 0
+    for chunk in chunks:
+        batch.append(chunk)
+        size += len(chunk)
+        if size >= _WRITE_BUFFER or len(batch) >= _IOV_MAX:
+            _write_all(fd, batch)
+            batch.clear()
+            size = 0
+    if batch:
+        _write_all(fd, batch)
+
+
+def _json_chunks(data: dict, pretty: bool = False) -> Iterable[bytes]:
+    """
+    Encode data as compact JSON bytes (2-space indented when pretty)
+    
+    With orjson the document is encoded natively in one call (int dict keys,
+    e.g. interruptions_per_hour, are stringified as json does); otherwise
+    json's iterencode chunks are yielded without building the full string.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return (orjson.dumps(data, option=option),)
+    encoder = json.JSONEncoder(indent=2) if pretty else json.JSONEncoder(separators=(',', ':'))
+    return (chunk.encode('utf-8') for chunk in encoder.iterencode(data))
+
+
+def _write_json(path: Path, data: dict, pretty: bool = False) -> None:
+    """Write data as JSON to path (compact unless pretty)"""
+    with _atomic_fd(path) as fd:
+        _write_chunks(fd, _json_chunks(data, pretty))
+
+
+def _write_ndjson(path: Path, records: Iterable[dict]) -> None:
+    """Write one compact JSON object per line, so consumers can stream the file"""
+    dumps = orjson.dumps if orjson is not None else (lambda obj: json.dumps(obj).encode('utf-8'))
+    with _atomic_open(path, 'wb') as f:
+        for record in records:
+            f.write(dumps(record))
+            f.write(b'\n')
+
+
+def generate_daily_report(date: Optional[datetime] = None,
+                          output_dir: Optional[Path] = None,
+                          generated_at: Optional[str] = None,
+                          fmt: str = 'both', pretty: bool = False) -> Tuple[Path, dict]:
     """
     Generate daily report with analytics
     
     Args:
         date: Date to generate report for (default: today)
-        output_dir: Where to save report (default: reports/)
+        output_dir: Existing directory to save the report in (default: reports/,
+            created if missing)
+        generated_at: Footer timestamp (default: now); pass one value to
+            stamp a batch of reports identically
+        fmt: 'json', 'markdown' or 'both' (default); skipped formats are not built
+        pretty: Indent the JSON file (default: compact; the Markdown is the
+            human-readable view)
     
     Returns:
-        Path to generated report
+        (path to generated report (JSON unless fmt='markdown'), report data)
     """
-    config = load_config()
-    tz = ZoneInfo(config['tracking']['timezone'])
+    tz = _tz(load_config()['tracking']['timezone'])
     date = date or datetime.now(tz)
     
-    output_dir = output_dir or Path(__file__).parent.parent / 'reports'
-    output_dir.mkdir(exist_ok=True)
+    if output_dir is None:
+        output_dir = _DEFAULT_OUTPUT_DIR
+        output_dir.mkdir(exist_ok=True)
+    
+    try:
+        from .analytics import ProductivityAnalytics
+    except ImportError:  # pragma: no cover
+        from analytics import ProductivityAnalytics
     
     # Generate analytics
     analytics = ProductivityAnalytics(date)
     report_data = analytics.generate_report()
     
-    # Add raw events summary
-    events = read_daily_log(date)
+    # Add raw events summary (from the events analytics already read)
+    events = analytics.events
     report_data['raw_events'] = {
         'total_events': len(events),
-        'event_types': {}
+        'event_types': dict(Counter(event.get('type', 'unknown') for event in events))
     }
     
-    for event in events:
-        et = event.get('type', 'unknown')
-        event_types = report_data['raw_events']['event_types']  # type: ignore[index]
-        event_types[et] = event_types.get(et, 0) + 1  # type: ignore[union-attr]
-    
-    # Save JSON report
-    report_path = output_dir / f"daily-report-{date.strftime('%Y-%m-%d')}.json"
-    with open(report_path, 'w') as f:
-        json.dump(report_data, f, indent=2)
-    
-    print(f"Daily report generated: {report_path}")
-    
-    # Generate markdown summary
-    md_path = output_dir / f"daily-report-{date.strftime('%Y-%m-%d')}.md"
-    generate_markdown_summary(report_data, md_path)
-    print(f"Markdown summary: {md_path}")
-    
-    return report_path
+    date_str = date.strftime('%Y-%m-%d')
+    json_path = output_dir / f"daily-report-{date_str}.json"
+    md_path = output_dir / f"daily-report-{date_str}.md"
+    outputs = _format_outputs(fmt, json_path, md_path)
+    report_path = outputs[0]
+    
+    # Skip rewriting the outputs when nothing changed since the last run
+    digest = _report_digest(report_data, fmt + ('+pretty' if pretty else ''))
+    if _report_unchanged(report_path, digest, *outputs[1:]):
+        print(f"Daily report unchanged: {report_path}")
+        return report_path, report_data
+    
+    # Save JSON report and markdown summary in one pass with both files open
+    with ExitStack() as stack:
+        if json_path in outputs:
+            json_fd = stack.enter_context(_atomic_fd(json_path))
+            _write_chunks(json_fd, _json_chunks(report_data, pretty))
+        if md_path in outputs:
+            md_f = stack.enter_context(_atomic_open(md_path, 'w'))
+            _emit_markdown_summary(md_f.write, report_data, generated_at or _generated_stamp())
+    
+    if json_path in outputs:
+        print(f"Daily report generated: {json_path}")
+    if md_path in outputs:
+        print(f"Markdown summary: {md_path}")
+    
+    _digest_path(report_path).write_text(digest)
+    
+    return report_path, report_data
 
 
-def generate_markdown_summary(report_data: dict, output_path: Path):
+def generate_markdown_summary(report_data: dict, output_path: Path,
+                              generated_at: Optional[str] = None):
     """Generate human-readable markdown summary"""
+    with _atomic_open(output_path, 'w') as f:
+        _emit_markdown_summary(f.write, report_data, generated_at or _generated_stamp())
+
+
+def _emit_markdown_summary(w: Callable[[str], object], report_data: dict, generated_at: str) -> None:
+    """Emit the daily markdown summary section by section through the write callable w"""
+    score = report_data['productivity_score']
+    fields = {
+        'date': report_data['date'],
+        'score': score,
+        'components': score['components'],
+        'metrics': score['metrics'],
+        'interruptions': report_data['interruption_analysis'],
+        'meetings': report_data['meeting_efficiency'],
+        'generated_at': generated_at,
+    }
+    sessions = report_data['deep_work_sessions']
+    windows = report_data['focus_windows']
     
-    lines = [
-        f"# Daily Productivity Report — {report_data['date']}",
-        "",
-        "## Overall Score",
-        "",
-        f"**{report_data['productivity_score']['overall_score']}/100** "
-        f"({report_data['productivity_score']['rating']})",
-        "",
-        "### Components",
-        f"- Deep Work: {report_data['productivity_score']['components']['deep_work_score']:.1f}/40",
-        f"- Interruptions: {report_data['productivity_score']['components']['interruption_score']:.1f}/30",
-        f"- Quality: {report_data['productivity_score']['components']['quality_score']:.1f}/30",
-        "",
-        "## Key Metrics",
-        "",
-        f"- Total Focus Time: {report_data['productivity_score']['metrics']['total_work_minutes']:.0f} minutes",
-        f"- Deep Work Time: {report_data['productivity_score']['metrics']['total_deep_minutes']:.0f} minutes "
-        f"({report_data['productivity_score']['metrics']['deep_work_percentage']:.1f}%)",
-        f"- Deep Work Sessions: {report_data['productivity_score']['metrics']['deep_sessions_count']}",
-        f"- Total Interruptions: {report_data['interruption_analysis']['total_interruptions']}",
-        f"- Meeting Time: {report_data['meeting_efficiency']['total_meeting_minutes']:.0f} minutes",
-        "",
-        "## Deep Work Sessions",
-        ""
-    ]
-    
-    if report_data['deep_work_sessions']:
-        for i, session in enumerate(report_data['deep_work_sessions'], 1):
-            start_time = session['start_time'].split('T')[1][:5]
-            lines.append(
-                f"{i}. **{session['duration_minutes']:.0f}min** starting at {start_time} "
-                f"({session['app']}) — Quality: {session['quality_score']:.0f}/100"
-            )
-    else:
-        lines.append("_No deep work sessions detected (minimum 25 minutes)_")
+    w(_TEMPLATES['daily_head'].format_map(fields))
     
-    lines.extend([
-        "",
-        "## Time by Category",
-        ""
-    ])
+    if sessions:
+        session_line = _TEMPLATES['daily_session'].format
+        for i, session in enumerate(sessions, 1):
+            w(session_line(i, session, session['start_time'].split('T')[1][:5]))
+    else:
+        w(_TEMPLATES['daily_no_sessions'])
     
+    w(_TEMPLATES['daily_categories'])
+    category_line = _TEMPLATES['daily_category'].format_map
     for cat in report_data['category_trends']['categories']:
-        lines.append(f"- **{cat['category']}**: {cat['time_minutes']:.0f}min ({cat['percentage']:.1f}%)")
-    
-    lines.extend([
-        "",
-        "## Interruption Analysis",
-        "",
-        f"- Total: {report_data['interruption_analysis']['total_interruptions']} interruptions",
-        f"- Average per hour: {report_data['interruption_analysis']['average_per_hour']:.1f}",
-        f"- Most disruptive hour: {report_data['interruption_analysis']['most_disruptive_hour']}:00 "
-        f"({report_data['interruption_analysis']['max_interruptions']} interruptions)",
-        f"- Estimated time lost: {report_data['interruption_analysis']['context_switch_cost_minutes']:.0f} minutes",
-        "",
-        "## Meeting Efficiency",
-        "",
-        f"- Meetings: {report_data['meeting_efficiency']['meeting_count']}",
-        f"- Total time: {report_data['meeting_efficiency']['total_meeting_minutes']:.0f} minutes",
-        f"- Average duration: {report_data['meeting_efficiency']['average_duration_minutes']:.0f} minutes",
-        f"- Meeting/Focus ratio: {report_data['meeting_efficiency']['meeting_vs_focus_ratio']:.2f}",
-        f"- **Recommendation**: {report_data['meeting_efficiency']['recommendation']}",
-        "",
-        "## Suggested Focus Windows",
-        ""
-    ])
-    
-    if report_data['focus_windows']:
-        for window in report_data['focus_windows']:
-            lines.append(
-                f"- **{window['start_time']}–{window['end_time']}** ({window['duration_hours']}h) — "
-                f"{window['quality']} ({window['total_interruptions']} interruptions)"
-            )
+        w(category_line(cat))
+    
+    w(_TEMPLATES['daily_middle'].format_map(fields))
+    
+    if windows:
+        window_line = _TEMPLATES['daily_window'].format_map
+        for window in windows:
+            w(window_line(window))
     else:
-        lines.append("_No quiet windows identified_")
+        w(_TEMPLATES['daily_no_windows'])
     
-    lines.extend([
-        "",
-        "---",
-        f"*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*"
-    ])
+    # Last line carries no trailing newline
+    w(_TEMPLATES['daily_footer'].format_map(fields))
+
+
+def _daily_columns(start_date: datetime, daily_data: dict) -> dict:
+    """
+    Per-day trend data as NumPy columns (struct-of-arrays)
     
-    with open(output_path, 'w') as f:
-        f.write('\n'.join(lines))
+    dates are 'YYYY-MM-DD' strings counted from start_date; scores and
+    deep_minutes are float64, interruptions int64. Roll-ups over the range
+    are then vectorized reductions rather than per-row loops.
+    """
+    import numpy as np
+    
+    scores = np.asarray(daily_data['scores'], dtype=np.float64)
+    first = np.datetime64(start_date.strftime('%Y-%m-%d'), 'D')
+    return {
+        'dates': np.datetime_as_string(first + np.arange(len(scores)), unit='D'),
+        'scores': scores,
+        'deep_minutes': np.asarray(daily_data['deep_minutes'], dtype=np.float64),
+        'interruptions': np.asarray(daily_data['interruptions'], dtype=np.int64),
+    }
 
 
-def generate_weekly_report(end_date: Optional[datetime] = None, output_dir: Optional[Path] = None) -> Path:
-    """Generate weekly summary report"""
-    config = load_config()
-    tz = ZoneInfo(config['tracking']['timezone'])
+def generate_weekly_report(end_date: Optional[datetime] = None,
+                           output_dir: Optional[Path] = None,
+                           generated_at: Optional[str] = None,
+                           fmt: str = 'both', pretty: bool = False) -> Tuple[Path, dict]:
+    """
+    Generate weekly summary report; returns (report path, report data)
+    
+    fmt is 'json' (JSON + per-day NDJSON), 'markdown' or 'both' (default);
+    pretty indents the JSON file, which is otherwise compact. output_dir must
+    already exist; the default reports/ directory is created if missing.
+    """
+    generated_at = generated_at or _generated_stamp()
+    tz = _tz(load_config()['tracking']['timezone'])
     end_date = end_date or datetime.now(tz)
     start_date = end_date - timedelta(days=6)
     
-    output_dir = output_dir or Path(__file__).parent.parent / 'reports'
-    output_dir.mkdir(exist_ok=True)
+    if output_dir is None:
+        output_dir = _DEFAULT_OUTPUT_DIR
+        output_dir.mkdir(exist_ok=True)
     
-    # Get trend data
-    trends = compare_trends(start_date, end_date)
+    try:
+        from .analytics import compare_trends
+    except ImportError:  # pragma: no cover
+        from analytics import compare_trends
+    
+    # Get trend data (the 7 independent days analyzed in parallel workers)
+    trends = compare_trends(start_date, end_date, max_workers=7)
     
     report_data = {
         'type': 'weekly',
@@ -181,56 +461,71 @@ def generate_weekly_report(end_date: Optional[datetime] = None, output_dir: Opti
         'daily_breakdown': trends['daily_data']
     }
     
-    # Save JSON
-    report_path = output_dir / f"weekly-report-{end_date.strftime('%Y-%m-%d')}.json"
-    with open(report_path, 'w') as f:
-        json.dump(report_data, f, indent=2)
-    
-    print(f"Weekly report generated: {report_path}")
-    
-    # Generate markdown
-    md_path = output_dir / f"weekly-report-{end_date.strftime('%Y-%m-%d')}.md"
-    
-    lines = [
-        f"# Weekly Productivity Report",
-        "",
-        f"**Period**: {trends['period']['start']} to {trends['period']['end']} ({trends['period']['days']} days)",
-        "",
-        "## Averages",
-        "",
-        f"- Productivity Score: {trends['averages']['productivity_score']:.1f}/100",
-        f"- Deep Work Time: {trends['averages']['deep_work_minutes']:.0f} minutes/day",
-        f"- Interruptions: {trends['averages']['interruptions']:.0f}/day",
-        "",
-        "## Trends",
-        "",
-        f"- Score trend: **{trends['trends']['score_trend']}**",
-        f"- Change: {trends['trends']['score_change']:+.1f} points",
-        "",
-        "## Daily Breakdown",
-        "",
-        "| Day | Score | Deep Work (min) | Interruptions |",
-        "|-----|-------|-----------------|---------------|"
-    ]
-    
-    for i, score in enumerate(trends['daily_data']['scores']):
-        day_date = (start_date + timedelta(days=i)).strftime('%Y-%m-%d')
-        deep_min = trends['daily_data']['deep_minutes'][i]
-        interruptions = trends['daily_data']['interruptions'][i]
-        lines.append(f"| {day_date} | {score:.0f} | {deep_min:.0f} | {interruptions} |")
-    
-    lines.extend([
-        "",
-        "---",
-        f"*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*"
-    ])
-    
-    with open(md_path, 'w') as f:
-        f.write('\n'.join(lines))
-    
-    print(f"Markdown summary: {md_path}")
-    
-    return report_path
+    date_str = end_date.strftime('%Y-%m-%d')
+    json_path = output_dir / f"weekly-report-{date_str}.json"
+    md_path = output_dir / f"weekly-report-{date_str}.md"
+    ndjson_path = output_dir / f"weekly-report-{date_str}.ndjson"
+    outputs = _format_outputs(fmt, json_path, md_path, ndjson_path)
+    report_path = outputs[0]
+    
+    # Skip rewriting the outputs when nothing changed since the last run
+    digest = _report_digest(report_data, fmt + ('+pretty' if pretty else ''))
+    if _report_unchanged(report_path, digest, *outputs[1:]):
+        print(f"Weekly report unchanged: {report_path}")
+        return report_path, report_data
+    
+    # Per-day columns; rows are only projected out for the NDJSON
+    days = _daily_columns(start_date, trends['daily_data'])
+    
+    if json_path in outputs:
+        # Save JSON
+        _write_json(json_path, report_data, pretty)
+        print(f"Weekly report generated: {json_path}")
+        
+        # One record per day for line-at-a-time consumers
+        _write_ndjson(ndjson_path, (
+            {'date': day, 'score': score, 'deep_work_minutes': deep_min, 'interruptions': interruptions}
+            for day, score, deep_min, interruptions in zip(
+                days['dates'].tolist(), days['scores'].tolist(),
+                days['deep_minutes'].tolist(), days['interruptions'].tolist())
+        ))
+    
+    if md_path in outputs:
+        # Generate markdown
+        with _atomic_open(md_path, 'w') as f:
+            _emit_weekly_markdown(f.write, trends, _weekly_table_rows(days), generated_at)
+        print(f"Markdown summary: {md_path}")
+    
+    _digest_path(report_path).write_text(digest)
+    
+    return report_path, report_data
+
+
+def _weekly_table_rows(days: dict) -> str:
+    """
+    Daily Breakdown table rows for the _daily_columns columns
+    
+    Each column is formatted as a whole with np.char and the cells joined
+    element-wise, so the table costs the same handful of calls for a week
+    or a year of days.
+    """
+    import numpy as np
+    
+    rows = np.char.add('| ', days['dates'])
+    for cells in (np.char.mod('%.0f', days['scores']),
+                  np.char.mod('%.0f', days['deep_minutes']),
+                  np.char.mod('%d', days['interruptions'])):
+        rows = np.char.add(np.char.add(rows, ' | '), cells)
+    return ''.join(np.char.add(rows, ' |\n').tolist())
+
+
+def _emit_weekly_markdown(w: Callable[[str], object], trends: dict, table_rows: str, generated_at: str) -> None:
+    """Emit the weekly markdown summary through the write callable w"""
+    w(_TEMPLATES['weekly_head'].format_map(trends))
+    w(table_rows)
+    
+    # Last line carries no trailing newline
+    w(_TEMPLATES['weekly_footer'].format(generated_at=generated_at))
 
 
 def main():
@@ -244,35 +539,35 @@ def main():
                         help='Output directory (default: reports/)')
     parser.add_argument('--format', choices=['json', 'markdown', 'both'], default='both',
                         help='Output format (default: both)')
+    parser.add_argument('--pretty', action='store_true',
+                        help='Indent the JSON report (default: compact)')
     
     args = parser.parse_args()
     
     # Parse date
     if args.date:
         date = datetime.strptime(args.date, '%Y-%m-%d')
-        config = load_config()
-        tz = ZoneInfo(config['tracking']['timezone'])
+        tz = _tz(load_config()['tracking']['timezone'])
         date = date.replace(tzinfo=tz)
     else:
         date = None
     
-    # Parse output dir
-    output_dir = Path(args.output) if args.output else None
+    # Parse output dir (prepared once here for the generators)
+    output_dir = Path(args.output) if args.output else _DEFAULT_OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Generate report
+    # Generate report (one footer timestamp per run)
+    generated_at = _generated_stamp()
     if args.type == 'daily':
-        report_path = generate_daily_report(date, output_dir)
+        report_path, data = generate_daily_report(date, output_dir, generated_at, args.format, args.pretty)
     else:
-        report_path = generate_weekly_report(date, output_dir)
+        report_path, data = generate_weekly_report(date, output_dir, generated_at, args.format, args.pretty)
     
     print(f"\n✓ Report generated successfully!")
     print(f"  Location: {report_path.parent}")
     
-    # Show quick summary
+    # Show quick summary (straight from the in-memory report)
     if args.type == 'daily':
-        with open(report_path, 'r') as f:
-            data = json.load(f)
-        
         print(f"\n📊 Quick Summary:")
         print(f"  Score: {data['productivity_score']['overall_score']:.0f}/100 ({data['productivity_score']['rating']})")
         print(f"  Deep Work: {data['productivity_score']['metrics']['total_deep_minutes']:.0f}min")
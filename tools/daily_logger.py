@@ -1,15 +1,28 @@
 
+import atexit
 import json
+import mmap
 import os
+import re
 import shutil
+import sys
 import fcntl
+import threading
 import time
 import hashlib
+import itertools
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from zoneinfo import ZoneInfo
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 import logging
+from collections import Counter
+
+try:
+    import orjson  # optional: faster JSONL encoding/decoding
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
 
 # Configure logging
 logging.basicConfig(
@@ -38,12 +51,22 @@ LOG_DIR = None
 ARCHIVE_DIR = None
 BACKUP_DIR = None
 
-# Event schema for validation
-VALID_EVENT_TYPES = {
+# Log lines are handled as bytes: orjson when available, json otherwise.
+# Decode failures (bad JSON or bad UTF-8) are ValueErrors either way.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+def _json_line(obj: Dict[str, Any]) -> bytes:
+    """Encode obj as one UTF-8 JSONL line"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj) + '\n').encode('utf-8')
+
+# Event schema for validation (interned, as log_activity interns incoming types)
+VALID_EVENT_TYPES = frozenset(map(sys.intern, (
     'metadata', 'focus_change', 'app_switch', 'window_change',
     'browser_visit', 'meeting_start', 'meeting_end', 'break_start',
     'break_end', 'manual_entry', 'idle_start', 'idle_end'
-}
+)))
 
 REQUIRED_FIELDS = {
     'focus_change': ['app', 'duration_seconds'],
@@ -54,11 +77,47 @@ REQUIRED_FIELDS = {
     'meeting_end': ['name', 'duration_seconds'],
 }
 
+def _make_validator(fields: List[str]):
+    """Presence check for one event type's required fields, as a single keys-view comparison"""
+    required = frozenset(fields)
+    return lambda data: data.keys() >= required
+
+def _always_valid(data: Dict[str, Any]) -> bool:
+    return True
+
+# Specialized once at import; event types without required fields always pass
+_VALIDATORS = {event_type: _make_validator(fields) for event_type, fields in REQUIRED_FIELDS.items()}
+
 # File lock timeout and max retries will now be loaded from config
 _LOCK_TIMEOUT = 5.0 # Default value
 _MAX_RETRIES = 3 # Default value
 
+# Lock polling backs off from 1ms, doubling up to 50ms between attempts
+_LOCK_BACKOFF_START = 0.001
+_LOCK_BACKOFF_MAX = 0.05
+
+# Events are written through to the log on every call, but fsync'd in
+# batches: at most every _FSYNC_BATCH events or _FSYNC_INTERVAL seconds
+_FSYNC_BATCH = 64 # Default value
+_FSYNC_INTERVAL = 1.0 # Default value
+
 _CONFIG_CACHE = None
+_CONFIG_MTIME = None  # st_mtime_ns of config.json when _CONFIG_CACHE was loaded
+
+@dataclass(frozen=True, slots=True)
+class LoggerConfig:
+    """The settings this module reads from the config, resolved once per load"""
+    tz: ZoneInfo
+    lock_timeout: float
+    max_retries: int
+    fsync_batch: int
+    fsync_interval: float
+    daily_start_hour: int
+    daily_start_minute: int
+    coverage_start: str
+    coverage_end: str
+
+_SETTINGS: Optional[LoggerConfig] = None
 
 def _deep_merge_dicts(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
     """Recursively merge override into base (override wins)."""
@@ -71,12 +130,14 @@ def _deep_merge_dicts(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[st
 
 def load_config() -> Dict[str, Any]:
     """Load configuration with error handling and validation"""
-    global _CONFIG_CACHE, LOG_DIR, ARCHIVE_DIR, BACKUP_DIR, _LOCK_TIMEOUT, _MAX_RETRIES
+    global _CONFIG_CACHE, _CONFIG_MTIME, _SETTINGS, LOG_DIR, ARCHIVE_DIR, BACKUP_DIR, _LOCK_TIMEOUT, _MAX_RETRIES, _FSYNC_BATCH, _FSYNC_INTERVAL
 
     if _CONFIG_CACHE is not None:
         return _CONFIG_CACHE
 
     config = {}
+    # Stat before reading so an edit made mid-load is caught by the next check
+    config_mtime = _config_mtime()
     try:
         # Load example defaults first (if present), then overlay config.json.
         base_config: Dict[str, Any] = {}
@@ -134,8 +195,12 @@ def load_config() -> Dict[str, Any]:
         # Update global lock timeout and max retries
         _LOCK_TIMEOUT = config.get('tracking', {}).get('lock_timeout', _LOCK_TIMEOUT)
         _MAX_RETRIES = config.get('tracking', {}).get('max_retries', _MAX_RETRIES)
+        _FSYNC_BATCH = config.get('tracking', {}).get('fsync_batch_events', _FSYNC_BATCH)
+        _FSYNC_INTERVAL = config.get('tracking', {}).get('fsync_interval_seconds', _FSYNC_INTERVAL)
 
+        _SETTINGS = None
         _CONFIG_CACHE = config
+        _CONFIG_MTIME = config_mtime
         return config
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON in config file ({CONFIG_PATH if CONFIG_PATH.exists() else CONFIG_EXAMPLE_PATH}): {e}")
@@ -147,6 +212,53 @@ def load_config() -> Dict[str, Any]:
         logger.error(f"Failed to load config: {e}")
         raise RuntimeError(f"Failed to load configuration: {e}") from e
 
+def _config_mtime() -> Optional[int]:
+    try:
+        return CONFIG_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+
+def reload_config_if_changed() -> bool:
+    """
+    Reload the config if config.json changed on disk since it was cached
+
+    load_config() parses the file once per process, so events never pay a
+    stat or parse; long-running trackers call this at the day rollover to
+    pick up edits. Returns True if the config was reloaded.
+    """
+    global _CONFIG_CACHE
+    if _CONFIG_CACHE is None or _config_mtime() == _CONFIG_MTIME:
+        return False
+    logger.info(f"Configuration changed on disk, reloading: {CONFIG_PATH}")
+    _CONFIG_CACHE = None
+    load_config()
+    return True
+
+def get_logger_config() -> LoggerConfig:
+    """
+    Config-derived settings as one frozen object, built on first use after each load
+
+    Hot paths read plain attributes (cfg.tz) instead of walking nested
+    config.get() chains and constructing a ZoneInfo on every call.
+    """
+    global _SETTINGS
+    if _SETTINGS is None:
+        config = load_config()
+        tracking = config.get('tracking', {})
+        report = config.get('report', {})
+        _SETTINGS = LoggerConfig(
+            tz=ZoneInfo(tracking.get('timezone', 'America/Chicago')),
+            lock_timeout=_LOCK_TIMEOUT,
+            max_retries=_MAX_RETRIES,
+            fsync_batch=_FSYNC_BATCH,
+            fsync_interval=_FSYNC_INTERVAL,
+            daily_start_hour=tracking.get('daily_start_hour', 6),
+            daily_start_minute=tracking.get('daily_start_minute', 0),
+            coverage_start=report.get('coverage_start', '05:00'),
+            coverage_end=report.get('coverage_end', '23:59'),
+        )
+    return _SETTINGS
+
 def ensure_directories():
     """Create necessary directories with error handling"""
     # Ensure load_config has run to set LOG_DIR, ARCHIVE_DIR, BACKUP_DIR
@@ -177,63 +289,147 @@ def get_current_date(tz_name='America/Chicago') -> datetime:
         logger.error(f"Timezone error, falling back to UTC: {e}")
         return datetime.now(ZoneInfo('UTC'))
 
+# (log dir, day ordinal, path) of the last log path built: every event of a
+# day maps to the same Path, so it is formatted and allocated once per day
+_LAST_LOG_PATH = (None, None, None)
+
 def get_log_path(date) -> Path:
     """Get path to today's activity log"""
+    global _LAST_LOG_PATH
     # Ensure LOG_DIR is set
     if LOG_DIR is None:
         load_config()
-    return LOG_DIR / f"{date.strftime('%Y-%m-%d')}.jsonl"
-
-def get_lock_path(log_path: Path) -> Path:
-    """Get path to lock file for a log"""
-    return log_path.with_suffix('.lock')
-
-def acquire_file_lock(lock_path: Path, timeout: float = _LOCK_TIMEOUT) -> Optional[int]:
-    """Acquire exclusive lock on log file"""
+    log_dir, day, path = _LAST_LOG_PATH
+    if day != date.toordinal() or log_dir is not LOG_DIR:
+        path = LOG_DIR / f"{date.strftime('%Y-%m-%d')}.jsonl"
+        _LAST_LOG_PATH = (LOG_DIR, date.toordinal(), path)
+    return path
+
+def acquire_file_lock(lock_fd: int, timeout: Optional[float] = None) -> bool:
+    """Acquire an exclusive flock on an open log file descriptor"""
+    timeout = get_logger_config().lock_timeout if timeout is None else timeout
     try:
-        lock_fd = os.open(lock_path, os.O_CREAT | os.O_WRONLY)
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
+        delay = _LOCK_BACKOFF_START
 
-        while time.time() - start_time < timeout:
+        # Uncontended locks succeed on the first try; otherwise back off
+        # exponentially so short waits stay short and long ones don't spin
+        while True:
             try:
                 fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-                logger.debug(f"Lock acquired: {lock_path}")
-                return lock_fd
+                return True
             except BlockingIOError:
-                time.sleep(0.1)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, _LOCK_BACKOFF_MAX)
 
-        logger.warning(f"Lock timeout after {timeout}s: {lock_path}")
-        os.close(lock_fd)
-        return None
+        logger.warning(f"Lock timeout after {timeout}s on fd {lock_fd}")
+        return False
     except Exception as e:
         logger.error(f"Failed to acquire lock: {e}")
-        return None
+        return False
 
-def release_file_lock(lock_fd: int, lock_path: Path):
-    """Release file lock"""
+def release_file_lock(lock_fd: int):
+    """Release a flock taken with acquire_file_lock"""
     try:
         fcntl.flock(lock_fd, fcntl.LOCK_UN)
-        os.close(lock_fd)
-        if lock_path.exists():
-            lock_path.unlink()
-        logger.debug(f"Lock released: {lock_path}")
     except Exception as e:
         logger.error(f"Failed to release lock: {e}")
 
+@dataclass
+class _LogHandle:
+    """Append-mode descriptor on one day's log, kept open across events, and its fsync state"""
+    path: Path
+    fd: int
+    unsynced: int = 0
+    last_sync: float = field(default_factory=time.monotonic)
+
+# Open log handles by log path; _HANDLES_LOCK also serializes writes to them
+_LOG_HANDLES: Dict[Path, _LogHandle] = {}
+# Logs known to exist with their metadata header, so log_activity can skip
+# the per-event existence check (cleared with the log's handle)
+_INITIALIZED_LOGS = set()
+_HANDLES_LOCK = threading.RLock()
+
+def _get_log_handle(log_path: Path) -> _LogHandle:
+    """Return the cached append handle for log_path, opening (creating) it on first use"""
+    handle = _LOG_HANDLES.get(log_path)
+    if handle is None:
+        fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        handle = _LOG_HANDLES[log_path] = _LogHandle(log_path, fd)
+    return handle
+
+def _lock_log_handle(log_path: Path) -> Optional[_LogHandle]:
+    """
+    Cached handle for log_path with its flock held, or None on lock timeout
+
+    The lock is taken on the log itself, per write, so other processes
+    appending to the same day interleave whole events. A handle whose file
+    was unlinked or replaced meanwhile (e.g. by a repair) is reopened; the
+    check is by inode, as an archived day keeps a hard link to the old file.
+    Call with _HANDLES_LOCK held.
+    """
+    while True:
+        handle = _get_log_handle(log_path)
+        if not acquire_file_lock(handle.fd):
+            return None
+        opened = os.fstat(handle.fd)
+        try:
+            current = os.stat(log_path)
+        except FileNotFoundError:
+            current = None
+        if current is not None and (current.st_dev, current.st_ino) == (opened.st_dev, opened.st_ino):
+            return handle
+        release_file_lock(handle.fd)
+        close_log_handle(log_path)
+
+def _sync_handle(handle: _LogHandle):
+    """fsync any events written through handle since its last sync"""
+    if handle.unsynced:
+        os.fsync(handle.fd)
+        handle.unsynced = 0
+    handle.last_sync = time.monotonic()
+
+def close_log_handle(log_path: Path):
+    """fsync and close the cached handle for log_path, if one is open"""
+    with _HANDLES_LOCK:
+        _INITIALIZED_LOGS.discard(log_path)
+        handle = _LOG_HANDLES.pop(log_path, None)
+        if handle is None:
+            return
+        try:
+            _sync_handle(handle)
+        except Exception as e:
+            logger.error(f"Failed to sync {log_path}: {e}")
+        finally:
+            os.close(handle.fd)
+
+def flush_logs():
+    """fsync and close every cached log handle (run at interpreter exit)"""
+    with _HANDLES_LOCK:
+        for log_path in list(_LOG_HANDLES):
+            close_log_handle(log_path)
+
+atexit.register(flush_logs)
+
 def validate_event_data(event_type: str, data: Dict[str, Any]) -> bool:
     """Validate event data against schema"""
     if event_type not in VALID_EVENT_TYPES:
         logger.warning(f"Unknown event type: {event_type}")
         return False
 
-    if event_type in REQUIRED_FIELDS:
-        required = REQUIRED_FIELDS[event_type]
-        for field in required:
-            if field not in data:
-                logger.warning(f"Missing required field '{field}' for event type '{event_type}'")
-                return False
+    if _VALIDATORS.get(event_type, _always_valid)(data):
+        return True
 
-    return True
+    # Slow path: name the first missing field
+    missing = next(field for field in REQUIRED_FIELDS[event_type] if field not in data)
+    logger.warning(f"Missing required field '{missing}' for event type '{event_type}'")
+    return False
+
+# Per-process sequence keeping same-second backup names distinct
+_BACKUP_SEQ = itertools.count()
 
 def create_backup(file_path: Path) -> Optional[Path]:
     """Create backup of log file before modifications"""
@@ -245,8 +441,8 @@ def create_backup(file_path: Path) -> Optional[Path]:
         if not file_path.exists():
             return None
 
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_path = BACKUP_DIR / f"{file_path.stem}_{timestamp}.jsonl"
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+        backup_path = BACKUP_DIR / f"{file_path.stem}_{timestamp}_{os.getpid()}_{next(_BACKUP_SEQ)}.jsonl"
         shutil.copy2(file_path, backup_path)
         logger.info(f"Backup created: {backup_path}")
         return backup_path
@@ -254,20 +450,55 @@ def create_backup(file_path: Path) -> Optional[Path]:
         logger.error(f"Failed to create backup: {e}")
         return None
 
+def _fast_jsonl_check(data: bytes) -> bool:
+    """
+    Cheap structural check that data is well-formed JSONL as this module writes it
+
+    Every line must start with '{' and end with '}', braces must balance and
+    there must be no NUL bytes (zero-filled blocks after a crash). Brace
+    counts only mean something outside strings, so every brace must also sit
+    where the encoders put structural ones: '{' before '"' or '}' and never
+    after '"', '}' before a newline, ',', '}' or ']'. Braces inside strings
+    almost always break that and fall through to the full parse; it takes
+    contrived strings (one ending in '{', another holding '},') to slip past.
+    Blank lines fail too. These are C-level byte counts, not a parse, aimed
+    at the damage a crash or a torn append leaves; a failure only means
+    "parse line by line to be sure".
+    """
+    if not data:
+        return True
+    lines = data.count(b'\n') + (not data.endswith(b'\n'))
+    opening = data.count(b'{')
+    if not (data.count(b'\n{') + data.startswith(b'{') == lines
+            and data.count(b'}\n') + data.endswith(b'}') == lines
+            and data.count(b'}') == opening
+            and b'"{' not in data
+            and b'\x00' not in data
+            and data.count(b'{"') + data.count(b'{}') == opening):
+        return False
+    # Runs like '}}}' overlap, which count() can't see; a NUL marker after
+    # each '}' (there are none in data by now) makes every follower countable
+    marked = data.replace(b'}', b'}\x00')
+    return (marked.count(b'\x00\n') + marked.count(b'\x00,') + marked.count(b'\x00}')
+            + marked.count(b'\x00]') + marked.endswith(b'\x00')) == opening
+
 def verify_log_integrity(log_path: Path) -> bool:
-    """Verify log file is valid JSONL"""
+    """Verify log file is valid JSONL (full parse only if the quick structural check fails)"""
     if not log_path.exists():
         return True  # Empty/new file is valid
 
     try:
-        with open(log_path, 'r') as f:
+        if _fast_jsonl_check(log_path.read_bytes()):
+            return True
+
+        with open(log_path, 'rb') as f:
             line_num = 0
             for line in f:
                 line_num += 1
                 if line.strip():  # Skip empty lines
                     try:
-                        json.loads(line)
-                    except json.JSONDecodeError as e:
+                        _json_loads(line)
+                    except ValueError as e:
                         logger.error(f"Corrupt line {line_num} in {log_path}: {e}")
                         return False
         return True
@@ -276,35 +507,60 @@ def verify_log_integrity(log_path: Path) -> bool:
         return False
 
 def repair_log_file(log_path: Path) -> bool:
-    """Attempt to repair corrupted log file"""
+    """
+    Attempt to repair corrupted log file
+
+    The valid lines are written to a temp file which then atomically replaces
+    the log, so a crash mid-repair never leaves it truncated (and archive
+    hard links to the old file keep the original). The log's flock is held
+    throughout so no append lands in between; writers holding the old file
+    reopen it on their next event.
+    """
     try:
-        backup_path = create_backup(log_path)
-        if not backup_path:
-            return False
-
-        valid_lines = []
-        with open(backup_path, 'r') as f:
-            for line_num, line in enumerate(f, 1):
-                if line.strip():
-                    try:
-                        json.loads(line)
-                        valid_lines.append(line)
-                    except json.JSONDecodeError:
-                        logger.warning(f"Skipping corrupt line {line_num}")
-
-        with open(log_path, 'w') as f:
-            f.writelines(valid_lines)
-
-        logger.info(f"Repaired {log_path}: kept {len(valid_lines)} valid lines")
+        with _HANDLES_LOCK:
+            handle = _lock_log_handle(log_path)
+            if handle is None:
+                logger.error(f"Failed to acquire lock to repair {log_path}")
+                return False
+            try:
+                backup_path = create_backup(log_path)
+                if not backup_path:
+                    return False
+
+                # Stream valid lines straight from the backup into the temp file
+                kept = 0
+                tmp_path = log_path.with_suffix('.jsonl.tmp')
+                with open(backup_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+                    for line_num, line in enumerate(src, 1):
+                        if line.strip():
+                            try:
+                                _json_loads(line)
+                            except ValueError:
+                                logger.warning(f"Skipping corrupt line {line_num}")
+                                continue
+                            dst.write(line if line.endswith(b'\n') else line + b'\n')
+                            kept += 1
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.replace(tmp_path, log_path)
+            finally:
+                release_file_lock(handle.fd)
+                close_log_handle(log_path)
+
+        logger.info(f"Repaired {log_path}: kept {kept} valid lines")
         return True
     except Exception as e:
         logger.error(f"Failed to repair log file: {e}")
         return False
 
 def initialize_daily_log(date, config) -> Optional[Dict[str, Any]]:
-    """Create a new daily log file with metadata (with error handling and locking)"""
+    """
+    Create a new daily log file with metadata (with error handling and locking)
+
+    The metadata settings come from get_logger_config(); config is kept for
+    existing callers, which all pass load_config().
+    """
     log_path = get_log_path(date)
-    lock_path = get_lock_path(log_path)
 
     if log_path.exists():
         # Verify existing log integrity
@@ -317,119 +573,245 @@ def initialize_daily_log(date, config) -> Optional[Dict[str, Any]]:
                 return None
         return None
 
-    lock_fd = acquire_file_lock(lock_path)
-    if lock_fd is None:
-        logger.error(f"Failed to acquire lock for {log_path}")
-        return None
+    with _HANDLES_LOCK:
+        handle = _lock_log_handle(log_path)
+        if handle is None:
+            logger.error(f"Failed to acquire lock for {log_path}")
+            return None
+        try:
+            return _write_metadata(handle, date)
+        finally:
+            release_file_lock(handle.fd)
 
+def _write_metadata(handle: _LogHandle, date) -> Optional[Dict[str, Any]]:
+    """Write the metadata header to a freshly created log (handle locked)"""
     try:
-        start_hour = config.get('tracking', {}).get('daily_start_hour', 6)
-        start_min = config.get('tracking', {}).get('daily_start_minute', 0)
-        tz = ZoneInfo(config.get('tracking', {}).get('timezone', 'America/Chicago'))
+        if os.fstat(handle.fd).st_size:
+            return None  # Another writer initialized it first
+
+        cfg = get_logger_config()
 
         # Create start timestamp for today at daily_start_hour
-        start_time = date.replace(hour=start_hour, minute=start_min, second=0, microsecond=0)
+        start_time = date.replace(hour=cfg.daily_start_hour, minute=cfg.daily_start_minute,
+                                  second=0, microsecond=0)
 
         metadata = {
             'date': date.strftime('%Y-%m-%d'),
             'start_time': start_time.isoformat(),
-            'timezone': config.get('tracking', {}).get('timezone', 'America/Chicago'),
-            'coverage_start': config.get('report', {}).get('coverage_start', '05:00'),
-            'coverage_end': config.get('report', {}).get('coverage_end', '23:59'),
-            'initialized_at': datetime.now(tz).isoformat(),
+            'timezone': cfg.tz.key,
+            'coverage_start': cfg.coverage_start,
+            'coverage_end': cfg.coverage_end,
+            'initialized_at': datetime.now(cfg.tz).isoformat(),
             'version': '2.0'
         }
 
-        with open(log_path, 'w') as f:
-            f.write(json.dumps({'type': 'metadata', 'data': metadata}) + '\n')
+        os.write(handle.fd, _json_line({'type': 'metadata', 'data': metadata}))
+        handle.unsynced += 1
 
-        logger.info(f"Initialized daily log: {log_path}")
+        logger.info(f"Initialized daily log: {handle.path}")
         return metadata
     except Exception as e:
         logger.error(f"Failed to initialize log: {e}")
         return None
-    finally:
-        release_file_lock(lock_fd, lock_path)
 
-def log_activity(event_type: str, data: Dict[str, Any], retry_count: int = 0) -> bool:
-    """Append an activity event to today's log (with validation, locking, and retries)"""
-    if retry_count >= _MAX_RETRIES:
-        logger.error(f"Max retries exceeded for event type: {event_type}")
-        return False
+def _ensure_log_initialized(log_path: Path, date):
+    """Make sure log_path exists with its metadata header (checked once per log, not per event)"""
+    if log_path not in _INITIALIZED_LOGS:
+        if not log_path.exists():
+            logger.warning(f"Log file doesn't exist, initializing: {log_path}")
+            initialize_daily_log(date, load_config())
+        if log_path.exists():
+            _INITIALIZED_LOGS.add(log_path)
+
+# Most buffers one writev() call accepts
+try:
+    _IOV_MAX = max(os.sysconf('SC_IOV_MAX'), 16)
+except (AttributeError, OSError, ValueError):  # pragma: no cover
+    _IOV_MAX = 1024
+
+def _write_lines(fd: int, lines: List[bytes]):
+    """Write encoded lines to fd with as few writev() calls as possible, finishing short writes"""
+    for start in range(0, len(lines), _IOV_MAX):
+        batch = lines[start:start + _IOV_MAX]
+        if hasattr(os, 'writev'):
+            written = os.writev(fd, batch)
+            if written == sum(map(len, batch)):
+                continue
+            rest = memoryview(b''.join(batch))[written:]
+        else:  # pragma: no cover - no writev on Windows
+            rest = memoryview(b''.join(batch))
+        while rest:
+            rest = rest[os.write(fd, rest):]
+
+def _append_lines(log_path: Path, lines: List[bytes], cfg: LoggerConfig, durable: bool) -> bool:
+    """
+    Append encoded lines to log_path under one flock, fsyncing once per batch
+
+    Returns False if the lock could not be taken; write errors propagate.
+    A write that fails partway (e.g. ENOSPC after a short write) is truncated
+    back off before the lock is released, so no torn line is left for the
+    next append to fuse onto.
+    """
+    with _HANDLES_LOCK:
+        handle = _lock_log_handle(log_path)
+        if handle is None:
+            return False
+        try:
+            start = os.lseek(handle.fd, 0, os.SEEK_END)
+            try:
+                _write_lines(handle.fd, lines)
+            except BaseException:
+                try:
+                    os.ftruncate(handle.fd, start)
+                except OSError as e:
+                    logger.error(f"Failed to roll back partial write to {log_path}: {e}")
+                raise
+            handle.unsynced += len(lines)
+            if (durable or handle.unsynced >= cfg.fsync_batch
+                    or time.monotonic() - handle.last_sync >= cfg.fsync_interval):
+                _sync_handle(handle)
+            return True
+        finally:
+            release_file_lock(handle.fd)
+
+def log_activity(event_type: str, data: Dict[str, Any], retry_count: int = 0,
+                 durable: bool = False) -> bool:
+    """
+    Append an activity event to today's log (with validation, locking, and retries)
 
+    The event is written through to the log before returning; it is fsync'd
+    with the next batch unless durable is set, which syncs it immediately.
+    """
     try:
+        cfg = get_logger_config()
+        if retry_count >= cfg.max_retries:
+            logger.error(f"Max retries exceeded for event type: {event_type}")
+            return False
+
+        # Interned types make the set/dict lookups below identity hits
+        event_type = sys.intern(event_type)
+
         # Validate event data
         if not validate_event_data(event_type, data):
             logger.error(f"Invalid event data for type '{event_type}'")
             return False
 
-        config = load_config()
-        tz = ZoneInfo(config.get('tracking', {}).get('timezone', 'America/Chicago'))
-        now = datetime.now(tz)
+        now = datetime.now(cfg.tz)
         log_path = get_log_path(now)
-        lock_path = get_lock_path(log_path)
 
-        # Ensure log file exists
-        if not log_path.exists():
-            logger.warning(f"Log file doesn't exist, initializing: {log_path}")
-            initialize_daily_log(now, config)
+        _ensure_log_initialized(log_path, now)
 
-        # Acquire lock
-        lock_fd = acquire_file_lock(lock_path, timeout=_LOCK_TIMEOUT)
-        if lock_fd is None:
-            logger.warning(f"Lock acquisition failed, retrying ({retry_count + 1}/{_MAX_RETRIES})")
-            time.sleep(0.5)
-            return log_activity(event_type, data, retry_count + 1)
+        event = {
+            'type': event_type,
+            'timestamp': now.isoformat(),
+            'data': data
+        }
 
         try:
-            event = {
-                'type': event_type,
-                'timestamp': now.isoformat(),
-                'data': data
-            }
-
-            # Atomic write with error recovery
-            with open(log_path, 'a') as f:
-                f.write(json.dumps(event) + '\n')
-                f.flush()
-                os.fsync(f.fileno())  # Ensure write to disk
-
-            logger.debug(f"Logged event: {event_type}")
-            return True
+            if _append_lines(log_path, [_json_line(event)], cfg, durable):
+                logger.debug(f"Logged event: {event_type}")
+                return True
         except Exception as e:
+            # _append_lines truncates a partial write away under the lock;
+            # report the failure and let the caller retry
             logger.error(f"Failed to write event: {e}")
-            # Attempt to verify and repair if needed
-            if not verify_log_integrity(log_path):
-                repair_log_file(log_path)
             return False
-        finally:
-            release_file_lock(lock_fd, lock_path)
+
+        logger.warning(f"Lock acquisition failed, retrying ({retry_count + 1}/{cfg.max_retries})")
+        time.sleep(0.5)
+        return log_activity(event_type, data, retry_count + 1, durable)
     except Exception as e:
         logger.error(f"Unexpected error in log_activity: {e}")
         return False
 
+def log_activities_bulk(events: Iterable[Tuple[str, datetime, Dict[str, Any]]],
+                        durable: bool = False) -> int:
+    """
+    Append a burst of (event_type, timestamp, data) events, e.g. a flushed queue
+
+    Events are validated and encoded up front, grouped by the day their
+    timestamp falls on, and each day's lines go out under one flock in a
+    single writev() instead of one locked write (and fsync) per event.
+    Invalid events are skipped. Returns the number of events logged.
+
+    Collectors that see bursts can buffer (event_type, timestamp, data)
+    tuples and flush them here periodically; log_activity is the one-event
+    case of the same append path.
+    """
+    try:
+        cfg = get_logger_config()
+        lines_by_log: Dict[Path, List[bytes]] = {}
+        days: Dict[Path, datetime] = {}
+        for event_type, timestamp, data in events:
+            event_type = sys.intern(event_type)
+            if not validate_event_data(event_type, data):
+                logger.error(f"Invalid event data for type '{event_type}'")
+                continue
+            timestamp = timestamp.astimezone(cfg.tz) if timestamp.tzinfo else timestamp.replace(tzinfo=cfg.tz)
+            log_path = get_log_path(timestamp)
+            lines = lines_by_log.get(log_path)
+            if lines is None:
+                lines = lines_by_log[log_path] = []
+                days[log_path] = timestamp
+            lines.append(_json_line({'type': event_type, 'timestamp': timestamp.isoformat(), 'data': data}))
+    except Exception as e:
+        logger.error(f"Unexpected error in log_activities_bulk: {e}")
+        return 0
+
+    logged = 0
+    for log_path, lines in lines_by_log.items():
+        try:
+            _ensure_log_initialized(log_path, days[log_path])
+            for attempt in range(cfg.max_retries):
+                if _append_lines(log_path, lines, cfg, durable):
+                    logged += len(lines)
+                    break
+                logger.warning(f"Lock acquisition failed, retrying ({attempt + 1}/{cfg.max_retries})")
+                time.sleep(0.5)
+            else:
+                logger.error(f"Max retries exceeded; dropped {len(lines)} events for {log_path}")
+        except Exception as e:
+            logger.error(f"Failed to write {len(lines)} events to {log_path}: {e}")
+    return logged
+
+def _archive_file(src: Path, dest: Path):
+    """
+    Put src at dest as a hard link, replacing any older dest
+
+    Linking is a metadata-only operation; a plain copy is only made when
+    linking isn't possible (e.g. the archive is on another filesystem).
+    """
+    try:
+        os.link(src, dest)
+        return
+    except FileExistsError:
+        if os.path.samefile(src, dest):
+            return
+        dest.unlink()
+        try:
+            os.link(src, dest)
+            return
+        except OSError:
+            pass
+    except OSError:
+        pass
+    shutil.copy2(src, dest)
+
 def midnight_reset() -> bool:
     """Archive yesterday's log and prepare for new day (with error handling)"""
     try:
+        reload_config_if_changed()
         config = load_config()
-        tz = ZoneInfo(config.get('tracking', {}).get('timezone', 'America/Chicago'))
-        now = datetime.now(tz)
+        now = datetime.now(get_logger_config().tz)
         yesterday = now - timedelta(days=1)
 
-        # Archive yesterday's log with verification
+        # Archive yesterday's log as-is; corrupt lines are dealt with when it is read
         yesterday_log = get_log_path(yesterday)
+        close_log_handle(yesterday_log)  # Sync its last batch; no more writes
         if yesterday_log.exists():
-            # Verify integrity before archiving
-            if not verify_log_integrity(yesterday_log):
-                logger.warning("Yesterday's log is corrupted, attempting repair")
-                if not repair_log_file(yesterday_log):
-                    logger.error("Failed to repair yesterday's log")
-                    # Create backup of corrupted file
-                    create_backup(yesterday_log)
-
             archive_path = ARCHIVE_DIR / f"{yesterday.strftime('%Y-%m-%d')}.jsonl"
             try:
-                shutil.copy2(yesterday_log, archive_path)
+                _archive_file(yesterday_log, archive_path)
                 logger.info(f"Archived: {yesterday_log} -> {archive_path}")
             except Exception as e:
                 logger.error(f"Failed to archive log: {e}")
@@ -450,34 +832,39 @@ def midnight_reset() -> bool:
         logger.error(f"Midnight reset failed: {e}")
         return False
 
+# Daily log file names; ISO dates order the same as strings
+_LOG_NAME_RE = re.compile(r'\d{4}-\d{2}-\d{2}\.jsonl')
+
 def cleanup_old_logs(config) -> int:
     """Remove logs older than retention period (with error handling)"""
     try:
         retention_days = config.get('retention', {}).get('keep_daily_logs_days', 30)
-        tz = ZoneInfo(config.get('tracking', {}).get('timezone', 'America/Chicago'))
-        cutoff_date = datetime.now(tz) - timedelta(days=retention_days)
+        cutoff_date = datetime.now(get_logger_config().tz) - timedelta(days=retention_days)
+        # A day's log expires once its midnight is before the cutoff instant,
+        # i.e. its date is on or before the cutoff date
+        cutoff_name = cutoff_date.strftime('%Y-%m-%d.jsonl')
 
         removed_count = 0
         if LOG_DIR is None:
             load_config()
-        for log_file in LOG_DIR.glob('*.jsonl'):
+        with os.scandir(LOG_DIR) as entries:
+            log_files = [LOG_DIR / entry.name for entry in entries
+                         if entry.name <= cutoff_name and _LOG_NAME_RE.fullmatch(entry.name)]
+        for log_file in log_files:
             try:
-                file_date = datetime.strptime(log_file.stem, '%Y-%m-%d')
-                if file_date.replace(tzinfo=tz) < cutoff_date:
-                    # Archive before deletion if not already archived
-                    archive_path = ARCHIVE_DIR / log_file.name
-                    if not archive_path.exists():
-                        try:
-                            shutil.copy2(log_file, archive_path)
-                            logger.info(f"Archived before cleanup: {log_file}")
-                        except Exception as e:
-                            logger.warning(f"Failed to archive {log_file}: {e}")
-
-                    log_file.unlink()
-                    removed_count += 1
-                    logger.info(f"Removed old log: {log_file}")
-            except ValueError:
-                logger.debug(f"Skipping non-date file: {log_file}")
+                # Archive before deletion if not already archived
+                archive_path = ARCHIVE_DIR / log_file.name
+                if not archive_path.exists():
+                    try:
+                        _archive_file(log_file, archive_path)
+                        logger.info(f"Archived before cleanup: {log_file}")
+                    except Exception as e:
+                        logger.warning(f"Failed to archive {log_file}: {e}")
+
+                close_log_handle(log_file)
+                log_file.unlink()
+                removed_count += 1
+                logger.info(f"Removed old log: {log_file}")
             except Exception as e:
                 logger.error(f"Failed to cleanup {log_file}: {e}")
 
@@ -487,69 +874,97 @@ def cleanup_old_logs(config) -> int:
         logger.error(f"Cleanup failed: {e}")
         return 0
 
+def _iter_log_events(log_path: Path, corrupt_lines: List[int]) -> Iterator[Dict[str, Any]]:
+    """
+    Decode the events of a JSONL log in one pass over the mapped file
+
+    Blank lines are skipped; the numbers of lines that fail to decode are
+    appended to corrupt_lines instead, so callers find corruption while
+    reading rather than by scanning the file beforehand.
+    """
+    with open(log_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        # Scan the mapped file for newlines and decode each line's bytes
+        # directly, with no buffered reader or str decode in between
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            pos = 0
+            line_num = 0
+            while pos < size:
+                nl = mm.find(b'\n', pos)
+                if nl < 0:
+                    nl = size
+                line = mm[pos:nl]
+                pos = nl + 1
+                line_num += 1
+                if not line.strip():
+                    continue
+                try:
+                    yield _json_loads(line)
+                except ValueError as e:
+                    corrupt_lines.append(line_num)
+                    logger.warning(f"Skipping corrupt line {line_num}: {e}")
+
+def _repair_corrupt_log(log_path: Path, corrupt_lines: List[int]):
+    """Repair a log whose read turned up corrupt lines (the read already skipped them)"""
+    logger.warning(f"Skipped {len(corrupt_lines)} corrupted lines in {log_path}")
+    if repair_log_file(log_path):
+        logger.info(f"Corrupt lines removed from {log_path}")
+    else:
+        logger.error(f"Failed to repair {log_path}")
+
 def read_daily_log(date) -> List[Dict[str, Any]]:
-    """Read and parse a daily activity log (with error handling)"""
+    """Read and parse a daily activity log, repairing it if corrupt lines turn up"""
     log_path = get_log_path(date)
 
     if not log_path.exists():
         logger.debug(f"Log file not found: {log_path}")
         return []
 
-    # Verify integrity before reading
-    if not verify_log_integrity(log_path):
-        logger.warning(f"Corrupted log detected: {log_path}")
-        if repair_log_file(log_path):
-            logger.info("Log repaired, proceeding with read")
-        else:
-            logger.error("Failed to repair log, returning partial data")
-
-    events = []
-    corrupted_lines = 0
-
+    corrupt_lines: List[int] = []
     try:
-        with open(log_path, 'r') as f:
-            for line_num, line in enumerate(f, 1):
-                if not line.strip():
-                    continue
-                try:
-                    events.append(json.loads(line))
-                except json.JSONDecodeError as e:
-                    corrupted_lines += 1
-                    logger.warning(f"Skipping corrupt line {line_num}: {e}")
-
-        if corrupted_lines > 0:
-            logger.warning(f"Skipped {corrupted_lines} corrupted lines in {log_path}")
-
-        return events
+        events = list(_iter_log_events(log_path, corrupt_lines))
     except Exception as e:
         logger.error(f"Failed to read log file: {e}")
         return []
 
+    if corrupt_lines:
+        _repair_corrupt_log(log_path, corrupt_lines)
+    return events
+
 def generate_summary(date) -> Optional[Dict[str, Any]]:
-    """Generate a summary from the daily log (with error handling)"""
+    """Generate a summary from the daily log, decoding and tallying it in a single pass"""
     try:
-        events = read_daily_log(date)
-
-        if not events:
+        log_path = get_log_path(date)
+        if not log_path.exists():
             logger.info(f"No events found for {date}")
             return None
 
         metadata = None
         activities = []
-        event_types = {}
+        activity_types = []
+        corrupt_lines: List[int] = []
 
-        for event in events:
+        for event in _iter_log_events(log_path, corrupt_lines):
             event_type = event.get('type')
             if event_type == 'metadata':
                 metadata = event.get('data', {})
             else:
                 activities.append(event)
-                event_types[event_type] = event_types.get(event_type, 0) + 1
+                activity_types.append(event_type)
+
+        if corrupt_lines:
+            _repair_corrupt_log(log_path, corrupt_lines)
+
+        if metadata is None and not activities:
+            logger.info(f"No events found for {date}")
+            return None
 
         return {
             'metadata': metadata,
             'total_events': len(activities),
-            'event_types': event_types,
+            'event_types': dict(Counter(activity_types)),  # Counter tallies in C
             'activities': activities,
             'date': date.strftime('%Y-%m-%d')
         }
@@ -561,9 +976,9 @@ def health_check() -> Dict[str, Any]:
     """Perform system health check"""
     try:
         config = load_config()
-        tz = ZoneInfo(config.get('tracking', {}).get('timezone', 'America/Chicago'))
-        now = datetime.now(tz)
+        now = datetime.now(get_logger_config().tz)
         log_path = get_log_path(now)
+        log_exists = log_path.exists()
 
         return {
             'status': 'healthy',
@@ -573,9 +988,9 @@ def health_check() -> Dict[str, Any]:
                 ARCHIVE_DIR and ARCHIVE_DIR.exists(),
                 BACKUP_DIR and BACKUP_DIR.exists()
             ]),
-            'current_log_exists': log_path.exists(),
-            'current_log_valid': verify_log_integrity(log_path) if log_path.exists() else None,
-            'timezone': config.get('tracking', {}).get('timezone', 'America/Chicago'),
+            'current_log_exists': log_exists,
+            'current_log_valid': verify_log_integrity(log_path) if log_exists else None,
+            'timezone': now.tzinfo.key,
             'current_time': now.isoformat()
         }
     except Exception as e:
@@ -589,8 +1004,8 @@ def main():
     try:
         ensure_directories()
         config = load_config()
-        tz = ZoneInfo(config.get('tracking', {}).get('timezone', 'America/Chicago'))
-        now = datetime.now(tz)
+        cfg = get_logger_config()
+        now = datetime.now(cfg.tz)
 
         # Run health check
         health = health_check()
@@ -614,7 +1029,7 @@ def main():
             logger.error("Failed to log example event")
 
         print(f"Daily log system ready. Current log: {get_log_path(now)}")
-        print(f"Tracking starts at {config.get('tracking', {}).get('daily_start_hour', 6):02d}:{config.get('tracking', {}).get('daily_start_minute', 0):02d}")
+        print(f"Tracking starts at {cfg.daily_start_hour:02d}:{cfg.daily_start_minute:02d}")
         print(f"System health: {health['status']}")
 
     except Exception as e:
@@ -1,11 +1,22 @@
 #!/usr/bin/env python3
 """Generate CSV exports and charts from ActivityReport JSON or JSONL logs."""
 import json
+import os
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 import csv
+import functools
+import heapq
+
+try:
+    import orjson  # optional: native JSON decoder for large JSONL logs
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+# orjson.loads takes the raw line bytes; its JSONDecodeError subclasses ValueError
+_loads = orjson.loads if orjson is not None else json.loads
 
 BASE = Path(__file__).resolve().parents[1]
 # Try to read from JSONL log first, fallback to JSON
@@ -91,6 +102,57 @@ def _get_domain_mapping(config: dict) -> dict[str, str]:
     return out
 
 
+def _build_categorizer(config: dict | None):
+    """
+    Compile the config's category and domain mappings once into categorize(event)
+
+    The app mapping is flattened to lowercased (keyword, category) pairs in
+    mapping order, so each event costs one lower() and a scan of plain
+    substring tests, not a rebuild and re-lowering of both mappings.
+    A day has a few dozen distinct apps and URLs over thousands of events,
+    so both lookups are memoized per build and repeats are dict hits.
+    """
+    config = config or {}
+    keywords = tuple(
+        (mapped.lower(), category)
+        for category, apps in _get_category_mapping(config).items()
+        for mapped in apps
+        if mapped
+    )
+    domain_mapping = _get_domain_mapping(config)
+
+    @functools.lru_cache(maxsize=None)
+    def app_category(app: str) -> str | None:
+        app_lower = app.lower()
+        for keyword, category in keywords:
+            if keyword in app_lower:
+                return category
+        return None
+
+    @functools.lru_cache(maxsize=4096)
+    def url_category(url: str) -> str | None:
+        domain = _extract_domain(url)
+        return domain_mapping.get(domain) if domain else None
+
+    def categorize(event: dict) -> str:
+        app = str(event.get('app', '') or '')
+
+        category = app_category(app)
+        if category is not None:
+            return category
+
+        # Domain mapping has priority for browser activity
+        if domain_mapping:
+            url = (event.get('data') or {}).get('url') if isinstance(event.get('data'), dict) else None
+            category = url_category(str(url or ''))
+            if category is not None:
+                return category
+
+        return categorize_app(app)
+
+    return categorize
+
+
 def categorize_event(event: dict, config: dict | None = None) -> str:
     """
     Categorize a raw activity event.
@@ -98,31 +160,21 @@ def categorize_event(event: dict, config: dict | None = None) -> str:
       - app-based mapping (analytics.category_mapping)
       - domain-based mapping (analytics.domain_mapping) for browser URLs
       - fallback heuristics via categorize_app()
-    """
-    app = str(event.get('app', '') or '')
-    app_lower = app.lower()
-
-    config = config or {}
-    category_mapping = _get_category_mapping(config)
-    for category, apps in category_mapping.items():
-        for mapped in apps:
-            if mapped and mapped.lower() in app_lower:
-                return category
-
-    # Domain mapping has priority for browser activity
-    url = (event.get('data') or {}).get('url') if isinstance(event.get('data'), dict) else None
-    domain = _extract_domain(str(url or ''))
-    domain_mapping = _get_domain_mapping(config)
-    if domain and domain in domain_mapping:
-        return domain_mapping[domain]
 
-    return categorize_app(app)
+    Categorizing many events with one config? Build the categorizer once
+    with _build_categorizer(config) instead.
+    """
+    return _build_categorizer(config)(event)
 
 
 def _sweep_timeline(intervals: list[tuple[datetime, datetime, str, str]], category_priority: list[str]):
     """
     Convert possibly-overlapping intervals into a timeline with priority-based attribution.
     Returns: list of (start, end, category, label/app)
+
+    Active intervals sit in a heap keyed (priority, -start, arrival), so the
+    winner at each boundary is the heap top: O(log N) per boundary instead of
+    a scan of everything active. Ended intervals are deleted lazily.
     """
     events: list[tuple[datetime, int, str, str]] = []
     for start, end, category, label in intervals:
@@ -135,13 +187,19 @@ def _sweep_timeline(intervals: list[tuple[datetime, datetime, str, str]], catego
 
     pr = {c.lower(): i for i, c in enumerate(category_priority)}
     events.sort(key=lambda x: (x[0], -x[1]))  # start before end at same timestamp
-    active: list[tuple[datetime, str, str]] = []  # (start_time, category, label)
+    # (priority, -start, arrival, category, label): priority then most-recent
+    # start wins, then the earliest arrival
+    heap: list[tuple[int, float, int, str, str]] = []
+    # Arrival numbers of live intervals per (category, label), latest last;
+    # an end retires the latest one (best-effort, as ends carry no identity)
+    live: dict[tuple[str, str], list[int]] = {}
+    ended: set[int] = set()
+    arrivals = 0
 
     def pick_winner():
-        if not active:
-            return None
-        # priority then most-recent start wins ties
-        return min(active, key=lambda t: (pr.get(t[1].lower(), 10_000), -t[0].timestamp()))
+        while heap and heap[0][2] in ended:
+            ended.discard(heapq.heappop(heap)[2])
+        return heap[0] if heap else None
 
     current_time = events[0][0]
     timeline: list[tuple[datetime, datetime, str, str]] = []
@@ -154,7 +212,7 @@ def _sweep_timeline(intervals: list[tuple[datetime, datetime, str, str]], catego
             if winner:
                 seg_start = current_time
                 seg_end = t
-                _, cat, label = winner
+                cat, label = winner[3], winner[4]
                 if timeline and timeline[-1][2] == cat and timeline[-1][3] == label and timeline[-1][1] == seg_start:
                     # extend last segment
                     timeline[-1] = (timeline[-1][0], seg_end, cat, label)
@@ -165,13 +223,13 @@ def _sweep_timeline(intervals: list[tuple[datetime, datetime, str, str]], catego
         while i < len(events) and events[i][0] == t:
             _, typ, cat, label = events[i]
             if typ == 1:
-                active.append((t, cat, label))
+                heapq.heappush(heap, (pr.get(cat.lower(), 10_000), -t.timestamp(), arrivals, cat, label))
+                live.setdefault((cat, label), []).append(arrivals)
+                arrivals += 1
             else:
-                # remove one matching active entry (best-effort)
-                for j in range(len(active) - 1, -1, -1):
-                    if active[j][1] == cat and active[j][2] == label:
-                        active.pop(j)
-                        break
+                stack = live.get((cat, label))
+                if stack:
+                    ended.add(stack.pop())
             i += 1
 
     return timeline
@@ -221,6 +279,117 @@ def _build_deep_work_blocks(timeline: list[tuple[datetime, datetime, str, str]],
     return blocks
 
 
+_US = timedelta(microseconds=1)
+_HOUR_US = 3600 * 1_000_000
+
+
+def _timeline_totals_loop(timeline: list[tuple[datetime, datetime, str, str]]):
+    """Per-segment version of _timeline_totals, used when NumPy is not installed."""
+    hourly_seconds = [0] * 24
+    category_seconds: dict[str, int] = {}
+    meeting_seconds = 0
+    focus_seconds = 0
+
+    for start, end, category, _label in timeline:
+        duration_secs = int((end - start).total_seconds())
+        category_seconds[category] = category_seconds.get(category, 0) + duration_secs
+        if category.lower() == 'meetings':
+            meeting_seconds += duration_secs
+            continue
+        focus_seconds += duration_secs
+        current = start
+        while current < end:
+            next_hour = current.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+            segment_end = min(end, next_hour)
+            hourly_seconds[current.hour] += int((segment_end - current).total_seconds())
+            current = segment_end
+
+    return hourly_seconds, category_seconds, meeting_seconds, focus_seconds
+
+
+def _timeline_totals(timeline: list[tuple[datetime, datetime, str, str]]):
+    """
+    Aggregate attributed segments into (hourly_focus_seconds, category_seconds,
+    meeting_seconds, focus_seconds).
+
+    Segments are laid out as parallel int64 arrays (durations and offsets in
+    microseconds, wall-clock start hours, category ids) so per-category sums
+    and the split of focus time across hour buckets are array operations.
+    As in the per-segment loop, each hour's share of a segment is truncated
+    to whole seconds. NumPy is optional here: without it the loop is used.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return _timeline_totals_loop(timeline)
+
+    n = len(timeline)
+    if not n:
+        return [0] * 24, {}, 0, 0
+
+    cat_ids: dict[str, int] = {}  # first-appearance order, kept for by_category
+    ids = np.fromiter((cat_ids.setdefault(cat, len(cat_ids)) for _, _, cat, _ in timeline), np.intp, n)
+    dur_us = np.fromiter(((end - start) // _US for start, end, _, _ in timeline), np.int64, n)
+    secs = dur_us // 1_000_000
+
+    per_cat = np.zeros(len(cat_ids), np.int64)
+    np.add.at(per_cat, ids, secs)
+    category_seconds = dict(zip(cat_ids, per_cat.tolist()))
+
+    meeting = np.fromiter((cat.lower() == 'meetings' for cat in cat_ids), bool, len(cat_ids))[ids]
+    meeting_seconds = int(secs[meeting].sum())
+    focus_seconds = int(secs[~meeting].sum())
+
+    # Split each focus segment at wall-clock hour boundaries: piece k of a
+    # segment starting off_us into hour h0 lands in hour (h0 + k) % 24
+    focus = ~meeting & (dur_us > 0)
+    h0 = np.fromiter((start.hour for start, _, _, _ in timeline), np.int64, n)[focus]
+    off = np.fromiter(
+        ((start.minute * 60 + start.second) * 1_000_000 + start.microsecond for start, _, _, _ in timeline),
+        np.int64, n)[focus]
+    dur = dur_us[focus]
+    pieces = -(-(off + dur) // _HOUR_US)
+    seg = np.repeat(np.arange(len(dur)), pieces)
+    k = np.arange(len(seg)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    lo = np.maximum(k * _HOUR_US - off[seg], 0)
+    hi = np.minimum((k + 1) * _HOUR_US - off[seg], dur[seg])
+    hourly = np.zeros(24, np.int64)
+    np.add.at(hourly, (h0[seg] + k) % 24, (hi - lo) // 1_000_000)
+
+    return hourly.tolist(), category_seconds, meeting_seconds, focus_seconds
+
+
+def _iter_jsonl(jsonl_path: Path, chunk_size: int = 1 << 20):
+    """
+    Yield the raw lines of a JSONL file as bytes, reading fixed-size chunks
+
+    Each chunk is split on newlines in C; only a line straddling chunk
+    boundaries is buffered (as a list of pieces, joined once), so memory
+    stays at about one chunk however large the log grows.
+    """
+    fd = os.open(jsonl_path, os.O_RDONLY)
+    try:
+        pending: list[bytes] = []
+        while True:
+            chunk = os.read(fd, chunk_size)
+            if not chunk:
+                break
+            lines = chunk.split(b'\n')
+            if len(lines) == 1:
+                pending.append(chunk)
+                continue
+            if pending:
+                pending.append(lines[0])
+                lines[0] = b''.join(pending)
+            tail = lines.pop()
+            pending = [tail] if tail else []
+            yield from lines
+        if pending:
+            yield b''.join(pending)
+    finally:
+        os.close(fd)
+
+
 def load_from_jsonl(jsonl_path: Path, config: dict | None = None) -> dict:
     """Load and convert JSONL log to report format with interval merging."""
     print(f"Loading from JSONL: {jsonl_path}")
@@ -232,23 +401,23 @@ def load_from_jsonl(jsonl_path: Path, config: dict | None = None) -> dict:
     metadata = None
     
     try:
-        with open(jsonl_path, 'r') as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        event = json.loads(line)
-                        if event.get('type') == 'metadata':
-                            metadata = event.get('data', {})
-                        else:
-                            events.append(event)
-                    except json.JSONDecodeError:
-                        continue
+        for line in _iter_jsonl(jsonl_path):
+            if line.strip():
+                try:
+                    event = _loads(line)
+                    if event.get('type') == 'metadata':
+                        metadata = event.get('data', {})
+                    else:
+                        events.append(event)
+                except ValueError:
+                    continue
     except Exception as e:
         print(f"Error reading JSONL: {e}")
         return None
 
     config = _load_config(config)
     category_priority = _get_category_priority(config)
+    categorize = _build_categorizer(config)
     
     # Convert events to report format with timeline reconstruction.
     # Supports two JSONL shapes:
@@ -300,7 +469,7 @@ def load_from_jsonl(jsonl_path: Path, config: dict | None = None) -> dict:
                 duration = int(data.get('duration_seconds', 0) or 0)
                 if duration > 0:
                     app = str(data.get('app', '') or '')
-                    category = categorize_event({'app': app, 'data': data}, config)
+                    category = categorize({'app': app, 'data': data})
                     end_dt = dt + timedelta(seconds=duration)
                     intervals.append((dt, end_dt, category, app))
             elif event_type == 'meeting_end':
@@ -333,7 +502,7 @@ def load_from_jsonl(jsonl_path: Path, config: dict | None = None) -> dict:
                     continue
 
                 app = str(event.get('app', '') or '')
-                category = categorize_event(event, config)
+                category = categorize(event)
                 intervals.append((dt, next_dt, category, app))
 
             report['date'] = samples[0][0].date().isoformat()
@@ -357,32 +526,10 @@ def load_from_jsonl(jsonl_path: Path, config: dict | None = None) -> dict:
 
     report['deep_work_blocks'] = _build_deep_work_blocks(timeline_segments)
 
-    # Aggregate by category and hour (use attributed timeline, not raw intervals)
-    hourly_seconds = [0] * 24
-    category_seconds: dict[str, int] = {}
-    meeting_seconds = 0
-    focus_seconds = 0
-    active_seconds = 0
-
-    for start, end, category, _label in timeline_segments:
-        duration_secs = int((end - start).total_seconds())
-        active_seconds += duration_secs
-        if category.lower() == 'meetings':
-            meeting_seconds += duration_secs
-        else:
-            focus_seconds += duration_secs
-
-        category_seconds[category] = category_seconds.get(category, 0) + duration_secs
-        
-        # Distribute *focus* across hours (exclude meetings for hourly focus)
-        if category.lower() != 'meetings':
-            current = start
-            while current < end:
-                next_hour = current.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
-                segment_end = min(end, next_hour)
-                segment_secs = int((segment_end - current).total_seconds())
-                hourly_seconds[current.hour] += segment_secs
-                current = segment_end
+    # Aggregate by category and hour (use attributed timeline, not raw intervals);
+    # hourly focus excludes meetings
+    hourly_seconds, category_seconds, meeting_seconds, focus_seconds = _timeline_totals(timeline_segments)
+    active_seconds = meeting_seconds + focus_seconds
     
     # Convert to HH:MM format
     report['overview']['active_time'] = seconds_to_hhmm(active_seconds)
@@ -408,6 +555,7 @@ def seconds_to_hhmm(seconds: int) -> str:
     minutes = (seconds % 3600) // 60
     return f"{hours:02d}:{minutes:02d}"
 
+@functools.lru_cache(maxsize=512)
 def categorize_app(app: str) -> str:
     """Simple app categorization"""
     app_lower = app.lower()
@@ -68,6 +68,7 @@ class EmailNotifier:
         if not report_path.exists():
             logger.warning(f"Report for {date.strftime('%Y-%m-%d')} not found at {report_path}. Attempting to generate.")
             # Ensure generate_daily_report creates the report in the correct directory
+            report_output_dir.mkdir(parents=True, exist_ok=True)
             generate_daily_report(date, output_dir=report_output_dir)
             if not report_path.exists():
                 logger.error(f"Failed to generate report for {date.strftime('%Y-%m-%d')}.")
@@ -278,6 +279,7 @@ class SlackNotifier:
         if not report_path.exists():
             logger.warning(f"Report for {date.strftime('%Y-%m-%d')} not found at {report_path}. Attempting to generate.")
             # Ensure generate_daily_report creates the report in the correct directory
+            report_output_dir.mkdir(parents=True, exist_ok=True)
             generate_daily_report(date, output_dir=report_output_dir)
             if not report_path.exists():
                 logger.error(f"Failed to generate report for {date.strftime('%Y-%m-%d')}.")
@@ -477,6 +479,7 @@ def main():
     report_path = report_output_dir / f"daily-report-{report_date.strftime('%Y-%m-%d')}.json"
     if not report_path.exists():
         print(f"Generating report for {report_date.strftime('%Y-%m-%d')}...")
+        report_output_dir.mkdir(parents=True, exist_ok=True)
         generate_daily_report(report_date, output_dir=report_output_dir) # Pass output_dir
 
     # Send notifications